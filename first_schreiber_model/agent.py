@@ -11,13 +11,13 @@ class Agent:
 	Represents a single voter or coalition with a type and an ID.
 	"""
 
-	def __init__(self, id_: str, type_: str, created_from_: List[Union[Voter, Coalition]]):
+	def __init__(self, id_: int, type_: str, created_from_: List[Union[Voter, Coalition]]):
 		"""
 		Initialises the agent.
 
 		Parameters
 		----------
-		id_ : str
+		id_ : int
 			The ID of the agent.
 		type_ : str
 			The type of agent.
@@ -35,7 +35,19 @@ class Agent:
 		Text representation of the agent.
 		"""
 
-		return "Agent (" + self.type + "|" + str(self.id) + "|" + str(self.policy_preference) + ")"
+		return "Agent (" + self.type + "|" + self.get_label() + "|" + str(self.policy_preference) + ")"
+
+	def get_label(self) -> str:
+		"""
+		The label of the agent, for display.
+
+		Returns
+		-------
+		label : str
+			The label.
+		"""
+
+		return str(self.id)
 
 	def find_closest_agent(self, agents: List[Union[Voter, Coalition]]) -> Union[Voter, Coalition]:
 		"""
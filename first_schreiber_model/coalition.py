@@ -2,9 +2,10 @@ from __future__ import annotations
 
 from agent import Agent
 
-from typing import List, Union, TYPE_CHECKING
+from typing import List, Optional, Union, TYPE_CHECKING
 if TYPE_CHECKING:
 	from voter import Voter
+	from lineage import Lineage
 
 
 class Coalition(Agent):
@@ -12,19 +13,22 @@ class Coalition(Agent):
 	Represents a single coalition with a policy preference among a one-dimensional interval [0,1].
 	"""
 
-	def __init__(self, id_: str, created_from_: List[Union[Voter, Coalition]]):
+	def __init__(self, id_: int, created_from_: List[Union[Voter, Coalition]], lineage: Optional[Lineage] = None):
 		"""
 		Initialises the coalition.
 
 		Parameters
 		----------
-		id_ : str
+		id_ : int
 			The ID of the agent.
 		created_from_ : List[Union[Voter, Coalition]]
 			The list of agents this one consists of.
+		lineage : Optional[Lineage]
+			The lineage the coalition is recorded in, for rendering its label.
 		"""
 
 		super().__init__(id_, "coalition", created_from_)
+		self.lineage: Optional[Lineage] = lineage
 
 		# Compute political preference of the coalition
 		super().update_policy_preference()
@@ -46,6 +50,20 @@ class Coalition(Agent):
 
 		return super().find_closest_agent(agents)
 
+	def get_label(self) -> str:
+		"""
+		The label of the coalition, for display, which spells out all voters it consists of if the lineage is known.
+
+		Returns
+		-------
+		label : str
+			The label.
+		"""
+
+		if self.lineage is None:
+			return super().get_label()
+		return self.lineage.render_label(self.id)
+
 	def check_for_formation_stop(self, n_voters: int) -> bool:
 		"""
 		Checks if the coalition stops extending itself.
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import numpy as np
+import matplotlib.pyplot as plt
+
+from matplotlib.collections import LineCollection
+
+from typing import List, Union, TYPE_CHECKING
+if TYPE_CHECKING:
+	from voter import Voter
+	from coalition import Coalition
+	from sorted_sweep import SortedSweep
+
+
+class Dendrogram:
+	"""
+	Records how voters form coalitions in preallocated arrays: the position of every agent and the edges between every
+	coalition and the two agents it was created from.
+
+	Agents are identified as in Lineage: voters have the IDs 1, ..., n_voters, and coalitions follow.
+	"""
+
+	def __init__(self, n_voters: int):
+		"""
+		Initialises an empty dendrogram.
+
+		Parameters
+		----------
+		n_voters : int
+			The total number of initial voters.
+		"""
+
+		self.n_voters: int = n_voters
+
+		# The (policy preference, -time) position of every agent, by ID, and whether it has been recorded yet
+		self.positions: np.ndarray = np.zeros((2 * n_voters, 2))
+		self.recorded: np.ndarray = np.zeros(2 * n_voters, dtype=bool)
+
+		# The (coalition, agent) edges
+		self.edges: np.ndarray = np.zeros((2 * max(n_voters - 1, 0), 2), dtype=int)
+		self.n_edges: int = 0
+
+	def add_voters(self, voters: List[Voter]) -> None:
+		"""
+		Records the initial voters.
+
+		Parameters
+		----------
+		voters : List[Voter]
+			The initial voters.
+		"""
+
+		ids = np.array([voter.id for voter in voters], dtype=int)
+		self.positions[ids, 0] = [voter.policy_preference for voter in voters]
+		self.positions[ids, 1] = 0
+		self.recorded[ids] = True
+
+	def add_coalitions(self, new_coal: List[Coalition], new_match: List[List[Union[Voter, Coalition]]], t: int)\
+			-> None:
+		"""
+		Records what happened in the current time step.
+
+		Parameters
+		----------
+		new_coal : List[Coalition]
+			The set of new coalitions.
+		new_match : List[List[Union[Voter, Coalition]]]
+			Pairs of agents matched to form the new coalitions.
+		t : int
+			The current time step.
+		"""
+
+		if len(new_coal) == 0:
+			return
+
+		ids = np.array([coalition.id for coalition in new_coal], dtype=int)
+		self.positions[ids, 0] = [coalition.policy_preference for coalition in new_coal]
+		self.positions[ids, 1] = -(t + 1)
+		self.recorded[ids] = True
+
+		matched = np.array([[agent.id, agent_.id] for agent, agent_ in new_match], dtype=int)
+		self.add_edges(ids, matched)
+
+	def add_sorted_sweep(self, sweep: SortedSweep) -> None:
+		"""
+		Records the complete outcome of a sorted sweep at once.
+
+		Parameters
+		----------
+		sweep : SortedSweep
+			The sorted sweep, after it was run.
+		"""
+
+		n_agents = sweep.n_voters + sweep.n_coalitions
+		self.positions[1:n_agents + 1, 0] = sweep.policy_preference[1:n_agents + 1]
+		self.positions[1:sweep.n_voters + 1, 1] = 0
+		self.positions[sweep.n_voters + 1:n_agents + 1, 1] = -(sweep.formed_at[:sweep.n_coalitions] + 1)
+		self.recorded[1:n_agents + 1] = True
+
+		self.add_edges(np.arange(sweep.n_voters + 1, n_agents + 1), sweep.children[:sweep.n_coalitions])
+
+	def add_edges(self, coalition_ids: np.ndarray, children: np.ndarray) -> None:
+		"""
+		Records the edges between coalitions and the agents they were created from.
+
+		Parameters
+		----------
+		coalition_ids : np.ndarray
+			The IDs of the coalitions.
+		children : np.ndarray
+			The IDs of the two agents every coalition was created from.
+		"""
+
+		n_new = 2 * len(coalition_ids)
+		self.edges[self.n_edges:self.n_edges + n_new:2, 0] = coalition_ids
+		self.edges[self.n_edges:self.n_edges + n_new:2, 1] = children[:, 0]
+		self.edges[self.n_edges + 1:self.n_edges + n_new:2, 0] = coalition_ids
+		self.edges[self.n_edges + 1:self.n_edges + n_new:2, 1] = children[:, 1]
+		self.n_edges += n_new
+
+	def draw(self, path: str = "network.pdf") -> None:
+		"""
+		Draws the dendrogram with a single collection of lines and a single collection of points.
+
+		Parameters
+		----------
+		path : str
+			Where to save the drawing.
+		"""
+
+		# Both edges of a coalition are drawn as one line from its first agent via the coalition to its second agent
+		edges = self.edges[:self.n_edges]
+		lines = self.positions[np.column_stack([edges[0::2, 1], edges[0::2, 0], edges[1::2, 1]])]
+
+		fig, ax = plt.subplots()
+		ax.add_collection(LineCollection(lines, colors="black", linewidths=0.5))
+		ax.scatter(self.positions[self.recorded, 0], self.positions[self.recorded, 1], s=20)
+		ax.autoscale()
+		ax.set_axis_off()
+		fig.savefig(path, dpi=300, bbox_inches="tight")
+		plt.close(fig)
+
+	def write_edge_list(self, path: str = "network.edges") -> None:
+		"""
+		Writes the edges into a compact text file, one "coalition agent" pair per line.
+
+		Parameters
+		----------
+		path : str
+			Where to write the edge list.
+		"""
+
+		np.savetxt(path, self.edges[:self.n_edges], fmt="%d")
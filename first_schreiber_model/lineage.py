@@ -0,0 +1,83 @@
+import numpy as np
+
+
+class Lineage:
+	"""
+	Keeps track of which two agents every coalition was created from, like a linkage matrix.
+
+	Voters have the IDs 1, ..., n_voters, and coalitions get the following IDs in the order in which they are created.
+	Nested labels like "((1|2)|3)" are only rendered when they are needed for display.
+	"""
+
+	def __init__(self, n_voters: int):
+		"""
+		Initialises the lineage.
+
+		Parameters
+		----------
+		n_voters : int
+			The total number of initial voters.
+		"""
+
+		self.n_voters: int = n_voters
+
+		# The IDs of the two agents every coalition was created from, by coalition ID - n_voters - 1
+		self.children: np.ndarray = np.zeros((max(n_voters - 1, 0), 2), dtype=int)
+		self.n_coalitions: int = 0
+
+		# The ID of the coalition every agent became part of (or 0 if none), by ID
+		self.parent: np.ndarray = np.zeros(2 * n_voters, dtype=int)
+
+	def add_coalition(self, first_id: int, second_id: int) -> int:
+		"""
+		Records a new coalition.
+
+		Parameters
+		----------
+		first_id : int
+			The ID of the first agent the coalition is created from.
+		second_id : int
+			The ID of the second agent the coalition is created from.
+
+		Returns
+		-------
+		id_ : int
+			The ID of the new coalition.
+		"""
+
+		id_ = self.n_voters + self.n_coalitions + 1
+		self.children[self.n_coalitions] = first_id, second_id
+		self.parent[[first_id, second_id]] = id_
+		self.n_coalitions += 1
+
+		return id_
+
+	def render_label(self, id_: int) -> str:
+		"""
+		Renders the nested label of an agent, which spells out all voters it consists of.
+
+		Parameters
+		----------
+		id_ : int
+			The ID of the agent.
+
+		Returns
+		-------
+		label : str
+			The nested label.
+		"""
+
+		# Walk the tree depth-first, emitting brackets and separators on the way
+		parts = []
+		stack = [id_]
+		while len(stack) > 0:
+			item = stack.pop()
+			if isinstance(item, str):
+				parts.append(item)
+			elif item <= self.n_voters:
+				parts.append(str(item))
+			else:
+				first_id, second_id = self.children[item - self.n_voters - 1]
+				stack.extend([")", int(second_id), "|", int(first_id), "("])
+
+		return "".join(parts)
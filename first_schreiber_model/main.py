@@ -1,6 +1,10 @@
+import numpy as np
+
 from voter import Voter
 from coalition import Coalition
-from network import initialise_network, update_network, draw_network
+from lineage import Lineage
+from sorted_sweep import SortedSweep
+from dendrogram import Dendrogram
 
 from typing import List, Union
 
@@ -8,58 +12,84 @@ from typing import List, Union
 # Number of voters
 n_voters = 51
 
+# Whether to run the agglomeration on arrays sorted by policy preference (fast), instead of on agent objects
+use_sorted_sweep = False
+
+# Whether to also write the recorded network as an edge list, and whether to export it to networkx for drawing
+write_edge_list = False
+export_networkx = False
+
 # Initialise voters
-voters = [Voter(str(voter_id + 1)) for voter_id in range(n_voters)]
+voters = [Voter(voter_id + 1) for voter_id in range(n_voters)]
 agents: List[Union[Voter, Coalition]] = voters
 
 # For keeping track and for drawing
-graph = initialise_network(agents)
-
-# Go
-for t in range(1000):
-
-	# Every voter and every coalition looks for the closest voter or coalition
-	closest_agents = []
-	for agent in agents:
-		closest_agent = agent.find_closest_agent(agents)
-		closest_agents.append(closest_agent)
-
-	# Look for matches for all of them
-	new_coalitions = []
-	new_matched_agents = []
-	for i, agent in enumerate(agents):
-
-		# Check for matches
-		agent_matched = None
-		for j, agent_ in enumerate(agents):
-			if closest_agents[i].id == agent_.id and closest_agents[j].id == agent.id and i < j:
-				agent_matched = agent_
-				break
-		if agent_matched is None:
-			continue
-
-		# Match found, create a new coalition and remove the used ones
-		new_coalition = Coalition("(" + agent.id + "|" + agent_matched.id + ")", created_from_=[agent, agent_matched])
-		new_coalitions.append(new_coalition)
-		new_matched_agents.append([agent, agent_matched])
-
-	# Add new coalitions and remove matched agents from the active list of agents
-	agents.extend(new_coalitions)
-	for agent, agent_ in new_matched_agents:
-		agents.remove(agent)
-		agents.remove(agent_)
-
-	# Check if a coalition has a simple majority
-	for agent in agents:
-		if agent.type == "coalition" and agent.check_for_formation_stop(n_voters):
+dendrogram = Dendrogram(n_voters)
+dendrogram.add_voters(voters)
+
+# Everything at once on sorted arrays
+if use_sorted_sweep:
+	sweep = SortedSweep(np.array([voter.policy_preference for voter in voters], dtype=float))
+	sweep.run()
+	dendrogram.add_sorted_sweep(sweep)
+
+# Step by step on agent objects
+else:
+	# For keeping track of the coalitions
+	lineage = Lineage(n_voters)
+
+	# Go
+	for t in range(1000):
+
+		# Every voter and every coalition looks for the closest voter or coalition
+		closest_agents = []
+		for agent in agents:
+			closest_agent = agent.find_closest_agent(agents)
+			closest_agents.append(closest_agent)
+
+		# Look for matches for all of them
+		new_coalitions = []
+		new_matched_agents = []
+		for i, agent in enumerate(agents):
+
+			# Check for matches
+			agent_matched = None
+			for j, agent_ in enumerate(agents):
+				if closest_agents[i].id == agent_.id and closest_agents[j].id == agent.id and i < j:
+					agent_matched = agent_
+					break
+			if agent_matched is None:
+				continue
+
+			# Match found, create a new coalition and remove the used ones
+			new_coalition = Coalition(lineage.add_coalition(agent.id, agent_matched.id),
+									  created_from_=[agent, agent_matched], lineage=lineage)
+			new_coalitions.append(new_coalition)
+			new_matched_agents.append([agent, agent_matched])
+
+		# Add new coalitions and remove matched agents from the active list of agents
+		agents.extend(new_coalitions)
+		for agent, agent_ in new_matched_agents:
 			agents.remove(agent)
+			agents.remove(agent_)
+
+		# Check if a coalition has a simple majority
+		for agent in agents:
+			if agent.type == "coalition" and agent.check_for_formation_stop(n_voters):
+				agents.remove(agent)
 
-	# Update the network
-	update_network(graph, new_coalitions, new_matched_agents, t)
+		# Update the network
+		dendrogram.add_coalitions(new_coalitions, new_matched_agents, t)
 
-	# If there are fewer than two agents left, quit
-	if len(agents) < 2:
-		break
+		# If there are fewer than two agents left, quit
+		if len(agents) < 2:
+			break
 
 # Draw our graph
-draw_network(graph)
+if export_networkx:
+	from network import network_from_dendrogram, draw_network
+	draw_network(network_from_dendrogram(dendrogram))
+else:
+	dendrogram.draw("network.pdf")
+if write_edge_list:
+	dendrogram.write_edge_list("network.edges")
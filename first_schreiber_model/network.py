@@ -1,57 +1,33 @@
+import numpy as np
 import networkx as nx
 import matplotlib.pyplot as plt
 
-from voter import Voter
-from coalition import Coalition
+from dendrogram import Dendrogram
 
-from typing import List, Union
 
-
-def initialise_network(initial_agents: List[Voter]) -> nx.Graph:
+def network_from_dendrogram(dendrogram: Dendrogram) -> nx.Graph:
 	"""
-	Initialises our network.
+	Exports a recorded dendrogram as a network.
 
 	Parameters
 	----------
-	initial_agents : List[Voter]
-		The initial set of agents.
+	dendrogram : Dendrogram
+		The recorded dendrogram.
 
 	Returns
 	-------
 	g : nx.Graph
-		The initialised graph.
+		The graph.
 	"""
 
 	graph = nx.Graph()
-	for agent in initial_agents:
-		graph.add_node(agent.id, pos=(agent.policy_preference, 0))
+	for agent_id in np.flatnonzero(dendrogram.recorded):
+		graph.add_node(int(agent_id), pos=tuple(dendrogram.positions[agent_id]))
+	graph.add_edges_from(dendrogram.edges[:dendrogram.n_edges].tolist())
 
 	return graph
 
 
-def update_network(graph: nx.Graph, new_coal: List[Coalition], new_match: List[List[Union[Voter, Coalition]]], t: int)\
-		-> None:
-	"""
-	Updates the network to include what happened in the current time step.
-
-	Parameters
-	----------
-	graph : nx.Graph
-		Our graph.
-	new_coal : List[Coalition]
-		The set of new coalitions.
-	new_match : List[List[Union[Voter, Coalition]]]
-		Pairs of agents matched to form the new coalitions.
-	t : int
-		The current time step.
-	"""
-
-	for i, new_coalition in enumerate(new_coal):
-		graph.add_node(new_coalition.id, pos=(new_coalition.policy_preference, -(t + 1)))
-		graph.add_edge(new_coalition.id, new_match[i][0].id)
-		graph.add_edge(new_coalition.id, new_match[i][1].id)
-
-
 def draw_network(graph: nx.Graph) -> None:
 	"""
 	Draws our network.
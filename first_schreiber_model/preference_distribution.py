@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class PreferenceDistribution(Enum):
+	"""
+	Distributions the policy preferences of voters may be drawn from.
+	"""
+
+	UNIFORM = 1
+	CLUSTERED = 2
+	BIMODAL = 3
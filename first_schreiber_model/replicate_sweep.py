@@ -0,0 +1,163 @@
+import time
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+
+from voter import Voter
+from sorted_sweep import SortedSweep
+from preference_distribution import PreferenceDistribution
+
+from typing import Dict, List, Optional, Tuple
+
+
+# The summary statistics recorded for every replicate
+STATISTICS = ["rounds", "rounds_to_majority", "majority_coalition_size", "tree_depth", "stalled"]
+
+
+def run_replicate(n_voters: int, distribution: PreferenceDistribution, seed: np.random.SeedSequence)\
+		-> Dict[str, float]:
+	"""
+	Runs a single replicate of the coalition formation and summarises it.
+
+	Parameters
+	----------
+	n_voters : int
+		The number of voters.
+	distribution : PreferenceDistribution
+		The distribution the policy preferences of the voters are drawn from.
+	seed : np.random.SeedSequence
+		The seed of the replicate.
+
+	Returns
+	-------
+	statistics : Dict[str, float]
+		The number of rounds that merged any agents, the number of rounds until a coalition had a simple majority of
+		the voters (or NaN), the number of voters of the first coalition with a simple majority (or NaN), the depth of
+		the deepest coalition, and whether the sweep stopped early because nothing could merge anymore (1) or not (0).
+	"""
+
+	rng = np.random.default_rng(seed)
+	sweep = SortedSweep(Voter.pick_policy_preferences_at_random(distribution, n_voters, rng))
+	sweep.run()
+
+	coalitions = np.arange(n_voters + 1, n_voters + sweep.n_coalitions + 1)
+	majorities = np.flatnonzero(sweep.n_members[coalitions] > n_voters / 2)
+
+	return {"rounds": sweep.n_rounds,
+			"rounds_to_majority": sweep.formed_at[majorities[0]] + 1 if len(majorities) > 0 else np.nan,
+			"majority_coalition_size": sweep.n_members[coalitions[majorities[0]]] if len(majorities) > 0 else np.nan,
+			"tree_depth": np.max(sweep.depth[1:n_voters + sweep.n_coalitions + 1]),
+			"stalled": float(sweep.stalled)}
+
+
+def run_replicates(n_voters: int, distribution: PreferenceDistribution, seeds: List[np.random.SeedSequence])\
+		-> np.ndarray:
+	"""
+	Runs a batch of replicates, such that every worker process gets a decent amount of work at once.
+
+	Parameters
+	----------
+	n_voters : int
+		The number of voters.
+	distribution : PreferenceDistribution
+		The distribution the policy preferences of the voters are drawn from.
+	seeds : List[np.random.SeedSequence]
+		The seeds of the replicates.
+
+	Returns
+	-------
+	statistics : np.ndarray
+		The summary statistics, one row per replicate and one column per statistic.
+	"""
+
+	results = [run_replicate(n_voters, distribution, seed) for seed in seeds]
+	return np.array([[result[statistic] for statistic in STATISTICS] for result in results], dtype=float)
+
+
+def summarise(values: np.ndarray) -> Dict[str, float]:
+	"""
+	Summarises a statistic over all replicates, ignoring replicates where it is undefined.
+
+	Parameters
+	----------
+	values : np.ndarray
+		The values of the statistic, NaN where undefined.
+
+	Returns
+	-------
+	summary : Dict[str, float]
+		The mean, standard deviation, minimum and maximum, and the number of replicates it was defined for.
+	"""
+
+	values = values[~np.isnan(values)]
+	if len(values) == 0:
+		return {"mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan, "count": 0}
+
+	return {"mean": float(np.mean(values)), "std": float(np.std(values)), "min": float(np.min(values)),
+			"max": float(np.max(values)), "count": len(values)}
+
+
+def run_sweep(voter_counts: List[int], distributions: List[PreferenceDistribution], n_replicates: int, seed: int = 0,
+			  n_workers: Optional[int] = None, batch_size: int = 16) -> Dict:
+	"""
+	Runs many seeded replicates for every combination of voter count and preference distribution on a process pool.
+
+	Parameters
+	----------
+	voter_counts : List[int]
+		The numbers of voters.
+	distributions : List[PreferenceDistribution]
+		The distributions the policy preferences of the voters are drawn from.
+	n_replicates : int
+		The number of replicates per combination.
+	seed : int
+		The seed of the whole sweep; replicate i of combination j always gets the same seed.
+	n_workers : Optional[int]
+		The number of worker processes, or None for one per CPU.
+	batch_size : int
+		The number of replicates a worker runs at once.
+
+	Returns
+	-------
+	results : Dict
+		The mean, standard deviation, minimum and maximum of every statistic for every combination, as well as the
+		total number of replicates, the time it took and the throughput in replicates per second.
+	"""
+
+	start = time.perf_counter()
+
+	# Every combination gets its own seed sequence, and every replicate its own child
+	combinations: List[Tuple[int, PreferenceDistribution]] = [(n, d) for n in voter_counts for d in distributions]
+	seeds = [np.random.SeedSequence(seed, spawn_key=(i,)).spawn(n_replicates) for i in range(len(combinations))]
+
+	# Run batches of replicates in parallel
+	with ProcessPoolExecutor(max_workers=n_workers) as executor:
+		futures = [[executor.submit(run_replicates, n, d, seeds[i][b:b + batch_size])
+					for b in range(0, n_replicates, batch_size)] for i, (n, d) in enumerate(combinations)]
+		statistics = [np.concatenate([future.result() for future in batches]) for batches in futures]
+
+	# Aggregate
+	results = {}
+	for (n, d), statistics_ in zip(combinations, statistics):
+		results[(n, d.name.lower())] = {statistic: summarise(statistics_[:, i])
+										 for i, statistic in enumerate(STATISTICS)}
+
+	seconds = time.perf_counter() - start
+	n_total = n_replicates * len(combinations)
+	return {"results": results, "n_replicates": n_total, "seconds": seconds,
+			"replicates_per_second": n_total / seconds}
+
+
+if __name__ == "__main__":
+
+	# Settings
+	voter_counts = [51, 501, 5001]
+	distributions = [PreferenceDistribution.UNIFORM, PreferenceDistribution.CLUSTERED, PreferenceDistribution.BIMODAL]
+	n_replicates = 200
+
+	# Run and report
+	sweep_results = run_sweep(voter_counts, distributions, n_replicates)
+	for (n, d), statistics_ in sweep_results["results"].items():
+		print(n, d, ", ".join(statistic + ": " + "{:.2f}".format(values["mean"]) + " +- "
+							   + "{:.2f}".format(values["std"]) for statistic, values in statistics_.items()))
+	print("{:.1f}".format(sweep_results["replicates_per_second"]), "replicates per second")
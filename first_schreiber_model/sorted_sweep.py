@@ -0,0 +1,169 @@
+import numpy as np
+
+from typing import Tuple
+
+
+class SortedSweep:
+	"""
+	Runs the agglomeration of voters into coalitions on arrays that are kept sorted by policy preference, instead of on
+	agent objects.
+
+	Since policy preferences are one-dimensional, the closest agent of every agent is always found among the
+	neighbouring (distinct) policy preferences in sorted order, so every round takes linear time. The outcome is the
+	same as the one of the agent-based loop in main.py: agents with an identical policy preference are skipped, ties go
+	to the agent that was created first, and only mutually closest agents form coalitions.
+
+	Agents are identified as in Lineage: voters have the IDs 1, ..., n_voters, and coalitions follow in the order in
+	which the agent-based loop would have created them.
+	"""
+
+	# Agents further away than this are never considered close (see Agent.find_closest_agent)
+	max_distance: float = 10000.0
+
+	def __init__(self, policy_preferences: np.ndarray, max_rounds: int = 1000):
+		"""
+		Initialises the sweep.
+
+		Parameters
+		----------
+		policy_preferences : np.ndarray
+			The policy preferences of the voters.
+		max_rounds : int
+			The maximum number of rounds.
+		"""
+
+		self.n_voters: int = len(policy_preferences)
+		self.max_rounds: int = max_rounds
+
+		# The policy preferences of all agents, by ID
+		self.policy_preference: np.ndarray = np.zeros(2 * self.n_voters)
+		self.policy_preference[1:self.n_voters + 1] = policy_preferences
+
+		# The IDs of the two agents every coalition was created from and the round it was created in, by coalition ID -
+		# n_voters - 1
+		self.children: np.ndarray = np.zeros((max(self.n_voters - 1, 0), 2), dtype=int)
+		self.formed_at: np.ndarray = np.full(max(self.n_voters - 1, 0), -1, dtype=int)
+		self.n_coalitions: int = 0
+
+		# The number of voters every agent consists of, and the depth of its tree, by ID
+		self.n_members: np.ndarray = np.ones(2 * self.n_voters, dtype=int)
+		self.depth: np.ndarray = np.zeros(2 * self.n_voters, dtype=int)
+
+		# The IDs of all active agents, sorted by policy preference first and by ID second
+		self.sorted_ids: np.ndarray = np.lexsort((np.arange(self.n_voters), policy_preferences)) + 1
+
+		# The number of rounds run so far, and whether the sweep stopped because a round would have merged nothing
+		self.n_rounds: int = 0
+		self.stalled: bool = False
+
+	def find_mutually_closest(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+		"""
+		Finds all pairs of mutually closest agents.
+
+		Returns
+		-------
+		first : np.ndarray
+			The positions (in sorted order) of the lower agents of the pairs.
+		second : np.ndarray
+			The positions (in sorted order) of the upper agents of the pairs.
+		group_ends : np.ndarray
+			The positions right after the groups of agents sharing the policy preference of the lower agents.
+		"""
+
+		preferences = self.policy_preference[self.sorted_ids]
+
+		# Agents with identical policy preferences are grouped; within a group, the first agent has the lowest ID
+		starts = np.flatnonzero(np.concatenate([[True], preferences[1:] != preferences[:-1]]))
+		ends = np.concatenate([starts[1:], [len(preferences)]])
+		values = preferences[starts]
+		firsts = self.sorted_ids[starts]
+		n_groups = len(starts)
+
+		# Distances to the neighbouring groups
+		gaps = values[1:] - values[:-1]
+		gaps[gaps >= SortedSweep.max_distance] = np.inf
+		dist_left = np.concatenate([[np.inf], gaps])
+		dist_right = np.concatenate([gaps, [np.inf]])
+
+		# Every agent of a group picks the first agent of the closer neighbouring group, or the one created first in
+		# case of a tie
+		no_agent = len(self.policy_preference)
+		first_left = np.concatenate([[no_agent], firsts[:-1]])
+		first_right = np.concatenate([firsts[1:], [no_agent]])
+		go_left = (dist_left < dist_right) | ((dist_left == dist_right) & (first_left < first_right))
+		target = np.where(go_left, np.arange(n_groups) - 1, np.arange(n_groups) + 1)
+		target[np.isinf(np.minimum(dist_left, dist_right))] = -1
+
+		# Only the first agents of two groups pointing at each other are mutually closest
+		lower = np.flatnonzero((target == np.arange(n_groups) + 1)[:-1])
+		lower = lower[target[lower + 1] == lower]
+
+		return starts[lower], starts[lower + 1], ends[lower]
+
+	def step(self) -> bool:
+		"""
+		Runs a single round, in which all mutually closest agents form coalitions.
+
+		Returns
+		-------
+		proceed : bool
+			Whether there are at least two agents left and a round merged any of them.
+		"""
+
+		first, second, group_ends = self.find_mutually_closest()
+
+		# Nothing can merge anymore if the remaining agents share a policy preference or are too far apart, and neither
+		# would change in later rounds, so the round is not counted
+		if len(first) == 0:
+			self.stalled = len(self.sorted_ids) >= 2
+			return False
+		first_ids, second_ids = self.sorted_ids[first], self.sorted_ids[second]
+
+		# The new coalitions are created in the order of their earliest member, and take the average policy preference
+		order = np.argsort(np.minimum(first_ids, second_ids), kind="stable")
+		first, second, group_ends = first[order], second[order], group_ends[order]
+		first_ids, second_ids = first_ids[order], second_ids[order]
+		earlier_ids, later_ids = np.minimum(first_ids, second_ids), np.maximum(first_ids, second_ids)
+		new_ids = self.n_voters + self.n_coalitions + 1 + np.arange(len(first))
+		self.policy_preference[new_ids] = (self.policy_preference[earlier_ids] + self.policy_preference[later_ids]) / 2
+		self.children[new_ids - self.n_voters - 1] = np.column_stack([earlier_ids, later_ids])
+		self.formed_at[new_ids - self.n_voters - 1] = self.n_rounds
+		self.n_members[new_ids] = self.n_members[earlier_ids] + self.n_members[later_ids]
+		self.depth[new_ids] = np.maximum(self.depth[earlier_ids], self.depth[later_ids]) + 1
+		self.n_coalitions += len(new_ids)
+		self.n_rounds += 1
+
+		# Remove the matched agents
+		keep = np.ones(len(self.sorted_ids), dtype=bool)
+		keep[first] = False
+		keep[second] = False
+		remaining = self.sorted_ids[keep]
+
+		# A coalition stops forming once it was created from more than half of the voters, which for a coalition of two
+		# agents only happens for tiny electorates (see Coalition.check_for_formation_stop)
+		if 2 > self.n_voters / 2:
+			self.sorted_ids = remaining
+		else:
+
+			# A coalition goes right after the group of its lower agent, unless rounding put it into one of the groups
+			new_preferences = self.policy_preference[new_ids]
+			if np.all((new_preferences > self.policy_preference[self.sorted_ids[first]])
+					  & (new_preferences < self.policy_preference[self.sorted_ids[second]])):
+				positions = group_ends - np.cumsum(~keep)[group_ends - 1]
+				order = np.lexsort((new_preferences, positions))
+				self.sorted_ids = np.insert(remaining, positions[order], new_ids[order])
+			else:
+				ids = np.concatenate([remaining, new_ids])
+				self.sorted_ids = ids[np.lexsort((ids, self.policy_preference[ids]))]
+
+		return len(self.sorted_ids) >= 2
+
+	def run(self) -> None:
+		"""
+		Runs rounds until fewer than two agents are left, a round merges nothing (see stalled), or the maximum number of
+		rounds is reached.
+		"""
+
+		while self.n_rounds < self.max_rounds:
+			if not self.step():
+				break
@@ -3,8 +3,9 @@ from __future__ import annotations
 import numpy as np
 
 from agent import Agent
+from preference_distribution import PreferenceDistribution
 
-from typing import List, Union, TYPE_CHECKING
+from typing import List, Optional, Union, TYPE_CHECKING
 if TYPE_CHECKING:
 	from coalition import Coalition
 
@@ -14,20 +15,22 @@ class Voter(Agent):
 	Represents a single voter with a policy preference among a one-dimensional interval [0,1].
 	"""
 
-	def __init__(self, id_: str):
+	def __init__(self, id_: int, policy_preference: Optional[float] = None):
 		"""
 		Initialises our voter.
 
 		Parameters
 		----------
-		id_ : str
+		id_ : int
 			The ID of the voter.
+		policy_preference : Optional[float]
+			The policy preference of the voter; if none is given, the ID is used.
 		"""
 
 		super().__init__(id_, "voter", [self])
 
-		# Choose a policy preference at random
-		self.policy_preference = int(id_)
+		# Set the policy preference
+		self.policy_preference = id_ if policy_preference is None else policy_preference
 
 	def find_closest_agent(self, agents: List[Union[__class__, Coalition]]) -> Union[__class__, Coalition]:
 		"""
@@ -45,3 +48,37 @@ class Voter(Agent):
 		"""
 
 		return super().find_closest_agent(agents)
+
+	@staticmethod
+	def pick_policy_preferences_at_random(distribution: PreferenceDistribution, n_voters: int,
+										  rng: np.random.Generator) -> np.ndarray:
+		"""
+		Selects the policy preferences of many voters at random, in [0,1].
+
+		Parameters
+		----------
+		distribution : PreferenceDistribution
+			The distribution the policy preferences are drawn from.
+		n_voters : int
+			The number of voters.
+		rng : np.random.Generator
+			The random number generator.
+
+		Returns
+		-------
+		policy_preferences : np.ndarray
+			The policy preferences.
+		"""
+
+		if distribution == PreferenceDistribution.UNIFORM:
+			return rng.random(n_voters)
+
+		# A handful of tight clusters around random centres
+		elif distribution == PreferenceDistribution.CLUSTERED:
+			centres = rng.random(5)
+			return np.clip(rng.normal(centres[rng.integers(0, 5, n_voters)], 0.02), 0.0, 1.0)
+
+		# Two camps on either side of the centre
+		else:
+			centres = np.where(rng.random(n_voters) < 0.5, 0.25, 0.75)
+			return np.clip(rng.normal(centres, 0.08), 0.0, 1.0)
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import numpy as np
+
+from policy import Policy
+
+from typing import List, Dict, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+	from congress_voter import CongressVoter
+	from representative import Representative
+	from coalition import Coalition
+	from voting_bodies import VotingBodies
+	from bill import Bill
+	from bill_table import BillTable
+	from vote import Vote
+
+
+class AgentRegistry:
+	"""
+	Assigns every representative and coalition in the Congress a dense integer ID and keeps inverted indexes from the
+	agents to their votes and their coalition memberships, as well as the bills they sponsored.
+
+	On top of that, all currently active agents of both chambers occupy the contiguous global slots
+	0, ..., n_active - 1, such that cross-chamber operations (like choosing sponsors) are single array lookups.
+	"""
+
+	def __init__(self):
+		"""
+		Initialises an empty registry.
+		"""
+
+		# All agents by their dense ID, and the dense IDs by voting body and (string) ID
+		self.agents: List[CongressVoter] = []
+		self.ids: Dict[Tuple[VotingBodies, str], int] = {}
+
+		# All recorded votes and the bills they were held on, as the table and the row of the bill, by row
+		self.votes: List[Vote] = []
+		self.vote_bills: List[Tuple[BillTable, int]] = []
+
+		# All recorded bills, as tables and the rows of the bills; bills are only built as objects when asked for
+		self.bill_rows: List[Tuple[BillTable, np.ndarray]] = []
+
+		# The inverted indexes, by dense ID
+		self.vote_rows: List[List[int]] = []
+		self.vote_decisions: List[List[bool]] = []
+		self.memberships: List[List[Tuple[int, int, bool]]] = []
+
+		# The dense IDs of all active agents by global slot, and the global slot by dense ID (or -1 if inactive)
+		self.active: np.ndarray = np.zeros(1024, dtype=int)
+		self.active_slots: np.ndarray = np.full(1024, -1, dtype=int)
+		self.n_active: int = 0
+
+		# The party importances of all active agents by global slot, as of the latest time step they were written at
+		self.importance: np.ndarray = np.zeros(1024)
+
+		# The current policy preferences of all agents by dense ID, with one column per axis
+		self.policy: np.ndarray = np.zeros((1024, Policy.n_dimensions))
+
+	def register(self, agent: CongressVoter, t: int = 0) -> int:
+		"""
+		Registers a new representative or coalition.
+
+		Parameters
+		----------
+		agent : CongressVoter
+			The representative or coalition.
+		t : int
+			The current time step.
+
+		Returns
+		-------
+		registry_id : int
+			The dense ID of the agent.
+		"""
+
+		registry_id = len(self.agents)
+		agent.registry_id = registry_id
+		self.agents.append(agent)
+		self.ids[(agent.voting_body, agent.id)] = registry_id
+
+		self.vote_rows.append([])
+		self.vote_decisions.append([])
+		self.memberships.append([])
+
+		# Newly registered agents are active
+		if registry_id == len(self.active_slots):
+			self.active_slots = np.concatenate([self.active_slots, np.full(registry_id, -1, dtype=int)])
+			self.policy = np.concatenate([self.policy, np.zeros((registry_id, Policy.n_dimensions))])
+		self.activate(agent)
+		self.update_policy(agent, t)
+
+		return registry_id
+
+	def update_policy(self, agent: CongressVoter, t: int) -> None:
+		"""
+		Copies the (possibly changed) policy preference and party importance of an agent into the columns.
+
+		Parameters
+		----------
+		agent : CongressVoter
+			The representative or coalition.
+		t : int
+			The current time step.
+		"""
+
+		self.policy[agent.registry_id] = agent.policy_preference.values
+		slot = self.active_slots[agent.registry_id]
+		if slot >= 0:
+			self.importance[slot] = agent.party_importance_t[t]
+
+	def update_policies(self, agents: List[CongressVoter], policy: np.ndarray) -> None:
+		"""
+		Copies the (possibly changed) policy preferences of many agents into the policy columns at once.
+
+		Parameters
+		----------
+		agents : List[CongressVoter]
+			The representatives or coalitions.
+		policy : np.ndarray
+			Their policy preferences, with one row per agent.
+		"""
+
+		self.policy[[agent.registry_id for agent in agents]] = policy
+
+	def update_importances(self, registry_ids: np.ndarray, importance: np.ndarray) -> None:
+		"""
+		Copies the (possibly changed) party importances of many agents into the importance column at once; inactive
+		agents are skipped.
+
+		Parameters
+		----------
+		registry_ids : np.ndarray
+			The dense IDs of the representatives or coalitions.
+		importance : np.ndarray
+			Their party importances.
+		"""
+
+		slots = self.active_slots[registry_ids]
+		active = slots >= 0
+		self.importance[slots[active]] = importance[active]
+
+	def activate(self, agent: CongressVoter) -> None:
+		"""
+		Gives an agent the next free global slot.
+
+		Parameters
+		----------
+		agent : CongressVoter
+			The representative or coalition.
+		"""
+
+		if self.active_slots[agent.registry_id] >= 0:
+			return
+		if self.n_active == len(self.active):
+			self.active = np.concatenate([self.active, np.zeros(self.n_active, dtype=int)])
+			self.importance = np.concatenate([self.importance, np.zeros(self.n_active)])
+		self.active[self.n_active] = agent.registry_id
+		self.importance[self.n_active] = 0.0
+		self.active_slots[agent.registry_id] = self.n_active
+		self.n_active += 1
+
+	def deactivate(self, agent: CongressVoter) -> None:
+		"""
+		Frees the global slot of an agent, e.g. of a broken coalition, by moving the last active agent into it.
+
+		Parameters
+		----------
+		agent : CongressVoter
+			The representative or coalition.
+		"""
+
+		slot = self.active_slots[agent.registry_id]
+		if slot < 0:
+			return
+		last_id = self.active[self.n_active - 1]
+		self.active[slot] = last_id
+		self.importance[slot] = self.importance[self.n_active - 1]
+		self.active_slots[last_id] = slot
+		self.active_slots[agent.registry_id] = -1
+		self.n_active -= 1
+
+	def get_active_agents(self) -> List[CongressVoter]:
+		"""
+		Gets all active agents by global slot.
+
+		Returns
+		-------
+		agents : List[CongressVoter]
+			The active representatives and coalitions of both chambers.
+		"""
+
+		return [self.agents[registry_id] for registry_id in self.active[:self.n_active]]
+
+	def sample_sponsors(self, n: int, t: int, weighted: bool = False) -> np.ndarray:
+		"""
+		Chooses sponsors among all active agents at random.
+
+		Parameters
+		----------
+		n : int
+			The number of sponsors.
+		t : int
+			The current time step.
+		weighted : bool
+			Whether sponsors are chosen proportionally to their party importance at the current time step, instead of
+			uniformly.
+
+		Returns
+		-------
+		registry_ids : np.ndarray
+			The dense IDs of the sponsors.
+		"""
+
+		if weighted:
+			importance = self.importance[:self.n_active]
+			slots = np.random.choice(self.n_active, n, p=importance / importance.sum())
+		else:
+			slots = np.random.choice(self.n_active, n)
+
+		return self.active[slots]
+
+	def get(self, id_: str, voting_body: VotingBodies) -> CongressVoter:
+		"""
+		Looks up an agent by its ID.
+
+		Parameters
+		----------
+		id_ : str
+			The ID of the representative or coalition.
+		voting_body : VotingBodies
+			The corresponding voting body.
+
+		Returns
+		-------
+		agent : CongressVoter
+			The representative or coalition.
+		"""
+
+		return self.agents[self.ids[(voting_body, id_)]]
+
+	def record_bill_rows(self, bill_table: BillTable, rows: np.ndarray) -> None:
+		"""
+		Records newly introduced bills with their sponsors, by their rows in a bill table.
+
+		Parameters
+		----------
+		bill_table : BillTable
+			The table the bills are stored in.
+		rows : np.ndarray
+			The rows of the new bills.
+		"""
+
+		self.bill_rows.append((bill_table, rows))
+
+	def record_vote(self, vote: Vote, bill_table: BillTable, bill_row: int) -> int:
+		"""
+		Records how every representative voted on a bill.
+
+		Parameters
+		----------
+		vote : Vote
+			The vote.
+		bill_table : BillTable
+			The table the bill that was voted on is stored in.
+		bill_row : int
+			The row of the bill in its table.
+
+		Returns
+		-------
+		row : int
+			The row of the vote.
+		"""
+
+		row = len(self.votes)
+		self.votes.append(vote)
+		self.vote_bills.append((bill_table, bill_row))
+
+		for decision, rep_ids in [(True, vote.yeas), (False, vote.nays)]:
+			for rep_id in rep_ids:
+				registry_id = self.ids[(vote.voting_body, rep_id)]
+				self.vote_rows[registry_id].append(row)
+				self.vote_decisions[registry_id].append(decision)
+
+		return row
+
+	def record_join(self, representative: Representative, coalition: Coalition, t: int) -> None:
+		"""
+		Records that a representative joined a coalition.
+
+		Parameters
+		----------
+		representative : Representative
+			The representative.
+		coalition : Coalition
+			The coalition.
+		t : int
+			The current time step.
+		"""
+
+		self.memberships[representative.registry_id].append((coalition.registry_id, t, True))
+		self.memberships[coalition.registry_id].append((representative.registry_id, t, True))
+
+	def record_leave(self, representative: Representative, coalition: Coalition, t: int) -> None:
+		"""
+		Records that a representative left a coalition, or that the coalition broke apart.
+
+		Parameters
+		----------
+		representative : Representative
+			The representative.
+		coalition : Coalition
+			The coalition.
+		t : int
+			The current time step.
+		"""
+
+		self.memberships[representative.registry_id].append((coalition.registry_id, t, False))
+		self.memberships[coalition.registry_id].append((representative.registry_id, t, False))
+
+	def get_votes(self, agent: CongressVoter) -> List[Tuple[Bill, Vote, bool]]:
+		"""
+		Gets all votes a representative took part in.
+
+		Parameters
+		----------
+		agent : CongressVoter
+			The representative.
+
+		Returns
+		-------
+		votes : List[Tuple[Bill, Vote, bool]]
+			The bills, the votes and whether the representative voted for the bill.
+		"""
+
+		rows = self.vote_rows[agent.registry_id]
+		decisions = self.vote_decisions[agent.registry_id]
+		bills = [self.vote_bills[row][0].get_bill(self.vote_bills[row][1]) for row in rows]
+		return [(bill, self.votes[row], decision) for bill, row, decision in zip(bills, rows, decisions)]
+
+	def get_sponsored_bills(self, agent: CongressVoter) -> List[Bill]:
+		"""
+		Gets all bills sponsored by a representative or a coalition.
+
+		Parameters
+		----------
+		agent : CongressVoter
+			The representative or coalition.
+
+		Returns
+		-------
+		bills : List[Bill]
+			The sponsored bills, in the order they were introduced in.
+		"""
+
+		return [bill_table.get_bill(row) for bill_table, rows in self.bill_rows
+				for row in rows[bill_table.sponsor_ids[rows] == agent.registry_id].tolist()]
+
+	def get_memberships(self, agent: CongressVoter) -> List[Tuple[CongressVoter, int, bool]]:
+		"""
+		Gets the membership history of a representative or a coalition.
+
+		For a representative, these are the coalitions it joined or left; for a coalition, these are the representatives
+		that joined or left it.
+
+		Parameters
+		----------
+		agent : CongressVoter
+			The representative or coalition.
+
+		Returns
+		-------
+		memberships : List[Tuple[CongressVoter, int, bool]]
+			The other agent, the time step and whether the representative joined (or left).
+		"""
+
+		return [(self.agents[other_id], t, joined) for other_id, t, joined in self.memberships[agent.registry_id]]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import time
+import numpy as np
+
+from congress_voter import CongressVoter
+from policy_range import PolicyRange
+from voter_table import VoterTable
+from cohort_table import CohortTable
+from voting_bodies import VotingBodies
+
+
+if __name__ == "__main__":
+
+	# Settings
+	seed = 0
+	chamber_sizes = [10000, 30000, 100000]  # the numbers of representatives of the synthetic chambers
+	n_bills = 1000
+	CongressVoter.threshold = 0.2  # a threshold at which bills pass and fail alike
+	VoterTable.sample_size = 400  # the number of voters sampled per approximate tally
+	VoterTable.confidence = 0.999  # the confidence level below which bills are counted exactly
+	CohortTable.n_policy_bins = 16  # the number of cells of the cohort grid along every policy axis
+	CohortTable.n_ideology_bins = 8  # the number of bins of the ideological incentive of the cohorts
+
+	# Tally the same bills exactly, through the index, from samples and by cohorts in every synthetic chamber, and
+	# compare
+	rng = np.random.default_rng(seed)
+	print("engine    members   units     seconds   speed-up  same outcome  mean error  exact / mean bound width")
+	for n_representatives in chamber_sizes:
+		voters = VoterTable.generate_at_random(n_representatives, VotingBodies.HOUSE, rng)
+		popularity = rng.random(n_bills)
+		lower, upper = PolicyRange.pick_policy_ranges_at_random(voters.policy[rng.integers(len(voters.policy),
+																						   size=n_bills)], rng)
+
+		start = time.perf_counter()
+		yeas = voters.count_yeas(voters.vote(popularity, lower, upper))
+		exact_seconds = time.perf_counter() - start
+		print("{:<10}{:<10}{:<10}{:.3f}".format("exact", n_representatives, len(voters.n_members), exact_seconds))
+
+		# The index, with the same counts
+		start = time.perf_counter()
+		indexed_yeas = voters.tally(popularity, lower, upper)
+		seconds = time.perf_counter() - start
+		print("{:<10}{:<10}{:<10}{:<10.3f}{:<10.1f}{:<14.1%}{:.2%}".format(
+			"indexed", n_representatives, len(voters.n_members), seconds, exact_seconds / seconds,
+			np.mean((indexed_yeas >= voters.majority) == (yeas >= voters.majority)),
+			np.mean(np.abs(indexed_yeas - yeas)) / n_representatives))
+
+		# Samples, with the share of bills that were counted exactly in the end
+		start = time.perf_counter()
+		estimates, half_widths = voters.estimate_yeas(popularity, lower, upper, rng)
+		seconds = time.perf_counter() - start
+		print("{:<10}{:<10}{:<10}{:<10.3f}{:<10.1f}{:<14.1%}{:<12.2%}{:.1%}".format(
+			"sampled", n_representatives, len(voters.n_members), seconds, exact_seconds / seconds,
+			np.mean((estimates >= voters.majority) == (yeas >= voters.majority)),
+			np.mean(np.abs(estimates - yeas)) / n_representatives, np.mean(half_widths == 0.0)))
+
+		# Cohorts, binned anew for every chamber, with the mean width of the bounds on the yeas
+		start = time.perf_counter()
+		cohorts = CohortTable(voters)
+		estimates, min_yeas, max_yeas = cohorts.count_yeas(popularity, lower, upper)
+		seconds = time.perf_counter() - start
+		print("{:<10}{:<10}{:<10}{:<10.3f}{:<10.1f}{:<14.1%}{:<12.2%}{:.2%}".format(
+			"cohorts", n_representatives, cohorts.n_cohorts, seconds, exact_seconds / seconds,
+			np.mean((estimates >= voters.majority) == (yeas >= voters.majority)),
+			np.mean(np.abs(estimates - yeas)) / n_representatives, np.mean(max_yeas - min_yeas) / n_representatives))
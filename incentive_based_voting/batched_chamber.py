@@ -0,0 +1,371 @@
+from __future__ import annotations
+
+import numpy as np
+
+from policy import Policy
+from incentive import Incentive
+from voter_table import VoterTable
+from random_source import RandomSource
+
+from typing import List, TYPE_CHECKING
+if TYPE_CHECKING:
+	from parties import Parties
+	from voting_bodies import VotingBodies
+	from random_streams import RandomStreams
+
+
+class BatchedChamber:
+	"""
+	The representatives and coalitions of one voting body in many independent replicates at once, where all state
+	carries a leading replicate axis.
+
+	Coalitions live in slots: a voting body of n representatives never has more than n / 2 coalitions at a time, since
+	every coalition has at least two members. Coalition formation follows the rules of FormationMode.SYNCHRONOUS, since
+	the order in which representatives join and leave one by one cannot be batched across replicates.
+	"""
+
+	def __init__(self, voting_body: VotingBodies, parties: List[Parties], n_replicates: int, streams: RandomStreams):
+		"""
+		Initialises the representatives of all replicates at random.
+
+		Parameters
+		----------
+		voting_body : VotingBodies
+			The voting body.
+		parties : List[Parties]
+			The parties of the representatives, by seat; they are the same in every replicate.
+		n_replicates : int
+			The number of replicates.
+		streams : RandomStreams
+			The random number generators, by source.
+		"""
+
+		self.voting_body: VotingBodies = voting_body
+		self.n_replicates: int = n_replicates
+		self.n_seats: int = len(parties)
+		self.n_slots: int = max(self.n_seats // 2, 1)
+
+		# The representatives, by replicate and seat; the party index is the value of the party minus one
+		self.party_index: np.ndarray = np.array([party.value - 1 for party in parties], dtype=int)
+		self.policy: np.ndarray = Policy.pick_policy_preferences_at_random(
+			parties, n_replicates, streams.get(RandomSource.POLICY_PREFERENCE, voting_body.value))
+		self.initial_importance: np.ndarray = streams.get(RandomSource.PARTY_IMPORTANCE, voting_body.value).power(
+			5, (n_replicates, self.n_seats))
+		self.importance: np.ndarray = self.initial_importance.copy()
+		self.big_dollar, self.ideological, self.party_pressure = Incentive.pick_incentives_at_random(
+			parties, n_replicates, streams.get(RandomSource.INCENTIVE, voting_body.value))
+
+		# The coalition slot of every representative, or -1 if they are not part of any coalition
+		self.member_of: np.ndarray = np.full((n_replicates, self.n_seats), -1, dtype=int)
+
+		# The coalitions, by replicate and slot; the party of a coalition is the party of its founding member
+		shape = (n_replicates, self.n_slots)
+		self.coalition_active: np.ndarray = np.zeros(shape, dtype=bool)
+		self.coalition_size: np.ndarray = np.zeros(shape, dtype=int)
+		self.coalition_policy: np.ndarray = np.zeros(shape + (Policy.n_dimensions,))
+		self.coalition_importance: np.ndarray = np.zeros(shape)
+		self.coalition_ideological: np.ndarray = np.zeros(shape)
+		self.coalition_party_pressure: np.ndarray = np.zeros(shape)
+		self.coalition_big_dollar: np.ndarray = np.zeros(shape, dtype=bool)
+		self.coalition_party_index: np.ndarray = np.zeros(shape, dtype=int)
+
+		# Whether the last coalition formation changed nothing in a replicate, so that the next one can be skipped
+		self.quiescent: np.ndarray = np.zeros(n_replicates, dtype=bool)
+
+	def get_blocks(self, replicates: np.ndarray, n_columns: int) -> List[np.ndarray]:
+		"""
+		Splits replicates into blocks, such that a block of distance matrices with the given number of columns has at
+		most Policy.max_block_size entries.
+
+		Parameters
+		----------
+		replicates : np.ndarray
+			The replicates.
+		n_columns : int
+			The number of columns of the distance matrices.
+
+		Returns
+		-------
+		blocks : List[np.ndarray]
+			The blocks of replicates.
+		"""
+
+		block_size = max(Policy.max_block_size // max(self.n_seats * n_columns, 1), 1)
+		return [replicates[start:start + block_size] for start in range(0, len(replicates), block_size)]
+
+	def aging(self, t: int) -> None:
+		"""
+		All representatives age, which makes them more important within their parties.
+
+		Parameters
+		----------
+		t : int
+			The current time step.
+		"""
+
+		self.importance = np.sqrt(t + 1) * self.initial_importance
+		self.update_coalitions()
+
+	def update_coalitions(self) -> None:
+		"""
+		Recomputes the size, the party importance, the policy preference and the incentives of every coalition from its
+		members, with segment sums over all replicates at once.
+		"""
+
+		n_segments = self.n_replicates * self.n_slots
+		members = self.member_of >= 0
+		segments = (np.arange(self.n_replicates)[:, None] * self.n_slots + self.member_of)[members]
+		importance = self.importance[members]
+
+		def segment_sum(weights: np.ndarray) -> np.ndarray:
+			return np.bincount(segments, weights=weights, minlength=n_segments).reshape(self.n_replicates, self.n_slots)
+
+		self.coalition_size = np.bincount(segments, minlength=n_segments).reshape(self.n_replicates, self.n_slots)
+		self.coalition_active = self.coalition_size > 0
+		self.coalition_importance = segment_sum(importance)
+
+		# The policy preference of a coalition is the mean of those of its members, weighted by party importance
+		d = Policy.n_dimensions
+		total = np.where(self.coalition_active, self.coalition_importance, 1.0)
+		weighted = np.bincount((segments[:, None] * d + np.arange(d)).ravel(),
+							   weights=(importance[:, None] * self.policy[members]).ravel(), minlength=n_segments * d)
+		self.coalition_policy = weighted.reshape(self.n_replicates, self.n_slots, d) / total[:, :, None]
+
+		# A coalition takes big dollar donations if any member does, and has the mean ideological incentive and party
+		# pressure
+		size = np.maximum(self.coalition_size, 1)
+		self.coalition_big_dollar = segment_sum(self.big_dollar[members].astype(float)) > 0.0
+		self.coalition_ideological = segment_sum(self.ideological[members]) / size
+		self.coalition_party_pressure = segment_sum(self.party_pressure[members]) / size
+
+	def coalition_formation(self) -> np.ndarray:
+		"""
+		Representatives join and leave coalitions, coalitions with a single member break, and pairs of representatives
+		without a coalition that are closest to each other form new ones, in all replicates at once.
+
+		Returns
+		-------
+		changed : np.ndarray
+			Whether the coalitions changed, by replicate.
+		"""
+
+		changed = np.zeros(self.n_replicates, dtype=bool)
+		replicates = np.flatnonzero(~self.quiescent)
+
+		# Join and leave coalitions, based on the coalitions as they were before
+		for block in self.get_blocks(replicates, self.n_slots):
+			changed[block] |= self.join_and_leave(block)
+		self.update_coalitions()
+
+		# Break coalitions that are left with a single member
+		single = self.coalition_active & (self.coalition_size == 1)
+		alone = np.take_along_axis(single, np.maximum(self.member_of, 0), axis=1) & (self.member_of >= 0)
+		self.member_of[alone] = -1
+		changed |= np.any(single, axis=1)
+		self.update_coalitions()
+
+		# Form new coalitions
+		for block in self.get_blocks(replicates, self.n_seats):
+			changed[block] |= self.pair(block)
+		self.update_coalitions()
+
+		self.quiescent = ~changed
+		return changed
+
+	def join_and_leave(self, block: np.ndarray) -> np.ndarray:
+		"""
+		Representatives without a coalition join the closest coalition, if it is important enough to them, and members
+		leave their coalitions, if they drifted too far, in a block of replicates.
+
+		Parameters
+		----------
+		block : np.ndarray
+			The replicates.
+
+		Returns
+		-------
+		changed : np.ndarray
+			Whether any representative joined or left a coalition, by replicate of the block.
+		"""
+
+		# Only the slots up to the last active one of the block are searched
+		n_slots = int(np.max(np.nonzero(np.any(self.coalition_active[block], axis=0))[0], initial=-1)) + 1
+		policy = self.policy[block]
+		coalition_policy = self.coalition_policy[block, :n_slots]
+		coalition_importance = self.coalition_importance[block, :n_slots]
+		importance = self.importance[block]
+		member_of = self.member_of[block]
+		active = self.coalition_active[block, :n_slots]
+		if n_slots == 0:
+			return np.zeros(len(block), dtype=bool)
+
+		# The closest active coalition of every representative, by the exact distance
+		distances = Policy.compute_batched_distances(policy, coalition_policy)
+		distances[~np.broadcast_to(active[:, None, :], distances.shape)] = np.inf
+		closest = np.argmin(distances, axis=2)
+		closest_distance = np.linalg.norm(policy - np.take_along_axis(coalition_policy, closest[:, :, None], axis=1),
+										  axis=2)
+		join = (member_of == -1) & np.any(active, axis=1)[:, None]\
+			   & (closest_distance < np.take_along_axis(coalition_importance, closest, axis=1) / importance)
+
+		# Members leave if their coalition drifted further away than it is important to them
+		own = np.maximum(member_of, 0)
+		own_distance = np.linalg.norm(policy - np.take_along_axis(coalition_policy, own[:, :, None], axis=1), axis=2)
+		leave = (member_of >= 0) & (own_distance > np.take_along_axis(coalition_importance, own, axis=1) / importance)
+
+		self.member_of[block] = np.where(join, closest, np.where(leave, -1, member_of))
+		return np.any(join | leave, axis=1)
+
+	def pair(self, block: np.ndarray) -> np.ndarray:
+		"""
+		Representatives without a coalition that are closest to each other form new coalitions, which take the first
+		free slots, in a block of replicates.
+
+		Parameters
+		----------
+		block : np.ndarray
+			The replicates.
+
+		Returns
+		-------
+		changed : np.ndarray
+			Whether any coalition was formed, by replicate of the block.
+		"""
+
+		free = self.member_of[block] == -1
+		seats = np.arange(self.n_seats)
+
+		# Gather the representatives without a coalition of every replicate first, in order of their seats
+		n_free = int(np.max(np.sum(free, axis=1), initial=0))
+		if n_free < 2:
+			return np.zeros(len(block), dtype=bool)
+		gathered = np.argsort(~free, axis=1, kind="stable")[:, :n_free]
+		valid = np.take_along_axis(free, gathered, axis=1)
+		policy = np.take_along_axis(self.policy[block], gathered[:, :, None], axis=1)
+
+		# The closest other representative without a coalition of every representative without a coalition
+		distances = Policy.compute_batched_distances(policy, policy)
+		distances[:, np.arange(n_free), np.arange(n_free)] = np.inf
+		distances[~np.broadcast_to(valid[:, None, :], distances.shape)] = np.inf
+		closest_gathered = np.argmin(distances, axis=2)
+		found_gathered = valid & np.isfinite(np.min(distances, axis=2))
+
+		# Scatter them back to the seats
+		rows = np.arange(len(block))[:, None]
+		closest = np.zeros(free.shape, dtype=int)
+		found = np.zeros(free.shape, dtype=bool)
+		closest[rows, gathered] = np.take_along_axis(gathered, closest_gathered, axis=1)
+		found[rows, gathered] = found_gathered
+
+		# Pairs that are closest to each other form a coalition, founded by the representative in the lower seat
+		mutual = found & (closest > seats) & (np.take_along_axis(closest, closest, axis=1) == seats)
+		rows, founders = np.nonzero(mutual)
+		partners = closest[rows, founders]
+
+		# The k-th new coalition of a replicate takes its k-th free slot
+		rank = np.cumsum(mutual, axis=1) - 1
+		free_slots = np.argsort(self.coalition_active[block], axis=1, kind="stable")
+		slots = free_slots[rows, rank[rows, founders]]
+
+		replicates = block[rows]
+		self.member_of[replicates, founders] = slots
+		self.member_of[replicates, partners] = slots
+		self.coalition_party_index[replicates, slots] = self.party_index[founders]
+
+		return np.any(mutual, axis=1)
+
+	def get_party_policy(self) -> np.ndarray:
+		"""
+		Computes the policy preferences of the parties in this voting body, as the means of those of their
+		representatives weighted by party importance.
+
+		Returns
+		-------
+		party_policy : np.ndarray
+			The policy preferences, by replicate, party index and axis; NaN for parties without representatives.
+		"""
+
+		membership = self.party_index[None, :] == np.arange(3)[:, None]
+		weights = self.importance[:, None, :] * membership[None, :, :]
+		total = np.sum(weights, axis=2)
+
+		with np.errstate(invalid="ignore", divide="ignore"):
+			return np.einsum("rps,rsk->rpk", weights, self.policy) / total[:, :, None]
+
+	@staticmethod
+	def in_range(policy: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+		"""
+		Checks whether policy preferences lie in the policy ranges of bills, one axis after the other.
+
+		Parameters
+		----------
+		policy : np.ndarray
+			The policy preferences, by replicate, voter and axis.
+		lower : np.ndarray
+			The lower bounds of the policy ranges of the bills, by replicate, bill and axis.
+		upper : np.ndarray
+			The upper bounds of the policy ranges of the bills, by replicate, bill and axis.
+
+		Returns
+		-------
+		in_range : np.ndarray
+			Whether the policy preferences lie in the policy ranges, by replicate, voter and bill.
+		"""
+
+		in_range = np.ones(policy.shape[:2] + lower.shape[1:2], dtype=bool)
+		for k in range(policy.shape[2]):
+			values = policy[:, :, None, k]
+			in_range &= (lower[:, None, :, k] <= values) & (values <= upper[:, None, :, k])
+
+		return in_range
+
+	def vote(self, popularity: np.ndarray, lower: np.ndarray, upper: np.ndarray, party_policy: np.ndarray)\
+			-> np.ndarray:
+		"""
+		All coalitions and all representatives without a coalition vote on the bills of every replicate.
+
+		Parameters
+		----------
+		popularity : np.ndarray
+			The popularity of the bills, by replicate and bill.
+		lower : np.ndarray
+			The lower bounds of the policy ranges of the bills, by replicate, bill and axis.
+		upper : np.ndarray
+			The upper bounds of the policy ranges of the bills, by replicate, bill and axis.
+		party_policy : np.ndarray
+			The policy preferences of the parties, by replicate, party index and axis.
+
+		Returns
+		-------
+		yeas : np.ndarray
+			The number of yeas, by replicate and bill.
+		"""
+
+		yeas = np.zeros(popularity.shape, dtype=int)
+		replicates = np.arange(self.n_replicates)
+		for block in self.get_blocks(replicates, popularity.shape[1]):
+
+			# Representatives without a coalition cast one vote each, coalitions one vote per member; only those that
+			# cast any votes are gathered, first in every replicate
+			n_votes = np.concatenate([(self.member_of[block] == -1).astype(int), self.coalition_size[block]], axis=1)
+			n_voters = int(np.max(np.sum(n_votes > 0, axis=1)))
+			voters = np.argsort(n_votes == 0, axis=1, kind="stable")[:, :n_voters]
+
+			def gather(representatives: np.ndarray, coalitions: np.ndarray) -> np.ndarray:
+				representatives = np.broadcast_to(representatives, (len(block),) + representatives.shape[1:])
+				both = np.concatenate([representatives, coalitions], axis=1)
+				return np.take_along_axis(both, voters.reshape(voters.shape + (1,) * (both.ndim - 2)), axis=1)
+
+			policy = gather(self.policy[block], self.coalition_policy[block])
+			party_index = gather(self.party_index[None, :], self.coalition_party_index[block])
+			parties_policy = np.take_along_axis(party_policy[block], party_index[:, :, None], axis=1)
+
+			in_range = BatchedChamber.in_range(policy, lower[block], upper[block])
+			party_in_range = BatchedChamber.in_range(parties_policy, lower[block], upper[block])
+			ideological = gather(self.ideological[block], self.coalition_ideological[block])
+			big_dollar = gather(self.big_dollar[block], self.coalition_big_dollar[block])
+			decisions = VoterTable.decide(in_range, party_in_range, ideological[:, :, None], big_dollar[:, :, None],
+										  popularity[block][:, None, :])
+			yeas[block] = np.einsum("rs,rsb->rb", np.take_along_axis(n_votes, voters, axis=1), decisions)
+
+		return yeas
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import time
+import numpy as np
+
+from timeline import Timeline
+from event import Event
+from parties import Parties
+from policy import Policy
+from policy_range import PolicyRange
+from vote import Vote
+from voting_bodies import VotingBodies
+from voting_body import VotingBody
+from batched_chamber import BatchedChamber
+from random_source import RandomSource
+from random_streams import RandomStreams
+
+from typing import Dict, Tuple, Union
+
+
+class BatchedSimulation:
+	"""
+	Many independent replicates of the simulation that advance in lockstep: a single pass through the timeline ages
+	the representatives, aggregates the parties, votes on the bills and forms the coalitions of all replicates at once.
+
+	The replicates share the rosters of the House and the Senate, and draw everything else -- policy preferences,
+	incentives, party importances, bills and the decisions of the President -- independently. Coalitions form by the
+	rules of FormationMode.SYNCHRONOUS, so the results are comparable to those of main.py in that mode statistically,
+	but not draw by draw.
+	"""
+
+	# Whether every source of randomness draws from a stream of its own every month, such that runs of different
+	# scenarios with the same seed share their random numbers wherever their states agree
+	common_random_numbers: bool = False
+
+	def __init__(self, n_replicates: int, start_year: int, end_year: int, n_bills: int,
+				 seed: Union[int, np.random.SeedSequence] = 0, president_party: Parties = Parties.DEMOCRATIC):
+		"""
+		Initialises all replicates.
+
+		Parameters
+		----------
+		n_replicates : int
+			The number of replicates.
+		start_year : int
+			The start year.
+		end_year : int
+			The end year.
+		n_bills : int
+			The number of bills that are brought before congress each month, in every replicate.
+		seed : Union[int, np.random.SeedSequence]
+			The seed of the random number generator.
+		president_party : Parties
+			The party of the President.
+		"""
+
+		self.n_replicates: int = n_replicates
+		self.n_bills: int = n_bills
+		self.president_party: Parties = president_party
+		self.streams: RandomStreams = RandomStreams(seed, BatchedSimulation.common_random_numbers)
+		self.timeline: Timeline = Timeline(start_year, end_year)
+
+		# Both chambers, with the parties of the representatives taken from the data
+		self.house: BatchedChamber = BatchedChamber(
+			VotingBodies.HOUSE, [party for _, _, _, party in VotingBody.read_roster(start_year, VotingBodies.HOUSE)],
+			n_replicates, self.streams)
+		self.senate: BatchedChamber = BatchedChamber(
+			VotingBodies.SENATE, [party for _, _, _, party in VotingBody.read_roster(start_year, VotingBodies.SENATE)],
+			n_replicates, self.streams)
+
+		# The bills of every month and their outcomes, by replicate, time step and bill
+		shape = (n_replicates, self.timeline.t_max, n_bills)
+		self.popularity: np.ndarray = np.zeros(shape)
+		self.sponsor_party_index: np.ndarray = np.zeros(shape, dtype=int)
+		self.house_yeas: np.ndarray = np.zeros(shape, dtype=int)
+		self.senate_yeas: np.ndarray = np.zeros(shape, dtype=int)
+		self.passed_house: np.ndarray = np.zeros(shape, dtype=bool)
+		self.passed_senate: np.ndarray = np.zeros(shape, dtype=bool)
+		self.passed: np.ndarray = np.zeros(shape, dtype=bool)
+
+		# The number of coalitions in the House and the Senate at the end of every month, by replicate and time step
+		self.n_coalitions: np.ndarray = np.zeros((n_replicates, self.timeline.t_max, 2), dtype=int)
+
+		# The policy preferences of the parties in the House and the Senate, by replicate, time step, chamber, party
+		# index and axis
+		self.party_policy: np.ndarray = np.zeros((n_replicates, self.timeline.t_max, 2, 3, Policy.n_dimensions))
+
+	def run(self) -> float:
+		"""
+		Runs all replicates through the whole timeline.
+
+		Returns
+		-------
+		seconds : float
+			How long the run took.
+		"""
+
+		start = time.perf_counter()
+		for t, time_step in enumerate(self.timeline.events):
+			for event in self.timeline.events[time_step]:
+
+				# Representatives age and gain political influence every month
+				if event == Event.AGING and t > 0:
+					self.house.aging(t)
+					self.senate.aging(t)
+
+				# New bills are being voted on every month
+				elif event == Event.NEW_LEGISLATURE:
+					self.new_legislature(t)
+
+				# New coalition formation occurs every month
+				elif event == Event.OPINION_FORMATION:
+					self.house.coalition_formation()
+					self.senate.coalition_formation()
+					self.n_coalitions[:, t, 0] = np.sum(self.house.coalition_active, axis=1)
+					self.n_coalitions[:, t, 1] = np.sum(self.senate.coalition_active, axis=1)
+
+		return time.perf_counter() - start
+
+	def new_legislature(self, t: int) -> None:
+		"""
+		New bills are introduced in every replicate, voted on by the House, the Senate and the President.
+
+		Parameters
+		----------
+		t : int
+			The current time step.
+		"""
+
+		# Update party policy preferences
+		house_party_policy = self.house.get_party_policy()
+		senate_party_policy = self.senate.get_party_policy()
+		self.party_policy[:, t, 0] = house_party_policy
+		self.party_policy[:, t, 1] = senate_party_policy
+
+		# Sponsors are chosen uniformly among all representatives and coalitions of both chambers
+		chambers = [self.house, self.senate]
+		policy = np.concatenate([c.policy for c in chambers] + [c.coalition_policy for c in chambers], axis=1)
+		party_index = np.concatenate([np.broadcast_to(c.party_index, (self.n_replicates, c.n_seats)) for c in chambers]
+									 + [c.coalition_party_index for c in chambers], axis=1)
+		active = np.concatenate([np.ones((self.n_replicates, c.n_seats), dtype=bool) for c in chambers]
+								+ [c.coalition_active for c in chambers], axis=1)
+		sponsors = self.pick_active_at_random(active, self.streams.get(RandomSource.SPONSOR, t))
+
+		# Create the bills
+		popularity = self.streams.get(RandomSource.BILL_POPULARITY, t).random((self.n_replicates, self.n_bills))
+		sponsor_policy = np.take_along_axis(policy, sponsors[:, :, None], axis=1)
+		lower, upper = PolicyRange.pick_policy_ranges_at_random(sponsor_policy,
+																self.streams.get(RandomSource.BILL_POLICY_RANGE, t))
+		self.popularity[:, t] = popularity
+		self.sponsor_party_index[:, t] = np.take_along_axis(party_index, sponsors, axis=1)
+
+		# Vote in the House, then in the Senate on those bills that passed the House
+		self.house_yeas[:, t] = self.house.vote(popularity, lower, upper, house_party_policy)
+		self.passed_house[:, t] = self.house_yeas[:, t] >= Vote.get_majority(VotingBodies.HOUSE)
+		self.senate_yeas[:, t] = np.where(self.passed_house[:, t],
+										  self.senate.vote(popularity, lower, upper, senate_party_policy), 0)
+		self.passed_senate[:, t] = self.senate_yeas[:, t] >= Vote.get_majority(VotingBodies.SENATE)
+
+		# The president decides at random, but is more likely to vote for a bill, if the sponsor is from their party
+		same_party = self.sponsor_party_index[:, t] == self.president_party.value - 1
+		draws = self.streams.get(RandomSource.PRESIDENT, t).random((self.n_replicates, self.n_bills))
+		signed = draws > np.where(same_party, 0.1, 0.9)
+		self.passed[:, t] = self.passed_senate[:, t] & signed
+
+	def get_metrics(self) -> Dict[str, np.ndarray]:
+		"""
+		Summarises every replicate by the metrics that ensemble analyses look at.
+
+		Returns
+		-------
+		metrics : Dict[str, np.ndarray]
+			By replicate and time step: the share of bills that passed the House, the Senate and the Congress (including
+			the President), the number of coalitions by chamber, and how far the policy preference of every party moved
+			since the first month, by chamber and party index (zero for parties without representatives); and by
+			replicate only, the number of coalitions by chamber at the end.
+		"""
+
+		drift = np.linalg.norm(self.party_policy - self.party_policy[:, :1], axis=-1)
+
+		return {"house_pass_rate": np.mean(self.passed_house, axis=2),
+				"senate_pass_rate": np.mean(self.passed_senate, axis=2),
+				"pass_rate": np.mean(self.passed, axis=2),
+				"n_coalitions": self.n_coalitions,
+				"final_n_coalitions": self.n_coalitions[:, -1],
+				"party_drift": np.nan_to_num(drift)}
+
+	def get_metric_ranges(self) -> Dict[str, Tuple[float, float]]:
+		"""
+		The ranges every metric can take.
+
+		Returns
+		-------
+		ranges : Dict[str, Tuple[float, float]]
+			The lowest and the highest value of every metric, by name.
+		"""
+
+		return {"house_pass_rate": (0.0, 1.0), "senate_pass_rate": (0.0, 1.0), "pass_rate": (0.0, 1.0),
+				"n_coalitions": (0.0, float(max(self.house.n_slots, self.senate.n_slots))),
+				"final_n_coalitions": (0.0, float(max(self.house.n_slots, self.senate.n_slots))),
+				"party_drift": (0.0, float(np.sqrt(Policy.n_dimensions)))}
+
+	def pick_active_at_random(self, active: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+		"""
+		Picks agents uniformly among the active ones, for every bill of every replicate.
+
+		Parameters
+		----------
+		active : np.ndarray
+			Whether every agent is active, by replicate and agent.
+		rng : np.random.Generator
+			The random number generator.
+
+		Returns
+		-------
+		agents : np.ndarray
+			The chosen agents, by replicate and bill.
+		"""
+
+		# Draw the k-th active agent by scaling a uniform number, such that runs with common random numbers pick the
+		# same agent as long as the same agents are active
+		n_agents = active.shape[1]
+		counts = np.cumsum(active, axis=1)
+		draws = rng.random((self.n_replicates, self.n_bills))
+		k = np.minimum((draws * counts[:, -1:]).astype(int), counts[:, -1:] - 1)
+
+		# It is found by searching the running count of active agents, with every replicate shifted past the last count
+		# of the one before, so that all replicates are searched at once
+		shift = np.arange(self.n_replicates)[:, None] * (n_agents + 1)
+		positions = np.searchsorted((counts + shift).ravel(), (k + shift).ravel(), side="right")
+
+		return positions.reshape(self.n_replicates, self.n_bills) - np.arange(self.n_replicates)[:, None] * n_agents
+
+
+if __name__ == "__main__":
+
+	# Settings
+	n_replicates = 1000
+	start_year = 2010
+	end_year = 2010
+	n_bills = 10  # the number of bills that are brought before congress each month, in every replicate
+
+	# Run and report
+	simulation = BatchedSimulation(n_replicates, start_year, end_year, n_bills)
+	seconds = simulation.run()
+	print("{} replicates of {} months in {:.2f} s ({:.1f} replicates per second)".format(
+		n_replicates, simulation.timeline.t_max, seconds, n_replicates / seconds))
+	print("Bills passed per replicate: {:.2f} of {}".format(np.mean(np.sum(simulation.passed, axis=(1, 2))),
+															 simulation.timeline.t_max * n_bills))
+	print("Coalitions at the end: House {:.1f}, Senate {:.1f}".format(*np.mean(simulation.n_coalitions[:, -1], axis=0)))
@@ -0,0 +1,206 @@
+import time
+import numpy as np
+
+from congress import Congress
+from timeline import Timeline
+from coalition import Coalition
+from formation_mode import FormationMode
+from voting_body import VotingBody
+
+from typing import Dict, List
+
+
+# The statistics recorded for every chamber and run
+STATISTICS = ["n_coalitions", "mean_coalition_size", "largest_coalition", "n_without_coalition", "n_passes",
+			  "seconds_per_pass"]
+
+
+def get_partition(voting_body: VotingBody) -> np.ndarray:
+	"""
+	Labels every seat with its coalition, or with a label of its own if it is not part of any coalition.
+
+	Parameters
+	----------
+	voting_body : VotingBody
+		The voting body.
+
+	Returns
+	-------
+	labels : np.ndarray
+		The label of every seat.
+	"""
+
+	labels = np.arange(len(voting_body.representatives)) + len(voting_body.coalitions)
+	for j, coalition in enumerate(voting_body.coalitions):
+		labels[[r.seat for r in coalition.representatives]] = j
+
+	return labels
+
+
+def compute_adjusted_rand_index(labels1: np.ndarray, labels2: np.ndarray) -> float:
+	"""
+	Computes how similar two partitions of the same seats are, from 0 (as similar as chance) to 1 (identical).
+
+	Parameters
+	----------
+	labels1 : np.ndarray
+		The labels of the first partition.
+	labels2 : np.ndarray
+		The labels of the second partition.
+
+	Returns
+	-------
+	adjusted_rand_index : float
+		The adjusted Rand index.
+	"""
+
+	_, labels1 = np.unique(labels1, return_inverse=True)
+	_, labels2 = np.unique(labels2, return_inverse=True)
+	contingency = np.zeros((labels1.max() + 1, labels2.max() + 1))
+	np.add.at(contingency, (labels1, labels2), 1)
+
+	pairs = np.sum(contingency * (contingency - 1)) / 2
+	pairs1 = np.sum(contingency.sum(axis=1) * (contingency.sum(axis=1) - 1)) / 2
+	pairs2 = np.sum(contingency.sum(axis=0) * (contingency.sum(axis=0) - 1)) / 2
+	expected = pairs1 * pairs2 / (len(labels1) * (len(labels1) - 1) / 2)
+	maximum = (pairs1 + pairs2) / 2
+	if maximum == expected:
+		return 1.0
+
+	return float((pairs - expected) / (maximum - expected))
+
+
+def run_formation(mode: FormationMode, seed: int, start_year: int, end_year: int) -> Dict:
+	"""
+	Runs only aging and coalition formation, which is all that coalitions depend on.
+
+	Parameters
+	----------
+	mode : FormationMode
+		How representatives join and leave coalitions.
+	seed : int
+		The seed; the same seed gives the same representatives in both modes.
+	start_year : int
+		The start year.
+	end_year : int
+		The end year.
+
+	Returns
+	-------
+	results : Dict
+		The statistics and the partition of the seats into coalitions, by chamber.
+	"""
+
+	np.random.seed(seed)
+	Coalition.formation_mode = mode
+	timeline = Timeline(start_year, end_year)
+	with Congress(start_year, timeline.t_max) as congress:
+
+		# Time coalition formation only, per chamber
+		voting_bodies = [congress.house, congress.senate]
+		seconds = np.zeros(len(voting_bodies))
+		for t in range(timeline.t_max):
+			if t > 0:
+				congress.aging(t)
+			for i, voting_body in enumerate(voting_bodies):
+				start = time.perf_counter()
+				voting_body.coalition_formation(t, congress.registry)
+				seconds[i] += time.perf_counter() - start
+
+	results = {}
+	for voting_body, seconds_ in zip(voting_bodies, seconds.tolist()):
+		sizes = np.array([len(c.representatives) for c in voting_body.coalitions])
+		n_passes = voting_body.n_formations - voting_body.n_skipped_formations
+		results[voting_body.voting_body.name.lower()] = {
+			"n_coalitions": len(sizes), "mean_coalition_size": np.mean(sizes) if len(sizes) > 0 else 0.0,
+			"largest_coalition": np.max(sizes, initial=0),
+			"n_without_coalition": sum(r.coalition is None for r in voting_body.representatives),
+			"n_passes": n_passes, "seconds_per_pass": seconds_ / max(n_passes, 1),
+			"partition": get_partition(voting_body)}
+
+	return results
+
+
+def compare_paired(differences: np.ndarray, n_permutations: int = 10000) -> float:
+	"""
+	Tests whether paired differences are centred around zero, by randomly flipping their signs.
+
+	Parameters
+	----------
+	differences : np.ndarray
+		The paired differences.
+	n_permutations : int
+		The number of random sign flips.
+
+	Returns
+	-------
+	p_value : float
+		The two-sided p-value.
+	"""
+
+	rng = np.random.default_rng(0)
+	observed = abs(np.mean(differences))
+	signs = rng.choice([-1.0, 1.0], size=(n_permutations, len(differences)))
+	flipped = np.abs(np.mean(signs * differences, axis=1))
+
+	return float((np.sum(flipped >= observed) + 1) / (n_permutations + 1))
+
+
+def run_benchmark(seeds: List[int], start_year: int, end_year: int) -> Dict:
+	"""
+	Runs both modes on the same representatives for every seed and compares them.
+
+	Parameters
+	----------
+	seeds : List[int]
+		The seeds.
+	start_year : int
+		The start year.
+	end_year : int
+		The end year.
+
+	Returns
+	-------
+	comparison : Dict
+		For every chamber and statistic, the mean in both modes, the mean paired difference and its p-value, as well as
+		the mean adjusted Rand index between the coalitions of both modes.
+	"""
+
+	sequential = [run_formation(FormationMode.SEQUENTIAL, seed, start_year, end_year) for seed in seeds]
+	synchronous = [run_formation(FormationMode.SYNCHRONOUS, seed, start_year, end_year) for seed in seeds]
+	Coalition.formation_mode = FormationMode.SEQUENTIAL
+
+	comparison = {}
+	for chamber in sequential[0].keys():
+		comparison[chamber] = {}
+		for statistic in STATISTICS:
+			values1 = np.array([results[chamber][statistic] for results in sequential], dtype=float)
+			values2 = np.array([results[chamber][statistic] for results in synchronous], dtype=float)
+			comparison[chamber][statistic] = {"sequential": float(np.mean(values1)),
+											  "synchronous": float(np.mean(values2)),
+											  "difference": float(np.mean(values2 - values1)),
+											  "p_value": compare_paired(values2 - values1)}
+		comparison[chamber]["adjusted_rand_index"] = float(np.mean([
+			compute_adjusted_rand_index(results1[chamber]["partition"], results2[chamber]["partition"])
+			for results1, results2 in zip(sequential, synchronous)]))
+
+	return comparison
+
+
+if __name__ == "__main__":
+
+	# Settings
+	seeds = list(range(20))
+	start_year = 2010
+	end_year = 2011
+
+	# Run and report
+	comparison = run_benchmark(seeds, start_year, end_year)
+	for chamber, statistics in comparison.items():
+		print(chamber.capitalize())
+		for statistic in STATISTICS:
+			values = statistics[statistic]
+			print("  {:<22}sequential {:>10.4g}  synchronous {:>10.4g}  difference {:>+10.4g}  p = {:.4f}".format(
+				statistic, values["sequential"], values["synchronous"], values["difference"], values["p_value"]))
+		print("  adjusted Rand index between the coalitions of both modes: {:.3f}".format(
+			statistics["adjusted_rand_index"]))
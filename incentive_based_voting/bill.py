@@ -60,3 +60,21 @@ class Bill:
 		"""
 
 		return np.random.random()
+
+	@staticmethod
+	def get_popularities_at_random(n: int) -> np.ndarray:
+		"""
+		Chooses the popularities of many bills at random at once.
+
+		Parameters
+		----------
+		n : int
+			The number of bills.
+
+		Returns
+		-------
+		popularities : np.ndarray
+			The popularities of the bills.
+		"""
+
+		return np.random.random(n)
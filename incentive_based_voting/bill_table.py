@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import numpy as np
+
+from bill import Bill
+from bill_view import BillView
+from policy_range import PolicyRange
+
+from typing import List, Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+	from agent_registry import AgentRegistry
+
+
+class BillTable:
+	"""
+	All bills introduced in one time step, stored column by column.
+	"""
+
+	def __init__(self, sponsor_ids: np.ndarray, popularity: np.ndarray, lower: np.ndarray, upper: np.ndarray, t: int,
+				 registry: AgentRegistry):
+		"""
+		Initialises a new table of bills.
+
+		Parameters
+		----------
+		sponsor_ids : np.ndarray
+			The dense IDs of the sponsors of the bills.
+		popularity : np.ndarray
+			The popularity of the bills in the general population.
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one column per axis.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one column per axis.
+		t : int
+			The current time step.
+		registry : AgentRegistry
+			The agent registry the sponsors are taken from.
+		"""
+
+		# The sponsor(s) of the bills
+		self.sponsor_ids: np.ndarray = sponsor_ids
+		self.registry: AgentRegistry = registry
+
+		# The popularity of the bills in the general population
+		self.popularity: np.ndarray = popularity
+
+		# The time of introduction
+		self.voting_time: int = t
+
+		# The admissible policy ranges of the bills
+		self.lower: np.ndarray = lower
+		self.upper: np.ndarray = upper
+
+		# The outcomes of the bills
+		self.passed_house: np.ndarray = np.zeros(len(sponsor_ids), dtype=bool)
+		self.passed_senate: np.ndarray = np.zeros(len(sponsor_ids), dtype=bool)
+		self.passed_president: np.ndarray = np.zeros(len(sponsor_ids), dtype=bool)
+		self.passed: np.ndarray = np.zeros(len(sponsor_ids), dtype=bool)
+
+		# The bills as objects, which are only built once they are asked for
+		self.bills: Optional[List[BillView]] = None
+
+	def __len__(self) -> int:
+		"""
+		The number of bills in the table.
+		"""
+
+		return len(self.sponsor_ids)
+
+	@staticmethod
+	def generate_at_random(sponsor_ids: np.ndarray, registry: AgentRegistry, t: int) -> __class__:
+		"""
+		Generates bills at random for the given sponsors, all at once.
+
+		Parameters
+		----------
+		sponsor_ids : np.ndarray
+			The dense IDs of the sponsors.
+		registry : AgentRegistry
+			The agent registry the sponsors are taken from.
+		t : int
+			The current time step.
+
+		Returns
+		-------
+		bill_table : BillTable
+			The new bills.
+		"""
+
+		popularity = Bill.get_popularities_at_random(len(sponsor_ids))
+		lower, upper = PolicyRange.pick_policy_ranges_at_random(registry.policy[sponsor_ids])
+
+		return BillTable(sponsor_ids, popularity, lower, upper, t, registry)
+
+	def get_bill(self, row: int) -> BillView:
+		"""
+		Gets a single bill of the table.
+
+		Parameters
+		----------
+		row : int
+			The row of the bill.
+
+		Returns
+		-------
+		bill : BillView
+			The bill, backed by the table.
+		"""
+
+		if self.bills is not None:
+			return self.bills[row]
+		return BillView(self, row)
+
+	def get_bills(self) -> List[BillView]:
+		"""
+		Gets all bills of the table.
+
+		Returns
+		-------
+		bills : List[BillView]
+			The bills, backed by the table; they are built on the first call only.
+		"""
+
+		if self.bills is None:
+			self.bills = [BillView(self, row) for row in range(len(self))]
+		return self.bills
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from bill import Bill
+from policy_range import PolicyRange
+
+from typing import Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+	from bill_table import BillTable
+
+
+class BillView(Bill):
+	"""
+	A single bill that is stored in a row of a bill table.
+	"""
+
+	def __init__(self, table: BillTable, row: int):
+		"""
+		Initialises a view on a bill.
+
+		Parameters
+		----------
+		table : BillTable
+			The table the bill is stored in.
+		row : int
+			The row of the bill.
+		"""
+
+		self.table: BillTable = table
+		self.row: int = row
+
+		# The sponsor(s), the popularity and the time of introduction of the bill
+		self.sponsor = table.registry.agents[table.sponsor_ids[row]]
+		self.popularity = float(table.popularity[row])
+		self.voting_time = table.voting_time
+
+		# The admissible policy range is only built once it is needed
+		self._policy_range: Optional[PolicyRange] = None
+
+	@property
+	def policy_range(self) -> PolicyRange:
+		"""
+		The admissible policy range of the bill.
+		"""
+
+		if self._policy_range is None:
+			self._policy_range = PolicyRange(self.table.lower[self.row], self.table.upper[self.row])
+		return self._policy_range
+
+	@property
+	def passed_house(self) -> bool:
+		"""
+		Whether the bill passed the House.
+		"""
+
+		return bool(self.table.passed_house[self.row])
+
+	@passed_house.setter
+	def passed_house(self, passed: bool) -> None:
+		self.table.passed_house[self.row] = passed
+
+	@property
+	def passed_senate(self) -> bool:
+		"""
+		Whether the bill passed the Senate.
+		"""
+
+		return bool(self.table.passed_senate[self.row])
+
+	@passed_senate.setter
+	def passed_senate(self, passed: bool) -> None:
+		self.table.passed_senate[self.row] = passed
+
+	@property
+	def passed_president(self) -> bool:
+		"""
+		Whether the bill was signed by the President.
+		"""
+
+		return bool(self.table.passed_president[self.row])
+
+	@passed_president.setter
+	def passed_president(self, passed: bool) -> None:
+		self.table.passed_president[self.row] = passed
+
+	@property
+	def passed(self) -> bool:
+		"""
+		Whether the bill passed.
+		"""
+
+		return bool(self.table.passed[self.row])
+
+	@passed.setter
+	def passed(self, passed: bool) -> None:
+		self.table.passed[self.row] = passed
@@ -6,13 +6,16 @@ from congress_voter import CongressVoter
 from policy import Policy
 from financial_incentive import FinancialIncentive
 from incentive import Incentive
+from formation_mode import FormationMode
 
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
 	from representative import Representative
 	from bill import Bill
 	from party import Party
 	from voting_bodies import VotingBodies
+	from agent_registry import AgentRegistry
+	from distance_cache import DistanceCache
 
 
 class Coalition(CongressVoter):
@@ -20,6 +23,9 @@ class Coalition(CongressVoter):
 	Represents a single coalition in the House or the Senate with a policy preference.
 	"""
 
+	# Whether representatives join and leave coalitions one after the other, or all at once
+	formation_mode: FormationMode = FormationMode.SEQUENTIAL
+
 	def __init__(self, id_: str, created_from: List[Representative], voting_body: VotingBodies, t: int, t_max: int):
 		"""
 		Initialises a new coalition.
@@ -43,6 +49,8 @@ class Coalition(CongressVoter):
 
 		# The initial representatives that are part of the coalition
 		self.representatives: List[Representative] = created_from
+		for representative in created_from:
+			representative.coalition = self
 
 		# Set the initial policy preference
 		self.policy_preference = self.compute_policy_preference(t)
@@ -68,12 +76,10 @@ class Coalition(CongressVoter):
 			The policy preference of the coalition.
 		"""
 
-		libertarian = sum([r.party_importance_t[t] * r.policy_preference.libertarian for r in self.representatives])\
-					  / sum([r.party_importance_t[t] for r in self.representatives])
-		progressive = sum([r.party_importance_t[t] * r.policy_preference.progressive for r in self.representatives]) \
-					  / sum([r.party_importance_t[t] for r in self.representatives])
+		values = sum([r.party_importance_t[t] * r.policy_preference.values for r in self.representatives])\
+				 / sum([r.party_importance_t[t] for r in self.representatives])
 
-		return Policy(libertarian, progressive)
+		return Policy(values)
 
 	def compute_party_importance(self, t: int) -> float:
 		"""
@@ -136,7 +142,9 @@ class Coalition(CongressVoter):
 
 	@staticmethod
 	def coalition_formation(representatives: List[Representative], coalitions: List[__class__],
-							broken_coalitions: List[__class__], voting_body: VotingBodies, t: int, t_max: int) -> None:
+							broken_coalitions: List[__class__], voting_body: VotingBodies, t: int, t_max: int,
+							registry: Optional[AgentRegistry] = None, distance_cache: Optional[DistanceCache] = None)\
+			-> bool:
 		"""
 		Performs coalition formation in the House or the Senate.
 
@@ -154,37 +162,137 @@ class Coalition(CongressVoter):
 			Current time step.
 		t_max : int
 			The total number of time steps.
+		registry : Optional[AgentRegistry]
+			The agent registry that keeps track of coalition memberships, if any.
+		distance_cache : Optional[DistanceCache]
+			The closest seats of all representatives, if any; otherwise, closest representatives are searched anew.
+
+		Returns
+		-------
+		changed : bool
+			Whether any representative joined or left a coalition, or any coalition was formed or broke apart.
 		"""
 
-		# Representatives may join existing coalitions
-		representatives_who_recently_joined = []
-		for representative in representatives:
-			if len(coalitions) == 0:
-				break
+		# Representatives join and leave existing coalitions
+		if Coalition.formation_mode == FormationMode.SEQUENTIAL:
+			changed = Coalition.update_sequentially(representatives, coalitions, t, registry)
+		else:
+			changed = Coalition.update_synchronously(representatives, coalitions, broken_coalitions, t, registry)
 
-			# Find the closest coalition
-			closest_coalition = None
-			closest_coalition_dist = np.inf
-			for coalition in coalitions:
-				policy_dist = Policy.compute_distance(representative.policy_preference, coalition.policy_preference)
-				if closest_coalition_dist > policy_dist:
-					closest_coalition = coalition
-					closest_coalition_dist = policy_dist
-
-			# An agent is more likely to join a coalition if they are less powerful, if the coalition is more powerful, or
-			# if the coalition is closer to them
-			# TODO: Really fucking arbitrary inequality.
-			if closest_coalition_dist < closest_coalition.party_importance_t[t] / representative.party_importance_t[t]:
-				representative.coalition = closest_coalition
-				closest_coalition.representatives.append(representative)
+		# A coalition with only one existing member falls apart; the list is only changed after all coalitions were
+		# checked, such that none is skipped
+		for coalition in coalitions:
+			if len(coalition.representatives) == 1:
+				if registry is not None:
+					registry.record_leave(coalition.representatives[0], coalition, t)
+					registry.deactivate(coalition)
+				coalition.representatives[0].coalition = None
+				broken_coalitions.append(coalition)
+				changed = True
+		coalitions[:] = [coalition for coalition in coalitions if len(coalition.representatives) != 1]
+
+		# Representatives may decide to form a new coalition; first, every representative without a coalition looks for
+		# the closest other representative without a coalition
+		free = [r for r in representatives if r.coalition is None]
+		if distance_cache is not None:
+			seats = np.array([r.seat for r in free], dtype=int)
+			closest_seats = distance_cache.find_closest(seats)
+			index_by_seat = np.full(len(distance_cache.policy), -1, dtype=int)
+			index_by_seat[seats] = np.arange(len(free))
+			closest = np.where(closest_seats >= 0, index_by_seat[closest_seats], -1)
+		else:
+			free_policy = np.array([r.policy_preference.values for r in free]).reshape(len(free), Policy.n_dimensions)
+			closest, _ = Policy.find_closest(free_policy, free_policy, exclude_self=True)
 
-				# Re-compute policy-preference and importance of the coalition
-				closest_coalition.policy_preference = closest_coalition.compute_policy_preference(t)
-				closest_coalition.party_importance_t[t] = closest_coalition.compute_party_importance(t)
-				closest_coalition.incentive = closest_coalition.compute_incentives()
+		# Second, mutually closest representatives form new coalitions
+		coalition_counter = 1
+		for i, j in enumerate(closest.tolist()):
+			if j <= i or closest[j] != i:
+				continue
+			representative1, matched_representative = free[i], free[j]
+
+			# Form a new coalition
+			new_coalition = Coalition("CO_" + str(t) + "_" + str(coalition_counter),
+									  [representative1, matched_representative], voting_body, t, t_max)
+			coalitions.append(new_coalition)
+			coalition_counter += 1
+			if registry is not None:
+				registry.register(new_coalition, t)
+				registry.record_join(representative1, new_coalition, t)
+				registry.record_join(matched_representative, new_coalition, t)
+			changed = True
+
+		return changed
+
+	@staticmethod
+	def update_sequentially(representatives: List[Representative], coalitions: List[__class__], t: int,
+							registry: Optional[AgentRegistry] = None) -> bool:
+		"""
+		Representatives join and leave existing coalitions one after the other, such that every decision takes all
+		earlier decisions of the month into account.
 
-				# Won't have these people join and leave in the same month
-				representatives_who_recently_joined.append(representative)
+		Parameters
+		----------
+		representatives : List[Representative]
+			The list of current representatives.
+		coalitions : List[Coalition]
+			The list of current coalitions.
+		t : int
+			Current time step.
+		registry : Optional[AgentRegistry]
+			The agent registry that keeps track of coalition memberships, if any.
+
+		Returns
+		-------
+		changed : bool
+			Whether any representative joined or left a coalition.
+		"""
+
+		changed = False
+
+		# Representatives without a coalition may join existing coalitions; the distances to all coalitions are computed
+		# block by block, and the distances to a coalition are refreshed whenever someone joins it
+		representatives_who_recently_joined = []
+		if len(coalitions) > 0:
+			policy = np.array([r.policy_preference.values for r in representatives])
+			coalition_policy = np.array([c.policy_preference.values for c in coalitions])
+			for start, distances in Policy.iterate_distances(policy, coalition_policy):
+				for i, representative in enumerate(representatives[start:start + len(distances)]):
+					if representative.coalition is not None:
+						continue
+
+					# Find the closest coalition, ranking near-ties by their exact distances
+					row = slice(start + i, start + i + 1)
+					j = int(Policy.pick_closest(policy[row], coalition_policy, distances[i:i + 1])[0])
+					closest_coalition = coalitions[j]
+					closest_coalition_dist = Policy.compute_distance(representative.policy_preference,
+																	 closest_coalition.policy_preference)
+
+					# An agent is more likely to join a coalition if they are less powerful, if the coalition is more
+					# powerful, or if the coalition is closer to them
+					# TODO: Really fucking arbitrary inequality.
+					if closest_coalition_dist >= closest_coalition.party_importance_t[t] \
+							/ representative.party_importance_t[t]:
+						continue
+					representative.coalition = closest_coalition
+					closest_coalition.representatives.append(representative)
+
+					# Re-compute policy-preference and importance of the coalition
+					closest_coalition.policy_preference = closest_coalition.compute_policy_preference(t)
+					closest_coalition.party_importance_t[t] = closest_coalition.compute_party_importance(t)
+					closest_coalition.incentive = closest_coalition.compute_incentives()
+					if registry is not None:
+						registry.record_join(representative, closest_coalition, t)
+						registry.update_policy(closest_coalition, t)
+
+					# The coalition moved
+					coalition_policy[j] = closest_coalition.policy_preference.values
+					rest = policy[start + i + 1:start + len(distances)]
+					distances[i + 1:, j] = np.sqrt(np.sum((rest - coalition_policy[j]) ** 2, axis=1))
+
+					# Won't have these people join and leave in the same month
+					representatives_who_recently_joined.append(representative)
+					changed = True
 
 		# Representatives may decide to leave existing coalitions
 		for representative in representatives:
@@ -205,48 +313,91 @@ class Coalition(CongressVoter):
 				representative.coalition.policy_preference = representative.coalition.compute_policy_preference(t)
 				representative.coalition.party_importance_t[t] = representative.coalition.compute_party_importance(t)
 				representative.coalition.incentive = representative.coalition.compute_incentives()
+				if registry is not None:
+					registry.record_leave(representative, representative.coalition, t)
+					registry.update_policy(representative.coalition, t)
 
 				representative.coalition = None
+				changed = True
 
-		# A coalition with only one existing member falls apart
-		for coalition in coalitions:
-			if len(coalition.representatives) == 1:
-				coalition.representatives[0].coalition = None
-				broken_coalitions.append(coalition)
-				coalitions.remove(coalition)
+		return changed
 
-		# Representatives may decide to form a new coalition; first, look for the pairwise closest representatives
-		closest_representatives = []
-		for representative1 in representatives:
-			if representative1.coalition is not None:
-				continue
+	@staticmethod
+	def update_synchronously(representatives: List[Representative], coalitions: List[__class__],
+							 broken_coalitions: List[__class__], t: int, registry: Optional[AgentRegistry] = None)\
+			-> bool:
+		"""
+		Representatives join and leave existing coalitions all at once: every decision is based on the coalitions at the
+		start of the month, and only then are all decisions applied.
 
-			# Each representative looks for the representative closest to them
-			closest_representative = None
-			closest_representative_dist = np.inf
-			for representative2 in representatives:
-				if representative2.coalition is not None or representative1 == representative2:
-					continue
-				policy_dist = Policy.compute_distance(representative1.policy_preference, representative2.policy_preference)
-				if closest_representative_dist > policy_dist:
-					closest_representative = representative2
-					closest_representative_dist = policy_dist
-			closest_representatives.append(closest_representative)
-
-		# Second, check for new matches
-		coalition_counter = 1
-		for i, representative1 in enumerate(representatives):
-			matched_representative = None
-			for j, representative2 in enumerate(representatives):
-				if (closest_representatives[i] is not None and closest_representatives[i].id == representative2.id
-						and closest_representatives[j].id == representative1.id and i < j):
-					matched_representative = representative2
-					break
-			if matched_representative is None:
-				continue
+		Parameters
+		----------
+		representatives : List[Representative]
+			The list of current representatives.
+		coalitions : List[Coalition]
+			The list of current coalitions.
+		broken_coalitions : List[Coalition]
+			The list of broken coalitions, which coalitions that all members left at once are added to.
+		t : int
+			Current time step.
+		registry : Optional[AgentRegistry]
+			The agent registry that keeps track of coalition memberships, if any.
 
-			# Form a new coalition
-			new_coalition = Coalition("CO_" + str(t) + "_" + str(coalition_counter),
-									  [representative1, matched_representative], voting_body, t, t_max)
-			coalitions.append(new_coalition)
-			coalition_counter += 1
+		Returns
+		-------
+		changed : bool
+			Whether any representative joined or left a coalition.
+		"""
+
+		if len(coalitions) == 0:
+			return False
+
+		# The state at the start of the month
+		policy = np.array([r.policy_preference.values for r in representatives])
+		importance = np.array([r.party_importance_t[t] for r in representatives])
+		coalition_policy = np.array([c.policy_preference.values for c in coalitions])
+		coalition_importance = np.array([c.party_importance_t[t] for c in coalitions])
+		index_of = {coalition: j for j, coalition in enumerate(coalitions)}
+		member_of = np.array([-1 if r.coalition is None else index_of[r.coalition] for r in representatives], dtype=int)
+
+		# Representatives without a coalition join the closest coalition under the same rule as in the sequential mode
+		free = np.flatnonzero(member_of == -1)
+		closest, distances = Policy.find_closest(policy[free], coalition_policy)
+		joining = distances < coalition_importance[closest] / importance[free]
+		joins, joined = free[joining], closest[joining]
+
+		# Members leave their coalition under the same rule as in the sequential mode
+		members = np.flatnonzero(member_of >= 0)
+		own = member_of[members]
+		distances = np.sqrt(np.sum((policy[members] - coalition_policy[own]) ** 2, axis=1))
+		leaves = members[distances > coalition_importance[own] / importance[members]]
+
+		# Apply all decisions together
+		for i, j in zip(joins.tolist(), joined.tolist()):
+			representatives[i].coalition = coalitions[j]
+			coalitions[j].representatives.append(representatives[i])
+			if registry is not None:
+				registry.record_join(representatives[i], coalitions[j], t)
+		for i in leaves.tolist():
+			coalition = representatives[i].coalition
+			coalition.representatives.remove(representatives[i])
+			if registry is not None:
+				registry.record_leave(representatives[i], coalition, t)
+			representatives[i].coalition = None
+
+		# Re-compute policy-preference and importance of every coalition that changed, or drop it if everyone left
+		for j in np.unique(np.concatenate([joined, member_of[leaves]])).tolist():
+			coalition = coalitions[j]
+			if len(coalition.representatives) == 0:
+				if registry is not None:
+					registry.deactivate(coalition)
+				broken_coalitions.append(coalition)
+				continue
+			coalition.policy_preference = coalition.compute_policy_preference(t)
+			coalition.party_importance_t[t] = coalition.compute_party_importance(t)
+			coalition.incentive = coalition.compute_incentives()
+			if registry is not None:
+				registry.update_policy(coalition, t)
+		coalitions[:] = [coalition for coalition in coalitions if len(coalition.representatives) > 0]
+
+		return len(joins) > 0 or len(leaves) > 0
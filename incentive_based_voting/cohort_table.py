@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import numpy as np
+
+from congress_voter import CongressVoter
+from policy import Policy
+from voter_table import VoterTable
+
+from typing import Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+	from voting_bodies import VotingBodies
+
+
+class CohortTable:
+	"""
+	The voters of a voting body, binned into cohorts by party, financial incentive, the cell of a grid over the policy
+	space and a bin of the ideological incentive, such that the rule of CongressVoter.vote is applied once per cohort
+	rather than once per voter.
+
+	Every cohort votes as its member-weighted mean voter, and the range of its policy preferences and ideological
+	incentives bounds the yeas it could cast: the lowest and the highest number of yeas over all bills are exact bounds
+	on the yeas of the voters, up to rounding, and they coincide for cohorts of a single voter.
+	"""
+
+	# The number of cells of the grid along every policy axis, and the number of bins of the ideological incentive
+	n_policy_bins: int = 16
+	n_ideology_bins: int = 8
+
+	def __init__(self, voters: VoterTable):
+		"""
+		Bins the voters into cohorts.
+
+		Parameters
+		----------
+		voters : VoterTable
+			The voters.
+		"""
+
+		self.voting_body: VotingBodies = voters.voting_body
+		self.majority: int = voters.majority
+		self.n_voters: int = len(voters.n_members)
+
+		# The cohort of every voter, by its party, financial incentive, policy cell and ideology bin
+		n_policy_bins = CohortTable.n_policy_bins
+		n_ideology_bins = CohortTable.n_ideology_bins
+		key = voters.party_index * 2 + voters.big_dollar
+		policy_bins = np.clip(np.floor(voters.policy * n_policy_bins).astype(int), 0, n_policy_bins - 1)
+		for axis in range(Policy.n_dimensions):
+			key = key * n_policy_bins + policy_bins[:, axis]
+		ideological_range = (np.min(voters.ideological), np.max(voters.ideological))
+		ideology_bins = np.floor((voters.ideological - ideological_range[0])
+								 / max(ideological_range[1] - ideological_range[0], 1e-12) * n_ideology_bins)
+		key = key * n_ideology_bins + np.clip(ideology_bins.astype(int), 0, n_ideology_bins - 1)
+		_, cohort_of = np.unique(key, return_inverse=True)
+		cohort_of = cohort_of.ravel()
+		n_cohorts = cohort_of.max(initial=-1) + 1
+
+		# The voters sorted by cohort, such that cohorts are contiguous
+		order = np.argsort(cohort_of, kind="stable")
+		first = np.searchsorted(cohort_of[order], np.arange(n_cohorts))
+		leaders = order[first]
+
+		# Party and financial incentive are the same for all voters of a cohort; the policy preferences of the parties
+		# are kept by party
+		self.n_members: np.ndarray = np.bincount(cohort_of, weights=voters.n_members, minlength=n_cohorts).astype(int)
+		self.party_index: np.ndarray = voters.party_index[leaders]
+		self.big_dollar: np.ndarray = voters.big_dollar[leaders]
+		self.party_policy: np.ndarray = voters.party_policy
+
+		# Policy preferences and ideological incentives are averaged by members, and bounded by their ranges
+		self.policy: np.ndarray = np.stack([np.bincount(cohort_of, weights=voters.n_members * voters.policy[:, axis],
+														minlength=n_cohorts) for axis in range(Policy.n_dimensions)],
+										   axis=1) / self.n_members[:, None]
+		self.policy_low: np.ndarray = np.minimum.reduceat(voters.policy[order], first, axis=0)
+		self.policy_high: np.ndarray = np.maximum.reduceat(voters.policy[order], first, axis=0)
+		self.ideological: np.ndarray = np.bincount(cohort_of, weights=voters.n_members * voters.ideological,
+												   minlength=n_cohorts) / self.n_members
+		self.ideological_low: np.ndarray = np.minimum.reduceat(voters.ideological[order], first)
+		self.ideological_high: np.ndarray = np.maximum.reduceat(voters.ideological[order], first)
+
+	@property
+	def n_cohorts(self) -> int:
+		"""
+		The number of occupied cohorts.
+		"""
+
+		return len(self.n_members)
+
+	def count_yeas(self, popularity: np.ndarray, lower: np.ndarray, upper: np.ndarray)\
+			-> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+		"""
+		Counts the yeas for many bills at once, cohort by cohort.
+
+		Parameters
+		----------
+		popularity : np.ndarray
+			The popularity of the bills.
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+
+		Returns
+		-------
+		yeas : np.ndarray
+			The number of yeas for every bill, with every cohort voting as its mean voter.
+		min_yeas : np.ndarray
+			The number of yeas of the cohorts that vote for a bill whatever the policy preferences and ideological
+			incentives of their voters within their ranges.
+		max_yeas : np.ndarray
+			The number of yeas of the cohorts that could vote for a bill.
+		"""
+
+		weights = CongressVoter.weights
+		yeas = np.zeros(len(popularity), dtype=int)
+		min_yeas = np.zeros(len(popularity), dtype=int)
+		max_yeas = np.zeros(len(popularity), dtype=int)
+
+		# Bills are taken in blocks, such that every comparison takes at most Policy.max_block_size entries
+		n_bills = max(Policy.max_block_size // max(self.n_cohorts * Policy.n_dimensions, 1), 1)
+		for start in range(0, len(popularity), n_bills):
+			block = slice(start, start + n_bills)
+			popularity_ = popularity[None, block]
+			big_dollar = self.big_dollar[:, None]
+			party_in_range = CohortTable.contains(self.party_policy, self.party_policy, lower[block],
+												  upper[block])[self.party_index]
+
+			# The mean voter of every cohort votes by the rule itself
+			in_range = CohortTable.contains(self.policy, self.policy, lower[block], upper[block])
+			decisions = VoterTable.decide(in_range, party_in_range, self.ideological[:, None], big_dollar, popularity_)
+
+			# The policy preferences of the voters of a cohort lie all in the policy range of a bill, all outside of
+			# it, or either; for either, the metric is linear in the ideological incentive, so its extremes are taken
+			# at the ends of the range of ideological incentives
+			inside = CohortTable.contains(self.policy_low, self.policy_high, lower[block], upper[block])
+			overlaps = CohortTable.contains(self.policy_high, self.policy_low, lower[block], upper[block])
+			popularity_finance = weights["popularity_finance"] * np.where(big_dollar, 1.0 - popularity_, popularity_)
+			party_pressure = weights["party_pressure"] * (party_in_range & big_dollar)
+			low = np.full(inside.shape, np.inf)
+			high = np.full(inside.shape, -np.inf)
+			for in_range in [inside, overlaps]:
+				slope = weights["ideology"] * in_range + party_pressure
+				for ideological in [self.ideological_low, self.ideological_high]:
+					metric = popularity_finance + ideological[:, None] * slope
+					np.minimum(low, metric, out=low)
+					np.maximum(high, metric, out=high)
+
+			yeas[block] = self.n_members @ decisions
+			min_yeas[block] = self.n_members @ (low >= CongressVoter.threshold)
+			max_yeas[block] = self.n_members @ (high >= CongressVoter.threshold)
+
+		return yeas, min_yeas, max_yeas
+
+	@staticmethod
+	def contains(low: np.ndarray, high: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+		"""
+		Checks whether lower <= low and high <= upper along every axis, one axis after the other, for every cohort and
+		every bill; with low and high swapped, this checks whether the boxes of the cohorts and the policy ranges of
+		the bills overlap.
+
+		Parameters
+		----------
+		low : np.ndarray
+			The lower corners of the boxes, by cohort and axis.
+		high : np.ndarray
+			The upper corners of the boxes, by cohort and axis.
+		lower : np.ndarray
+			The lower bounds of the policy ranges of the bills, by bill and axis.
+		upper : np.ndarray
+			The upper bounds of the policy ranges of the bills, by bill and axis.
+
+		Returns
+		-------
+		contains : np.ndarray
+			Whether the condition holds, by cohort and bill.
+		"""
+
+		contains = np.ones((len(low), len(lower)), dtype=bool)
+		for k in range(low.shape[1]):
+			contains &= (lower[None, :, k] <= low[:, None, k]) & (high[:, None, k] <= upper[None, :, k])
+
+		return contains
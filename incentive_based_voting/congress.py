@@ -3,17 +3,18 @@ from __future__ import annotations
 import numpy as np
 
 from copy import deepcopy
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from house import House
 from senate import Senate
 from bill import Bill
+from bill_table import BillTable
+from agent_registry import AgentRegistry
 
-from typing import List, Union, TYPE_CHECKING
+from typing import Callable, List, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
-	from house_representative import HouseRepresentative
-	from senate_representative import SenateRepresentative
-	from coalition import Coalition
 	from party import Party
+	from voting_body import VotingBody
 
 
 class Congress:
@@ -21,6 +22,11 @@ class Congress:
 	The congress.
 	"""
 
+	# The number of threads that independent work of both chambers and chunks of bills are spread over, and the number
+	# of bills per chunk
+	n_workers: int = 1
+	chunk_size: int = 256
+
 	def __init__(self, year: int, t_max: int):
 		"""
 		Initialises a new congress.
@@ -37,13 +43,78 @@ class Congress:
 		self.house = House(year, t_max)
 		self.senate = Senate(year, t_max)
 
-		# Bills by year
-		self.bills_by_year: List[List[Bill]] = []
+		# Keeps track of all representatives and coalitions
+		self.registry = AgentRegistry()
+		for r in self.house.representatives + self.senate.representatives:
+			self.registry.register(r)
+
+		# Bills by year, as tables; they are only built as objects when asked for (see bills_by_year)
+		self.bill_tables_by_year: List[BillTable] = []
+
+		# The thread pool, if there is more than one thread
+		self.executor: Optional[ThreadPoolExecutor] = None
+		if Congress.n_workers > 1:
+			self.executor = ThreadPoolExecutor(max_workers=Congress.n_workers)
 
-		# Bills who made it through the Congress in this time step
-		self.bills_successful: List[Bill] = []
+	def __enter__(self) -> Congress:
+		return self
 
-	def generate_some_bills(self, n_bills: int, t: int) -> None:
+	def __exit__(self, *args) -> None:
+		self.close()
+
+	def close(self) -> None:
+		"""
+		Shuts the thread pool down, if there is one, once all work submitted to it is done.
+		"""
+
+		if self.executor is not None:
+			self.executor.shutdown()
+			self.executor = None
+
+	@property
+	def bills_by_year(self) -> List[List[Bill]]:
+		"""
+		Bills by year, as objects backed by the bill tables.
+		"""
+
+		return [bill_table.get_bills() for bill_table in self.bill_tables_by_year]
+
+	@property
+	def bills_successful(self) -> List[Bill]:
+		"""
+		Bills who made it through the Congress in this time step, as objects backed by the bill table.
+		"""
+
+		if len(self.bill_tables_by_year) == 0:
+			return []
+		bill_table = self.bill_tables_by_year[-1]
+		return [bill_table.get_bill(row) for row in np.flatnonzero(bill_table.passed_senate).tolist()]
+
+	def submit(self, function: Callable, *args) -> Future:
+		"""
+		Runs a function on the thread pool, or right away if there is none.
+
+		Parameters
+		----------
+		function : Callable
+			The function.
+		args
+			The arguments of the function.
+
+		Returns
+		-------
+		future : Future
+			The future result of the function.
+		"""
+
+		if self.executor is not None:
+			return self.executor.submit(function, *args)
+
+		future = Future()
+		future.set_result(function(*args))
+		return future
+
+	def generate_some_bills(self, n_bills: int, t: int, weighted_by_importance: bool = False) -> None:
 		"""
 		Generates bills at random.
 
@@ -53,31 +124,17 @@ class Congress:
 			The number of bills we are generating each month.
 		t : int
 			The current time step.
+		weighted_by_importance : bool
+			Whether sponsors are chosen proportionally to their party importance, instead of uniformly.
 		"""
 
-		# Choose sponsors at random
-		sponsor_ids = np.random.choice(range(len(self.house.representatives) + len(self.house.coalitions)
-											 + len(self.senate.representatives) + len(self.senate.coalitions)), n_bills)
-		sponsors: List[Union[HouseRepresentative, SenateRepresentative, Coalition]] = []
-		for sponsor_id in sponsor_ids:
-			if sponsor_id < len(self.house.representatives):
-				sponsors.append(self.house.representatives[sponsor_id])
-			elif sponsor_id < len(self.house.representatives) + len(self.house.coalitions):
-				sponsors.append(self.house.coalitions[sponsor_id - len(self.house.representatives)])
-			elif sponsor_id < len(self.house.representatives) + len(self.house.coalitions)\
-					+ len(self.senate.representatives):
-				sponsors.append(self.senate.representatives[sponsor_id - len(self.house.representatives)
-															- len(self.house.coalitions)])
-			else:
-				sponsors.append(self.senate.coalitions[sponsor_id - len(self.house.representatives)
-													   - len(self.house.coalitions) - len(self.senate.representatives)])
+		# Choose sponsors at random among all representatives and coalitions of both chambers
+		sponsor_ids = self.registry.sample_sponsors(n_bills, t, weighted_by_importance)
 
 		# Generates corresponding bills
-		bills = []
-		for i in range(n_bills):
-			bill = Bill(sponsors[i], t)
-			bills.append(bill)
-		self.bills_by_year.append(bills)
+		bill_table = BillTable.generate_at_random(sponsor_ids, self.registry, t)
+		self.bill_tables_by_year.append(bill_table)
+		self.registry.record_bill_rows(bill_table, np.arange(len(bill_table)))
 
 	def attempt_passing_bills(self, democrats: Party, republicans: Party, otherparty: Party, t: int) -> None:
 		"""
@@ -95,25 +152,72 @@ class Congress:
 			The current time step.
 		"""
 
-		# House
-		votes = []
-		for bill in self.bills_by_year[-1]:
-			vote = self.house.vote(bill, democrats, republicans, otherparty, t)
-			bill.passed_house = vote.passed
-			votes.append(vote)
-		self.house.votes_by_year.append(deepcopy(votes))
+		bill_table = self.bill_tables_by_year[-1]
+		house_voters = self.house.get_voter_table(democrats, republicans, otherparty)
+		senate_voters = self.senate.get_voter_table(democrats, republicans, otherparty)
+
+		# The House votes on all chunks of bills at once
+		chunks = [np.arange(start, min(start + Congress.chunk_size, len(bill_table)))
+				  for start in range(0, len(bill_table), Congress.chunk_size)]
+		house_decisions = [self.submit(house_voters.vote, bill_table.popularity[rows], bill_table.lower[rows],
+									   bill_table.upper[rows]) for rows in chunks]
+
+		# As soon as the House is done with a chunk, the Senate votes on the bills of the chunk that passed; the results
+		# are collected in the order of the bills, whatever order the threads finish in
+		house_votes = []
+		senate_decisions = []
+		for rows, decisions in zip(chunks, house_decisions):
+			decisions = decisions.result()
+			votes = [house_voters.get_vote(decisions[:, k], t) for k in range(len(rows))]
+			for row, vote in zip(rows.tolist(), votes):
+				self.registry.record_vote(vote, bill_table, row)
+			house_votes.extend(votes)
+
+			# The outcomes are written to the table by row
+			bill_table.passed_house[rows] = [vote.passed for vote in votes]
+			passed = rows[bill_table.passed_house[rows]]
+			senate_decisions.append((passed, self.submit(senate_voters.vote, bill_table.popularity[passed],
+														 bill_table.lower[passed], bill_table.upper[passed])))
+		self.house.votes_by_year.append(deepcopy(house_votes))
 
 		# Senate
-		votes = []
-		for bill in self.bills_by_year[-1]:
-			if bill.passed_house:
-				vote = self.senate.vote(bill, democrats, republicans, otherparty, t)
-				bill.passed_senate = vote.passed
-				votes.append(vote)
-		self.senate.votes_by_year.append(deepcopy(votes))
+		senate_votes = []
+		for rows, decisions in senate_decisions:
+			decisions = decisions.result()
+			votes = [senate_voters.get_vote(decisions[:, k], t) for k in range(len(rows))]
+			for row, vote in zip(rows.tolist(), votes):
+				self.registry.record_vote(vote, bill_table, row)
+			senate_votes.extend(votes)
+			bill_table.passed_senate[rows] = [vote.passed for vote in votes]
+		self.senate.votes_by_year.append(deepcopy(senate_votes))
+
+	def coalition_formation(self, t: int) -> None:
+		"""
+		Coalitions form and break apart in the House and the Senate.
+
+		Parameters
+		----------
+		t : int
+			The current time step.
+		"""
 
-		# Remember the bill that have been successful so far
-		self.bills_successful = [bill for bill in self.bills_by_year[-1] if bill.passed_senate]
+		# Both chambers take turns, since new coalitions are registered in the order in which they are formed
+		for voting_body in [self.house, self.senate]:
+			voting_body.coalition_formation(t, self.registry)
+
+	def hold_election(self, voting_body: VotingBody, t: int) -> None:
+		"""
+		An election is held in the House or the Senate.
+
+		Parameters
+		----------
+		voting_body : VotingBody
+			The House or the Senate.
+		t : int
+			The current time step.
+		"""
+
+		voting_body.hold_election(t, self.registry)
 
 	def aging(self, t: int) -> None:
 		"""
@@ -125,16 +229,7 @@ class Congress:
 			The current time step.
 		"""
 
-		# For the House
-		for r in self.house.representatives:
-			r.party_importance_t[t] = (t + 1) ** 0.5 * r.party_importance_t[0]
-		for c in self.house.coalitions:
-			c.compute_party_importance(t)
-			c.compute_policy_preference(t)
-
-		# For the Senate
-		for r in self.senate.representatives:
-			r.party_importance_t[t] = (t + 1) ** 0.5 * r.party_importance_t[0]
-		for c in self.senate.coalitions:
-			c.compute_party_importance(t)
-			c.compute_policy_preference(t)
+		# Both chambers age independently of each other
+		futures = [self.submit(voting_body.aging, t, self.registry) for voting_body in [self.house, self.senate]]
+		for future in futures:
+			future.result()
@@ -6,7 +6,7 @@ from financial_incentive import FinancialIncentive
 from parties import Parties
 from voting_bodies import VotingBodies
 
-from typing import Optional, TYPE_CHECKING
+from typing import Dict, Optional, TYPE_CHECKING
 if TYPE_CHECKING:
 	from party import Party
 	from incentive import Incentive
@@ -19,6 +19,11 @@ class CongressVoter:
 	An agent allowed to vote in the US Congress -- either a representative or a coalition of representatives.
 	"""
 
+	# How much the ideology, the popularity (in view of the financial incentive) and the party pressure count when
+	# voting, and the metric needed to vote for a bill
+	weights: Dict[str, float] = {"ideology": 0.5, "popularity_finance": 0.3, "party_pressure": 0.2}
+	threshold: float = 2.0
+
 	def __init__(self, id_: str, party: Parties, voting_body: VotingBodies, t: int, t_max: int):
 		"""
 		Initialises our representative.
@@ -43,6 +48,9 @@ class CongressVoter:
 		self.voting_body: VotingBodies = voting_body
 		self.t_init: int = t
 
+		# The dense ID assigned by the agent registry
+		self.registry_id: Optional[int] = None
+
 		# Policy preferences over time
 		self.policy_preference: Optional[Policy] = None
 
@@ -87,21 +95,7 @@ class CongressVoter:
 			metric_popularity_finance = 1.0 - bill.popularity
 
 		# The agent is influenced by a certain amount of pressure from the party
-		if self.party == Parties.DEMOCRATIC:
-			if self.voting_body == VotingBodies.HOUSE:
-				party_policy = democrats.policy_preference_house_t[-1]
-			else:
-				party_policy = democrats.policy_preference_senate_t[-1]
-		elif self.party == Parties.REPUBLICAN:
-			if self.voting_body == VotingBodies.HOUSE:
-				party_policy = republicans.policy_preference_house_t[-1]
-			else:
-				party_policy = republicans.policy_preference_senate_t[-1]
-		else:
-			if self.voting_body == VotingBodies.HOUSE:
-				party_policy = otherparty.policy_preference_house_t[-1]
-			else:
-				party_policy = otherparty.policy_preference_senate_t[-1]
+		party_policy = self.get_party_policy(democrats, republicans, otherparty)
 
 		# The agent is more likely to vote for the bill if the party would and if they take big dollar donations
 		if bill.policy_range.in_range(party_policy) and self.incentive.financial == FinancialIncentive.BIG_DOLLAR:
@@ -110,8 +104,38 @@ class CongressVoter:
 			metric_party_pressure = 0
 
 		# Check if we're making it
-		threshold = 2.0
-		weights = {"ideology": 0.5, "popularity_finance": 0.3, "party_pressure": 0.2}
+		weights = CongressVoter.weights
 		metric = weights["ideology"] * metric_ideology + weights["popularity_finance"] * metric_popularity_finance\
 				 + weights["party_pressure"] * metric_party_pressure
-		return metric >= threshold
+		return metric >= CongressVoter.threshold
+
+	def get_party_policy(self, democrats: Party, republicans: Party, otherparty: Party) -> Policy:
+		"""
+		Gets the current policy preference of the party of the agent in its voting body.
+
+		Parameters
+		----------
+		democrats : Party
+			The democratic party.
+		republicans : Party
+			The republican party.
+		otherparty : Party
+			The other party.
+
+		Returns
+		-------
+		party_policy : Policy
+			The policy preference of the party.
+		"""
+
+		if self.party == Parties.DEMOCRATIC:
+			party = democrats
+		elif self.party == Parties.REPUBLICAN:
+			party = republicans
+		else:
+			party = otherparty
+
+		if self.voting_body == VotingBodies.HOUSE:
+			return party.policy_preference_house_t[-1]
+		else:
+			return party.policy_preference_senate_t[-1]
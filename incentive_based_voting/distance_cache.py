@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import numpy as np
+
+from policy import Policy
+
+
+class DistanceCache:
+	"""
+	Keeps, for every seat of a voting body, the closest other seats in order of the distance between the (static) policy
+	preferences of their representatives, so that closest representatives never have to be searched from scratch.
+	"""
+
+	# The number of closest seats kept for every seat
+	n_neighbours: int = 32
+
+	def __init__(self, policy: np.ndarray):
+		"""
+		Initialises the cache.
+
+		Parameters
+		----------
+		policy : np.ndarray
+			The policy preferences of the representatives, with one row per seat; the cache keeps a reference, so that
+			it can be rebuilt after the policy preferences of some seats changed.
+		"""
+
+		self.policy: np.ndarray = policy
+
+		# The closest other seats of every seat, closest first and ties broken by seat
+		self.neighbours: np.ndarray = np.zeros((len(policy), 0), dtype=int)
+
+		# Whether the closest seats are still up to date
+		self.valid: bool = False
+
+		self.build()
+
+	def build(self) -> None:
+		"""
+		Computes the closest seats of every seat.
+		"""
+
+		n_seats = len(self.policy)
+		k = min(DistanceCache.n_neighbours, n_seats - 1)
+		self.neighbours = np.zeros((n_seats, max(k, 0)), dtype=int)
+
+		if k > 0:
+			for start, distances in Policy.iterate_distances(self.policy, self.policy):
+				rows = np.arange(len(distances))
+				distances[rows, start + rows] = np.inf
+
+				# Select the k closest seats, and sort them by their exact distance first and by seat second
+				closest = np.sort(np.argpartition(distances, k - 1, axis=1)[:, :k], axis=1)
+				block = self.policy[start:start + len(distances)]
+				exact = np.sqrt(np.sum((block[:, None, :] - self.policy[closest]) ** 2, axis=2))
+				order = np.argsort(exact, axis=1, kind="stable")
+				self.neighbours[start:start + len(distances)] = np.take_along_axis(closest, order, axis=1)
+
+		self.valid = True
+
+	def invalidate(self) -> None:
+		"""
+		Marks the closest seats as outdated, for example because a seat was taken by a new representative; they are
+		rebuilt once they are needed again.
+		"""
+
+		self.valid = False
+
+	def find_closest(self, seats: np.ndarray) -> np.ndarray:
+		"""
+		Finds the closest other seat among the given seats for each of them, walking down the lists of closest seats.
+
+		Seats whose closest seats are all missing from the given seats are looked up among the given seats directly.
+
+		Parameters
+		----------
+		seats : np.ndarray
+			The seats, for example those of all representatives without a coalition.
+
+		Returns
+		-------
+		closest : np.ndarray
+			The closest other seat of every seat, or -1 if there is none.
+		"""
+
+		if not self.valid:
+			self.build()
+
+		closest = np.full(len(seats), -1, dtype=int)
+		if len(seats) < 2:
+			return closest
+
+		# Walk down the closest seats until one of the given seats comes up
+		included = np.zeros(len(self.policy), dtype=bool)
+		included[seats] = True
+		candidates = included[self.neighbours[seats]]
+		found = np.any(candidates, axis=1)
+		first = np.argmax(candidates, axis=1)
+		closest[found] = self.neighbours[seats[found], first[found]]
+
+		# Fall back to a direct search for the others
+		missing = np.flatnonzero(~found)
+		if len(missing) > 0:
+			distances = Policy.compute_distances(self.policy[seats[missing]], self.policy[seats])
+			distances[np.arange(len(missing)), missing] = np.inf
+			closest[missing] = seats[Policy.pick_closest(self.policy[seats[missing]], self.policy[seats], distances)]
+
+		return closest
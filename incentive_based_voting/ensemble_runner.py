@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import time
+import numpy as np
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+from batched_simulation import BatchedSimulation
+from ensemble_statistics import EnsembleStatistics
+
+from typing import Dict, Optional, Set
+
+
+def run_batch(n_replicates: int, start_year: int, end_year: int, n_bills: int, seed: np.random.SeedSequence)\
+		-> EnsembleStatistics:
+	"""
+	Runs a batch of replicates in lockstep and summarises them, such that only the statistics have to be sent back.
+
+	Parameters
+	----------
+	n_replicates : int
+		The number of replicates.
+	start_year : int
+		The start year.
+	end_year : int
+		The end year.
+	n_bills : int
+		The number of bills that are brought before congress each month, in every replicate.
+	seed : np.random.SeedSequence
+		The seed of the batch.
+
+	Returns
+	-------
+	statistics : EnsembleStatistics
+		The statistics of the batch.
+	"""
+
+	simulation = BatchedSimulation(n_replicates, start_year, end_year, n_bills, seed)
+	simulation.run()
+
+	statistics = EnsembleStatistics(simulation.get_metric_ranges(), int(seed.generate_state(1)[0]))
+	statistics.add(simulation.get_metrics())
+	return statistics
+
+
+class EnsembleRunner:
+	"""
+	Runs an ensemble of replicates in batches, on worker processes, and merges the statistics of every batch as soon as
+	it arrives; the replicates themselves are never kept, so memory does not grow with the size of the ensemble.
+	"""
+
+	# The number of replicates that one worker advances in lockstep
+	batch_size: int = 250
+
+	# The number of worker processes; batches run in this process if it is 1
+	n_workers: int = 1
+
+	# The number of replicates before the precision of the target metrics is first checked, so that a few lucky
+	# replicates with little spread cannot stop the ensemble, and the confidence level of the precision
+	min_replicates: int = 100
+	confidence: float = 0.95
+
+	def __init__(self, start_year: int, end_year: int, n_bills: int, seed: int = 0):
+		"""
+		Initialises the runner.
+
+		Parameters
+		----------
+		start_year : int
+			The start year.
+		end_year : int
+			The end year.
+		n_bills : int
+			The number of bills that are brought before congress each month, in every replicate.
+		seed : int
+			The seed of the ensemble; every batch gets an independent seed spawned from it.
+		"""
+
+		self.start_year: int = start_year
+		self.end_year: int = end_year
+		self.n_bills: int = n_bills
+		self.seed_sequence: np.random.SeedSequence = np.random.SeedSequence(seed)
+		self.statistics: EnsembleStatistics = EnsembleStatistics({})
+		self.seconds: float = 0.0
+
+		# The number of replicates asked for, which is more than were run if the ensemble stopped early
+		self.n_requested: int = 0
+
+	def submit(self, executor: ProcessPoolExecutor, n_replicates: int) -> Future:
+		"""
+		Dispatches a batch of replicates to a worker.
+
+		Parameters
+		----------
+		executor : ProcessPoolExecutor
+			The worker processes.
+		n_replicates : int
+			The number of replicates.
+
+		Returns
+		-------
+		future : Future
+			The statistics of the batch, once it is done.
+		"""
+
+		return executor.submit(run_batch, n_replicates, self.start_year, self.end_year, self.n_bills,
+							   self.seed_sequence.spawn(1)[0])
+
+	def run(self, n_replicates: int, targets: Optional[Dict[str, float]] = None) -> EnsembleStatistics:
+		"""
+		Runs replicates and merges their statistics into those of the ensemble so far, stopping early once the means of
+		the target metrics are known precisely enough.
+
+		Parameters
+		----------
+		n_replicates : int
+			The largest number of replicates to run.
+		targets : Optional[Dict[str, float]]
+			The largest acceptable half-width of the confidence interval of the mean of every target metric, in every
+			cell, by name; all replicates are run if there are none.
+
+		Returns
+		-------
+		statistics : EnsembleStatistics
+			The statistics of all replicates of the ensemble so far.
+		"""
+
+		start = time.perf_counter()
+		self.n_requested += n_replicates
+		batches = [min(EnsembleRunner.batch_size, n_replicates - i)
+				   for i in range(0, n_replicates, EnsembleRunner.batch_size)]
+
+		def is_precise() -> bool:
+			return targets is not None and self.statistics.n_replicates >= EnsembleRunner.min_replicates\
+				   and self.statistics.is_precise(targets, EnsembleRunner.confidence)
+
+		if EnsembleRunner.n_workers == 1:
+			for batch in batches:
+				if is_precise():
+					break
+				self.statistics.merge(run_batch(batch, self.start_year, self.end_year, self.n_bills,
+												self.seed_sequence.spawn(1)[0]))
+		else:
+
+			# Keep every worker busy, but no more batches in flight than workers; batches in flight when the targets
+			# are reached are still merged
+			with ProcessPoolExecutor(EnsembleRunner.n_workers) as executor:
+				pending: Set[Future] = set()
+				while len(pending) > 0 or (len(batches) > 0 and not is_precise()):
+					while len(batches) > 0 and len(pending) < EnsembleRunner.n_workers and not is_precise():
+						pending.add(self.submit(executor, batches.pop(0)))
+					done, pending = wait(pending, return_when=FIRST_COMPLETED)
+					for future in done:
+						self.statistics.merge(future.result())
+
+		self.seconds += time.perf_counter() - start
+		return self.statistics
+
+
+if __name__ == "__main__":
+
+	# Settings
+	n_replicates = 1000  # the largest number of replicates
+	targets = {"final_n_coalitions": 0.5}  # the largest acceptable half-width of the confidence interval, by metric
+	start_year = 2010
+	end_year = 2010
+	n_bills = 10  # the number of bills that are brought before congress each month, in every replicate
+	EnsembleRunner.batch_size = 100  # the number of replicates that one worker advances in lockstep
+	EnsembleRunner.n_workers = 1  # the number of worker processes
+
+	# Run, stop early once the targets are reached, and report
+	runner = EnsembleRunner(start_year, end_year, n_bills)
+	statistics = runner.run(n_replicates, targets)
+	n_saved = runner.n_requested - statistics.n_replicates
+	print("{} of {} replicates in {:.2f} s, saving {} replicates (about {:.2f} s)".format(
+		statistics.n_replicates, runner.n_requested, runner.seconds, n_saved,
+		n_saved * runner.seconds / max(statistics.n_replicates, 1)))
+	for name, half_width in statistics.get_half_widths(EnsembleRunner.confidence).items():
+		print("{:<20}half-width of the {:.0%} confidence interval: {:.4f}".format(name, EnsembleRunner.confidence,
+																				   half_width))
+	summaries = statistics.summarise()
+	for name in targets.keys():
+		print("{:<20}mean {}  std {}  5%/50%/95% {}".format(
+			name, np.round(summaries[name]["mean"], 3).tolist(), np.round(summaries[name]["std"], 3).tolist(),
+			np.round(summaries[name]["quantiles"], 3).tolist()))
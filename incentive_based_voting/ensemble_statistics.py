@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import numpy as np
+
+from statistics import NormalDist
+
+from running_statistics import RunningStatistics
+from quantile_sketch import QuantileSketch
+from histogram import Histogram
+
+from typing import Dict, Sequence, Tuple
+
+
+class EnsembleStatistics:
+	"""
+	Running statistics of every metric of an ensemble of replicates -- the mean and variance, a quantile sketch and a
+	histogram, for every cell of the metric (for example every month) -- whose memory does not grow with the number of
+	replicates. The statistics of batches of replicates that ran on different workers merge in any order.
+	"""
+
+	# The number of histogram bins of every metric
+	n_bins: int = 20
+
+	def __init__(self, ranges: Dict[str, Tuple[float, float]], seed: int = 0):
+		"""
+		Initialises empty statistics.
+
+		Parameters
+		----------
+		ranges : Dict[str, Tuple[float, float]]
+			The range of the histogram of every metric, by name.
+		seed : int
+			The seed of the quantile sketches.
+		"""
+
+		self.ranges: Dict[str, Tuple[float, float]] = ranges
+		self.seed: int = seed
+		self.n_replicates: int = 0
+
+		# The statistics, by metric; they are created along with the first replicates
+		self.moments: Dict[str, RunningStatistics] = {}
+		self.sketches: Dict[str, QuantileSketch] = {}
+		self.histograms: Dict[str, Histogram] = {}
+
+	def add(self, metrics: Dict[str, np.ndarray]) -> None:
+		"""
+		Adds the metrics of a batch of replicates.
+
+		Parameters
+		----------
+		metrics : Dict[str, np.ndarray]
+			The metrics, by name, each by replicate first.
+		"""
+
+		for name, values in metrics.items():
+			if name not in self.moments:
+				lower, upper = self.ranges[name]
+				self.moments[name] = RunningStatistics(values.shape[1:])
+				self.sketches[name] = QuantileSketch(values.shape[1:], self.seed)
+				self.histograms[name] = Histogram(values.shape[1:], lower, upper, EnsembleStatistics.n_bins)
+			self.moments[name].add(values)
+			self.sketches[name].add(values)
+			self.histograms[name].add(values)
+
+		self.n_replicates += len(next(iter(metrics.values())))
+
+	def merge(self, other: EnsembleStatistics) -> None:
+		"""
+		Merges the statistics of other replicates into these.
+
+		Parameters
+		----------
+		other : EnsembleStatistics
+			The statistics of the other replicates.
+		"""
+
+		for name in other.moments.keys():
+			if name not in self.moments:
+				self.moments[name] = RunningStatistics(other.moments[name].mean.shape)
+				self.sketches[name] = QuantileSketch(other.sketches[name].shape, self.seed)
+				self.histograms[name] = Histogram(other.histograms[name].shape, other.histograms[name].lower,
+												  other.histograms[name].upper, other.histograms[name].n_bins)
+			self.moments[name].merge(other.moments[name])
+			self.sketches[name].merge(other.sketches[name])
+			self.histograms[name].merge(other.histograms[name])
+
+		self.n_replicates += other.n_replicates
+
+	def get_half_widths(self, confidence: float) -> Dict[str, float]:
+		"""
+		Computes the half-width of the normal confidence interval of the mean of every metric, in its least precise
+		cell.
+
+		Parameters
+		----------
+		confidence : float
+			The confidence level, for example 0.95.
+
+		Returns
+		-------
+		half_widths : Dict[str, float]
+			The largest half-width of every metric, by name; NaN with fewer than two replicates.
+		"""
+
+		z = NormalDist().inv_cdf(0.5 + confidence / 2.0)
+		return {name: float(np.max(z * moments.std / np.sqrt(max(moments.count, 1)), initial=0.0))
+				for name, moments in self.moments.items()}
+
+	def is_precise(self, targets: Dict[str, float], confidence: float) -> bool:
+		"""
+		Checks whether the means of the given metrics are known precisely enough.
+
+		Parameters
+		----------
+		targets : Dict[str, float]
+			The largest acceptable half-width of the confidence interval of every target metric, by name.
+		confidence : float
+			The confidence level.
+
+		Returns
+		-------
+		is_precise : bool
+			Whether the confidence intervals of all target metrics are narrow enough in every cell.
+		"""
+
+		half_widths = self.get_half_widths(confidence)
+		return all(name in half_widths and half_widths[name] <= target for name, target in targets.items())
+
+	def summarise(self, quantiles: Sequence[float] = (0.05, 0.5, 0.95)) -> Dict[str, Dict[str, np.ndarray]]:
+		"""
+		Summarises every metric.
+
+		Parameters
+		----------
+		quantiles : Sequence[float]
+			The quantiles to estimate.
+
+		Returns
+		-------
+		summary : Dict[str, Dict[str, np.ndarray]]
+			The mean, the standard deviation, the estimated quantiles (by quantile first) and the histogram counts (by
+			bin first, with the bins out of range on either side) of every metric.
+		"""
+
+		return {name: {"mean": self.moments[name].mean, "std": self.moments[name].std,
+					   "quantiles": self.sketches[name].get_quantiles(quantiles),
+					   "histogram": self.histograms[name].counts} for name in self.moments.keys()}
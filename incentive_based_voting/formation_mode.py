@@ -0,0 +1,10 @@
+from enum import Enum
+
+
+class FormationMode(Enum):
+	"""
+	The ways in which representatives may join and leave coalitions within a month.
+	"""
+
+	SEQUENTIAL = 1
+	SYNCHRONOUS = 2
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import numpy as np
+
+from typing import Tuple
+
+
+class Histogram:
+	"""
+	A histogram of an array-valued metric over replicates, with the same equally wide bins for every cell and one
+	extra bin on either side for values out of range; histograms of different replicates merge by adding their counts.
+	"""
+
+	def __init__(self, shape: Tuple[int, ...], lower: float, upper: float, n_bins: int):
+		"""
+		Initialises an empty histogram.
+
+		Parameters
+		----------
+		shape : Tuple[int, ...]
+			The shape of the metric of a single replicate.
+		lower : float
+			The lower end of the first bin.
+		upper : float
+			The upper end of the last bin; values equal to it are counted in the last bin.
+		n_bins : int
+			The number of bins.
+		"""
+
+		self.shape: Tuple[int, ...] = shape
+		self.lower: float = lower
+		self.upper: float = upper
+		self.n_bins: int = n_bins
+
+		# The counts, by bin first: below the range, the bins, then above the range
+		self.counts: np.ndarray = np.zeros((n_bins + 2,) + shape, dtype=int)
+
+	@property
+	def edges(self) -> np.ndarray:
+		"""
+		The edges of the bins.
+		"""
+
+		return np.linspace(self.lower, self.upper, self.n_bins + 1)
+
+	def add(self, values: np.ndarray) -> None:
+		"""
+		Adds the metric of a batch of replicates.
+
+		Parameters
+		----------
+		values : np.ndarray
+			The metric, by replicate first.
+		"""
+
+		values = np.asarray(values, dtype=float)
+		bins = np.floor((values - self.lower) / (self.upper - self.lower) * self.n_bins).astype(int) + 1
+		bins[values == self.upper] = self.n_bins
+		bins = np.clip(bins, 0, self.n_bins + 1)
+
+		# Count the bins of all cells at once
+		n_cells = int(np.prod(self.shape, dtype=int))
+		cells = np.broadcast_to(np.arange(n_cells).reshape(self.shape), values.shape)
+		counts = np.bincount((bins * n_cells + cells).ravel(), minlength=(self.n_bins + 2) * n_cells)
+		self.counts += counts.reshape(self.counts.shape)
+
+	def merge(self, other: Histogram) -> None:
+		"""
+		Merges the histogram of other replicates into this one.
+
+		Parameters
+		----------
+		other : Histogram
+			The histogram of the other replicates.
+		"""
+
+		self.counts += other.counts
@@ -4,6 +4,9 @@ import numpy as np
 
 from parties import Parties
 from financial_incentive import FinancialIncentive
+from validation import Validation
+
+from typing import Dict, List, Tuple
 
 
 class Incentive:
@@ -11,6 +14,15 @@ class Incentive:
 	The incentive structure of a representative.
 	"""
 
+	__slots__ = ("financial", "ideological", "party_pressure")
+
+	# The probabilities of taking small and big dollar donations, and the (lowest value, width) of the ranges the
+	# ideological incentive and the party pressure are drawn from, by party
+	party_ranges: Dict[Parties, Tuple[Tuple[float, float], Tuple[float, float], Tuple[float, float]]] = {
+		Parties.DEMOCRATIC: ((0.7, 0.3), (0.4, 0.4), (0.0, 1.0)),
+		Parties.REPUBLICAN: ((0.3, 0.7), (0.4, 0.4), (0.0, 1.0)),
+		Parties.OTHER: ((0.9, 0.1), (0.0, 0.2), (0.0, 0.1))}
+
 	def __init__(self, financial_incentive: FinancialIncentive, ideological: float, party_pressure: float):
 		"""
 		Initialises the incentive structure.
@@ -25,6 +37,9 @@ class Incentive:
 			How much pressure from other members the representative faces.
 		"""
 
+		if Validation.enabled:
+			assert isinstance(financial_incentive, FinancialIncentive)
+
 		self.financial: FinancialIncentive = financial_incentive
 		self.ideological: float = ideological
 		self.party_pressure: float = party_pressure
@@ -37,6 +52,37 @@ class Incentive:
 		return "Incentive (Fin: " + str(self.financial) + ", IDEO: " + str(self.ideological) + ", PP: "\
 			   + str(self.party_pressure) + ")"
 
+	@staticmethod
+	def from_arrays(big_dollar: np.ndarray, ideological: np.ndarray, party_pressure: np.ndarray) -> List[Incentive]:
+		"""
+		Creates many incentive structures at once.
+
+		Parameters
+		----------
+		big_dollar : np.ndarray
+			Whether the representatives take big dollar donations (instead of small dollar donations).
+		ideological : np.ndarray
+			The ideological incentives.
+		party_pressure : np.ndarray
+			How much pressure from other members the representatives face.
+
+		Returns
+		-------
+		incentives : List[Incentive]
+			The incentive structures.
+		"""
+
+		incentives = []
+		for big_dollar_, ideological_, party_pressure_ in zip(big_dollar.tolist(), ideological.tolist(),
+															  party_pressure.tolist()):
+			incentive = Incentive.__new__(Incentive)
+			incentive.financial = FinancialIncentive.BIG_DOLLAR if big_dollar_ else FinancialIncentive.SMALL_DOLLAR
+			incentive.ideological = ideological_
+			incentive.party_pressure = party_pressure_
+			incentives.append(incentive)
+
+		return incentives
+
 	@staticmethod
 	def pick_incentive_at_random(party: Parties) -> __class__:
 		"""
@@ -52,20 +98,47 @@ class Incentive:
 			The chosen incentive.
 		"""
 
-		if party == Parties.DEMOCRATIC:
-			financial_incentive = np.random.choice([FinancialIncentive.SMALL_DOLLAR, FinancialIncentive.BIG_DOLLAR],
-												   p=[0.7, 0.3])
-			ideological_incentive = 0.4 + 0.4 * np.random.random()
-			party_pressure = np.random.random()
-		elif party == Parties.REPUBLICAN:
-			financial_incentive = np.random.choice([FinancialIncentive.SMALL_DOLLAR, FinancialIncentive.BIG_DOLLAR],
-												   p=[0.3, 0.7])
-			ideological_incentive = 0.4 + 0.4 * np.random.random()
-			party_pressure = np.random.random()
-		else:
-			financial_incentive = np.random.choice([FinancialIncentive.SMALL_DOLLAR, FinancialIncentive.BIG_DOLLAR],
-												   p=[0.9, 0.1])
-			ideological_incentive = 0.2 * np.random.random()
-			party_pressure = 0.1 * np.random.random()
+		financial, (ideological_low, ideological_width), (pressure_low, pressure_width) = Incentive.party_ranges[party]
+		financial_incentive = np.random.choice([FinancialIncentive.SMALL_DOLLAR, FinancialIncentive.BIG_DOLLAR],
+											   p=list(financial))
+		ideological_incentive = ideological_low + ideological_width * np.random.random()
+		party_pressure = pressure_low + pressure_width * np.random.random()
 
 		return Incentive(financial_incentive, ideological_incentive, party_pressure)
+
+	@staticmethod
+	def pick_incentives_at_random(parties: List[Parties], n_replicates: int, rng: np.random.Generator)\
+			-> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+		"""
+		Selects the incentives of many representatives in many replicates at random at once, based on their parties.
+
+		Parameters
+		----------
+		parties : List[Parties]
+			The parties of the representatives.
+		n_replicates : int
+			The number of replicates.
+		rng : np.random.Generator
+			The random number generator.
+
+		Returns
+		-------
+		big_dollar : np.ndarray
+			Whether the representatives take big dollar donations, by replicate and representative.
+		ideological : np.ndarray
+			The ideological incentives, by replicate and representative.
+		party_pressure : np.ndarray
+			How much pressure from other members the representatives face, by replicate and representative.
+		"""
+
+		ranges = [Incentive.party_ranges[party] for party in parties]
+		p_big_dollar = np.array([financial[1] for financial, _, _ in ranges])
+		ideological_low, ideological_width = np.array([ideological for _, ideological, _ in ranges]).reshape(-1, 2).T
+		pressure_low, pressure_width = np.array([pressure for _, _, pressure in ranges]).reshape(-1, 2).T
+
+		draws = rng.random((3, n_replicates, len(parties)))
+		big_dollar = draws[0] < p_big_dollar
+		ideological = ideological_low + ideological_width * draws[1]
+		party_pressure = pressure_low + pressure_width * draws[2]
+
+		return big_dollar, ideological, party_pressure
@@ -1,19 +1,35 @@
 from tqdm import tqdm
 
 from congress import Congress
+from voting_body import VotingBody
 from timeline import Timeline
 from event import Event
-from coalition import Coalition
 from president import President
 from party import Party
 from parties import Parties
-from voting_bodies import VotingBodies
+from validation import Validation
+from policy import Policy
+from coalition import Coalition
+from formation_mode import FormationMode
+from snapshot import Snapshot
+from simulation_service import SimulationService
+from congress_voter import CongressVoter
 
 
 # Settings
 start_year = 2010
 end_year = 2010
 n_bills = 10  # the number of bills that are brought before congress each month
+Validation.enabled = True  # whether policies, policy ranges etc. check their arguments (debug mode), or not (fast mode)
+Policy.n_dimensions = 2  # the number of issue dimensions; the first two are the libertarian and the progressive axis
+Coalition.formation_mode = FormationMode.SEQUENTIAL  # whether to join and leave coalitions one by one, or at once
+VotingBody.turnover = 0.0  # the share of seats that change hands at each House and Senate election
+Congress.n_workers = 1  # the number of threads both chambers and chunks of bills are processed on
+CongressVoter.weights = {"ideology": 0.5, "popularity_finance": 0.3, "party_pressure": 0.2}  # the metric weights
+CongressVoter.threshold = 2.0  # the metric needed to vote for a bill; each metric is at most 1, so 2.0 passes nothing
+serve = False  # whether to answer what-if queries about bills on localhost once the simulation is done
+port = 8000  # the port to answer what-if queries on
+SimulationService.max_body_size = 2 ** 26  # the largest what-if query in bytes; larger ones are refused unread
 
 # Create a timeline
 timeline = Timeline(start_year, end_year)
@@ -29,6 +45,9 @@ otherparty = Party(Parties.OTHER)
 # Initialise the President
 president = President(Parties.DEMOCRATIC)
 
+# Snapshots of the Congress to answer what-if queries about, by time step
+snapshots = {}
+
 # Run
 for t, time in enumerate(tqdm(timeline.events)):
 	for event in timeline.events[time]:
@@ -46,6 +65,8 @@ for t, time in enumerate(tqdm(timeline.events)):
 			democrats.update_policy_preference(congress.house.representatives, congress.senate.representatives, t)
 			republicans.update_policy_preference(congress.house.representatives, congress.senate.representatives, t)
 			otherparty.update_policy_preference(congress.house.representatives, congress.senate.representatives, t)
+			if serve:
+				snapshots[t] = Snapshot(congress, democrats, republicans, otherparty, t)
 
 			# Create a few new bills and try to pass them
 			congress.generate_some_bills(n_bills, t)
@@ -61,20 +82,15 @@ for t, time in enumerate(tqdm(timeline.events)):
 
 		# New coalition formation occurs every month
 		elif event == Event.OPINION_FORMATION:
-			Coalition.coalition_formation(congress.house.representatives, congress.house.coalitions,
-										  congress.house.broken_coalitions, VotingBodies.HOUSE, t, timeline.t_max)
-			Coalition.coalition_formation(congress.senate.representatives, congress.senate.coalitions,
-										  congress.senate.broken_coalitions, VotingBodies.SENATE, t, timeline.t_max)
+			congress.coalition_formation(t)
 
 		# Elections in the House happen every 2 years
 		elif event == Event.HOUSE_ELECTION:
-			# TODO: nice for scenario generation, but ignore for now
-			pass
+			congress.hold_election(congress.house, t)
 
 		# Elections in the Senate happen every 6 years
 		elif event == Event.SENATE_ELECTION:
-			# TODO: nice for scenario generation, but ignore for now
-			pass
+			congress.hold_election(congress.senate, t)
 
 		# Presidential elections happen every 4 years
 		elif event == Event.PRESIDENTIAL_ELECTION:
@@ -82,4 +98,18 @@ for t, time in enumerate(tqdm(timeline.events)):
 			pass
 
 
+# The threads are not needed anymore
+congress.close()
+
+# Report how often there was nothing to do
+for voting_body in [congress.house, congress.senate]:
+	print(voting_body.voting_body.name.capitalize() + ": coalition formation skipped in",
+		  voting_body.n_skipped_formations, "of", voting_body.n_formations, "months")
+
 print("Done!")
+
+# Answer what-if queries
+if serve:
+	service = SimulationService(snapshots, port=port)
+	print("Answering what-if queries on http://%s:%d" % service.address)
+	service.serve_forever()
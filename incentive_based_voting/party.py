@@ -45,16 +45,12 @@ class Party:
 
 		# For the House
 		party_house_reps = [r for r in house_representatives if r.party == self.party]
-		libertarian = sum([r.party_importance_t[t] * r.policy_preference.libertarian for r in party_house_reps])\
-					  / sum([r.party_importance_t[t] for r in party_house_reps])
-		progressive = sum([r.party_importance_t[t] * r.policy_preference.progressive for r in party_house_reps]) \
-					  / sum([r.party_importance_t[t] for r in party_house_reps])
-		self.policy_preference_house_t.append(Policy(libertarian, progressive))
+		values = sum([r.party_importance_t[t] * r.policy_preference.values for r in party_house_reps])\
+				 / sum([r.party_importance_t[t] for r in party_house_reps])
+		self.policy_preference_house_t.append(Policy(values))
 
 		# For the Senate
 		party_senate_reps = [r for r in senate_representatives if r.party == self.party]
-		libertarian = sum([r.party_importance_t[t] * r.policy_preference.libertarian for r in party_senate_reps])\
-					  / sum([r.party_importance_t[t] for r in party_senate_reps])
-		progressive = sum([r.party_importance_t[t] * r.policy_preference.progressive for r in party_senate_reps]) \
-					  / sum([r.party_importance_t[t] for r in party_senate_reps])
-		self.policy_preference_senate_t.append(Policy(libertarian, progressive))
+		values = sum([r.party_importance_t[t] * r.policy_preference.values for r in party_senate_reps])\
+				 / sum([r.party_importance_t[t] for r in party_senate_reps])
+		self.policy_preference_senate_t.append(Policy(values))
@@ -3,33 +3,110 @@ from __future__ import annotations
 import numpy as np
 
 from parties import Parties
+from validation import Validation
+
+from typing import Dict, Iterator, List, Tuple, Union
 
 
 class Policy:
 	"""
-	A policy preference.
+	A policy preference, as a point in the d-dimensional policy space [0,1]^d.
+
+	The first two axes are the libertarian and the progressive axis; all further axes are generic issue dimensions.
 	"""
 
-	def __init__(self, libertarian: float, progressive: float):
+	__slots__ = ("values",)
+
+	# The number of issue dimensions of the policy space
+	n_dimensions: int = 2
+
+	# The maximum number of entries of a block of the distance matrix that is computed at once
+	max_block_size: int = 2 ** 22
+
+	# The (lowest value, width) of the ranges the libertarian and progressive preferences are drawn from, by party
+	party_ranges: Dict[Parties, Tuple[Tuple[float, float], Tuple[float, float]]] = {
+		Parties.DEMOCRATIC: ((0.2, 0.6), (0.7, 0.2)),
+		Parties.REPUBLICAN: ((0.4, 0.3), (0.2, 0.2)),
+		Parties.OTHER: ((0.0, 1.0), (0.0, 1.0))}
+
+	def __init__(self, values: Union[np.ndarray, List[float]]):
 		"""
 		Initialises a new policy preference.
 
 		Parameters
 		----------
-		libertarian : float
-			Determines how libertarian the policy preference is.
-		progressive : float
-			Determines how progressive the policy preference is.
+		values : Union[np.ndarray, List[float]]
+			The position along every axis of the policy space, starting with how libertarian and how progressive the
+			policy preference is.
+		"""
+
+		values = np.asarray(values, dtype=float)
+
+		if Validation.enabled:
+			assert values.shape == (Policy.n_dimensions,)
+			assert np.all((0.0 <= values) & (values <= 1.0))
+
+		self.values: np.ndarray = values
+
+	@property
+	def libertarian(self) -> float:
+		"""
+		Determines how libertarian the policy preference is.
+		"""
+
+		return float(self.values[0])
+
+	@property
+	def progressive(self) -> float:
+		"""
+		Determines how progressive the policy preference is.
+		"""
+
+		return float(self.values[1])
+
+	@property
+	def authoritarian(self) -> float:
+		"""
+		Determines how authoritarian the policy preference is.
+		"""
+
+		return 1.0 - self.libertarian
+
+	@property
+	def conservative(self) -> float:
+		"""
+		Determines how conservative the policy preference is.
+		"""
+
+		return 1.0 - self.progressive
+
+	@staticmethod
+	def from_arrays(values: np.ndarray) -> List[Policy]:
+		"""
+		Creates many policy preferences at once.
+
+		Parameters
+		----------
+		values : np.ndarray
+			The policy preferences, with one row per policy preference and one column per axis.
+
+		Returns
+		-------
+		policies : List[Policy]
+			The policy preferences.
 		"""
 
-		assert 0.0 <= libertarian <= 1.0
-		assert 0.0 <= progressive <= 1.0
+		if Validation.enabled:
+			assert values.ndim == 2 and values.shape[1] == Policy.n_dimensions
+			assert np.all((0.0 <= values) & (values <= 1.0))
 
-		self.libertarian = libertarian
-		self.authoritarian = 1.0 - libertarian
+		policies = []
+		for values_ in values:
+			policy = Policy.__new__(Policy)
+			policy.values = values_.copy()
+			policies.append(policy)
 
-		self.progressive = progressive
-		self.conservative = 1.0 - progressive
+		return policies
 
 	@staticmethod
 	def pick_policy_preference_at_random(party: Parties) -> Policy:
@@ -46,17 +123,44 @@ class Policy:
 			The chosen policy.
 		"""
 
-		if party == Parties.DEMOCRATIC:
-			libertarian = 0.2 + 0.6 * np.random.random()
-			progressive = 0.7 + 0.2 * np.random.random()
-		elif party == Parties.REPUBLICAN:
-			libertarian = 0.4 + 0.3 * np.random.random()
-			progressive = 0.2 + 0.2 * np.random.random()
-		else:
-			libertarian = np.random.random()
-			progressive = np.random.random()
+		(libertarian_low, libertarian_width), (progressive_low, progressive_width) = Policy.party_ranges[party]
+		libertarian = libertarian_low + libertarian_width * np.random.random()
+		progressive = progressive_low + progressive_width * np.random.random()
 
-		return Policy(libertarian, progressive)
+		# The parties do not take a particular stance on all further issues
+		others = np.random.random(Policy.n_dimensions - 2)
+
+		return Policy(np.concatenate([[libertarian, progressive], others]))
+
+	@staticmethod
+	def pick_policy_preferences_at_random(parties: List[Parties], n_replicates: int, rng: np.random.Generator)\
+			-> np.ndarray:
+		"""
+		Selects the policy preferences of many representatives in many replicates at random at once, based on their
+		parties.
+
+		Parameters
+		----------
+		parties : List[Parties]
+			The parties of the representatives.
+		n_replicates : int
+			The number of replicates.
+		rng : np.random.Generator
+			The random number generator.
+
+		Returns
+		-------
+		policies : np.ndarray
+			The policy preferences, by replicate, representative and axis.
+		"""
+
+		low = np.array([[low for low, _ in Policy.party_ranges[party]] for party in parties]).reshape(-1, 2)
+		width = np.array([[width for _, width in Policy.party_ranges[party]] for party in parties]).reshape(-1, 2)
+
+		policies = rng.random((n_replicates, len(parties), Policy.n_dimensions))
+		policies[:, :, :2] = low + width * policies[:, :, :2]
+
+		return policies
 
 	@staticmethod
 	def compute_distance(p1: __class__, p2: __class__) -> float:
@@ -75,4 +179,178 @@ class Policy:
 			The (Euclidean) distance between two policies.
 		"""
 
-		return np.sqrt((p1.libertarian - p2.libertarian) ** 2 + (p1.progressive - p2.progressive) ** 2)
+		return float(np.sqrt(np.sum((p1.values - p2.values) ** 2)))
+
+	@staticmethod
+	def iterate_distances(first: np.ndarray, second: np.ndarray) -> Iterator[Tuple[int, np.ndarray]]:
+		"""
+		Computes the (Euclidean) distances between two sets of policies block by block, such that the full distance
+		matrix never has to be held in memory.
+
+		Every block is computed by a single matrix product, using ||a - b||^2 = ||a||^2 + ||b||^2 - 2 a.b.
+
+		Parameters
+		----------
+		first : np.ndarray
+			The first set of policies, with one row per policy.
+		second : np.ndarray
+			The second set of policies, with one row per policy.
+
+		Yields
+		------
+		start : int
+			The row of the first set of policies the block starts at.
+		distances : np.ndarray
+			The distances between a block of rows of the first set and all of the second set.
+		"""
+
+		block_rows = max(1, Policy.max_block_size // max(1, len(second)))
+
+		# The second set may be changed in between blocks
+		for start in range(0, len(first), block_rows):
+			block = first[start:start + block_rows]
+			squared = np.einsum("ij,ij->i", block, block)[:, None] + np.einsum("ij,ij->i", second, second)[None, :]\
+					  - 2.0 * block @ second.T
+
+			# Rounding may leave tiny negative squared distances
+			np.maximum(squared, 0.0, out=squared)
+			yield start, np.sqrt(squared, out=squared)
+
+	@staticmethod
+	def pick_closest(first: np.ndarray, second: np.ndarray, distances: np.ndarray) -> np.ndarray:
+		"""
+		Picks the closest policy of the second set for every policy of the first set from their distances as yielded by
+		iterate_distances, such that the pick is the same as if all distances had been computed one by one.
+
+		The matrix product rounds the squared distances by at most a few machine epsilons times the squared norms of
+		the policies; all policies within twice that margin of the closest one are therefore ranked again by their
+		exact distances. Ties go to the policy of the second set that comes first.
+
+		Parameters
+		----------
+		first : np.ndarray
+			The first set of policies, with one row per policy.
+		second : np.ndarray
+			The second set of policies, with one row per policy.
+		distances : np.ndarray
+			The distances between both sets, possibly with excluded pairs set to infinity.
+
+		Returns
+		-------
+		closest : np.ndarray
+			The row of the closest policy of the second set for every policy of the first set.
+		"""
+
+		closest = np.argmin(distances, axis=1)
+		smallest = distances[np.arange(len(first)), closest]
+
+		# The candidates within the rounding margin of the closest policy
+		margin = 4.0 * (Policy.n_dimensions + 2) * np.finfo(float).eps\
+				 * (np.einsum("ij,ij->i", first, first) + np.max(np.einsum("ij,ij->i", second, second), initial=0.0))
+		bound = np.where(np.isfinite(smallest), np.sqrt(smallest ** 2 + 2.0 * margin), -np.inf)
+		candidates = distances <= bound[:, None]
+		ambiguous = np.flatnonzero(np.count_nonzero(candidates, axis=1) > 1)
+		if len(ambiguous) == 0:
+			return closest
+
+		# Rank them by their exact distances, and by their row in case of a tie
+		rows, columns = np.nonzero(candidates[ambiguous])
+		rows = ambiguous[rows]
+		exact = np.sqrt(np.sum((first[rows] - second[columns]) ** 2, axis=1))
+		order = np.lexsort((columns, exact, rows))
+		rows, columns = rows[order], columns[order]
+		firsts = np.flatnonzero(np.concatenate([[True], rows[1:] != rows[:-1]]))
+		closest[rows[firsts]] = columns[firsts]
+
+		return closest
+
+	@staticmethod
+	def compute_distances(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+		"""
+		Computes the (Euclidean) distances between all pairs of two sets of policies.
+
+		Parameters
+		----------
+		first : np.ndarray
+			The first set of policies, with one row per policy.
+		second : np.ndarray
+			The second set of policies, with one row per policy.
+
+		Returns
+		-------
+		distances : np.ndarray
+			The distance matrix, with one row per policy of the first set and one column per policy of the second set.
+		"""
+
+		distances = np.zeros((len(first), len(second)))
+		for start, block in Policy.iterate_distances(first, second):
+			distances[start:start + len(block)] = block
+
+		return distances
+
+	@staticmethod
+	def compute_batched_distances(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+		"""
+		Computes the (Euclidean) distances between all pairs of two sets of policies, in many independent batches at
+		once; the caller keeps the batches small enough.
+
+		Parameters
+		----------
+		first : np.ndarray
+			The first sets of policies, by batch, policy and axis.
+		second : np.ndarray
+			The second sets of policies, by batch, policy and axis.
+
+		Returns
+		-------
+		distances : np.ndarray
+			The distance matrices, by batch, policy of the first set and policy of the second set.
+		"""
+
+		squared = np.einsum("bij,bij->bi", first, first)[:, :, None]\
+				  + np.einsum("bij,bij->bi", second, second)[:, None, :] - 2.0 * first @ second.transpose(0, 2, 1)
+
+		# Rounding may leave tiny negative squared distances
+		np.maximum(squared, 0.0, out=squared)
+		return np.sqrt(squared, out=squared)
+
+	@staticmethod
+	def find_closest(first: np.ndarray, second: np.ndarray, exclude_self: bool = False)\
+			-> Tuple[np.ndarray, np.ndarray]:
+		"""
+		Finds the closest policy of the second set for every policy of the first set, block by block.
+
+		Ties go to the policy of the second set that comes first. Near-ties are ranked again by their exact distances
+		(see pick_closest), and the distances to the closest policies are recomputed directly, so neither is affected
+		by the rounding of the matrix product.
+
+		Parameters
+		----------
+		first : np.ndarray
+			The first set of policies, with one row per policy.
+		second : np.ndarray
+			The second set of policies, with one row per policy.
+		exclude_self : bool
+			Whether both sets are the same, and a policy may not be its own closest policy.
+
+		Returns
+		-------
+		closest : np.ndarray
+			The row of the closest policy of the second set for every policy of the first set, or -1 if there is none.
+		distances : np.ndarray
+			The distances to the closest policies, or infinity if there are none.
+		"""
+
+		closest = np.full(len(first), -1, dtype=int)
+		if len(second) == 0 or (exclude_self and len(second) == 1):
+			return closest, np.full(len(first), np.inf)
+
+		for start, block in Policy.iterate_distances(first, second):
+			if exclude_self:
+				rows = np.arange(len(block))
+				block[rows, start + rows] = np.inf
+			closest[start:start + len(block)] = Policy.pick_closest(first[start:start + len(block)], second, block)
+
+		distances = np.sqrt(np.sum((first - second[closest]) ** 2, axis=1))
+
+		return closest, distances
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import numpy as np
+
+from typing import Tuple
+
+
+class PolicyIndex:
+	"""
+	A sorted grid over the first two policy axes: the policy preferences are sorted by the column of the grid they
+	fall in, then by the row, such that the voters of any run of rows of a column are contiguous. The voters whose
+	policy preferences lie in a box are found by visiting the columns the box spans, taking the runs of rows it spans
+	in each, and checking the few candidates in the cells on its boundary exactly.
+
+	A query costs the number of columns it spans plus the number of candidates, which is the number of voters in the
+	box plus those in the cells on its boundary.
+	"""
+
+	# The number of voters per cell of the grid, on average
+	voters_per_cell: int = 4
+
+	def __init__(self, policy: np.ndarray):
+		"""
+		Builds the index.
+
+		Parameters
+		----------
+		policy : np.ndarray
+			The policy preferences, with one row per voter.
+		"""
+
+		self.policy: np.ndarray = policy
+		self.n_cells: int = max(1, int(np.sqrt(len(policy) / PolicyIndex.voters_per_cell)))
+
+		# Sort the voters by cell, column by column, and find where every cell starts
+		cells = self.get_cells(policy[:, 0]) * self.n_cells + self.get_cells(policy[:, 1])
+		self.order: np.ndarray = np.argsort(cells, kind="stable")
+		self.cell_start: np.ndarray = np.searchsorted(cells[self.order], np.arange(self.n_cells ** 2 + 1))
+
+	def get_cells(self, values: np.ndarray) -> np.ndarray:
+		"""
+		Finds the column (or row) of the grid that values along a policy axis fall in.
+
+		Parameters
+		----------
+		values : np.ndarray
+			The values.
+
+		Returns
+		-------
+		cells : np.ndarray
+			The columns (or rows).
+		"""
+
+		return np.clip(np.floor(values * self.n_cells).astype(int), 0, self.n_cells - 1)
+
+	def query(self, lower: np.ndarray, upper: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+		"""
+		Finds the voters whose policy preferences lie in the policy ranges of many bills, by the same comparisons as
+		VoterTable.get_in_range.
+
+		Parameters
+		----------
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+
+		Returns
+		-------
+		voters : np.ndarray
+			The voters in range, one for every pair of a voter and a bill.
+		bills : np.ndarray
+			The bills they are in range of, in ascending order.
+		"""
+
+		# The columns every bill spans, and the run of cells of the rows it spans in each of them
+		first_column, last_column = self.get_cells(lower[:, 0]), self.get_cells(upper[:, 0])
+		first_row, last_row = self.get_cells(lower[:, 1]), self.get_cells(upper[:, 1])
+		n_columns = last_column - first_column + 1
+		column_bills = np.repeat(np.arange(len(lower)), n_columns)
+		columns = first_column[column_bills] + np.arange(len(column_bills))\
+				  - np.repeat(np.cumsum(n_columns) - n_columns, n_columns)
+		starts = self.cell_start[columns * self.n_cells + first_row[column_bills]]
+		ends = self.cell_start[columns * self.n_cells + last_row[column_bills] + 1]
+
+		# All voters in these runs are candidates
+		lengths = ends - starts
+		bills = np.repeat(column_bills, lengths)
+		positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(len(bills))
+		voters = self.order[positions]
+
+		# Keep the candidates in range, along all axes
+		in_range = np.ones(len(voters), dtype=bool)
+		for k in range(self.policy.shape[1]):
+			values = self.policy[voters, k]
+			in_range &= (lower[bills, k] <= values) & (values <= upper[bills, k])
+
+		return voters[in_range], bills[in_range]
@@ -2,44 +2,139 @@ from __future__ import annotations
 
 import numpy as np
 
-from typing import TYPE_CHECKING
-if TYPE_CHECKING:
-	from policy import Policy
+from validation import Validation
+
+from policy import Policy
+
+from typing import List, Optional, Tuple, Union
 
 
 class PolicyRange:
 	"""
-	A policy preference range.
+	A policy preference range, as a box in the d-dimensional policy space [0,1]^d.
 	"""
 
-	def __init__(self, libertarian_min: float, libertarian_max: float, progressive_min: float, progressive_max: float):
+	__slots__ = ("lower", "upper")
+
+	# How far a random policy range may extend from the policy preference it is based on, along every axis
+	wiggle: float = 0.2
+
+	def __init__(self, lower: Union[np.ndarray, List[float]], upper: Union[np.ndarray, List[float]]):
 		"""
 		Initialises a new policy range.
 
 		Parameters
 		----------
-		libertarian_min : float
-			Determines the lower libertarian bound for the policy range.
-		libertarian_max : float
-			Determines the upper libertarian bound for the policy range.
-		progressive_min : float
-			Determines the lower progressive bound for the policy range.
-		progressive_max : float
-			Determines the upper progressive bound for the policy range.
+		lower : Union[np.ndarray, List[float]]
+			The lower bounds of the policy range along every axis, starting with the libertarian and progressive axes.
+		upper : Union[np.ndarray, List[float]]
+			The upper bounds of the policy range along every axis, starting with the libertarian and progressive axes.
+		"""
+
+		lower = np.asarray(lower, dtype=float)
+		upper = np.asarray(upper, dtype=float)
+
+		if Validation.enabled:
+			assert lower.shape == upper.shape == (Policy.n_dimensions,)
+			assert np.all((0.0 <= lower) & (lower <= upper) & (upper <= 1.0))
+
+		self.lower: np.ndarray = lower
+		self.upper: np.ndarray = upper
+
+	@property
+	def libertarian_min(self) -> float:
+		"""
+		The lower libertarian bound for the policy range.
+		"""
+
+		return float(self.lower[0])
+
+	@property
+	def libertarian_max(self) -> float:
+		"""
+		The upper libertarian bound for the policy range.
+		"""
+
+		return float(self.upper[0])
+
+	@property
+	def progressive_min(self) -> float:
+		"""
+		The lower progressive bound for the policy range.
+		"""
+
+		return float(self.lower[1])
+
+	@property
+	def progressive_max(self) -> float:
+		"""
+		The upper progressive bound for the policy range.
+		"""
+
+		return float(self.upper[1])
+
+	@property
+	def authoritarian_min(self) -> float:
+		"""
+		The lower authoritarian bound for the policy range.
+		"""
+
+		return 1.0 - self.libertarian_max
+
+	@property
+	def authoritarian_max(self) -> float:
+		"""
+		The upper authoritarian bound for the policy range.
+		"""
+
+		return 1.0 - self.libertarian_min
+
+	@property
+	def conservative_min(self) -> float:
+		"""
+		The lower conservative bound for the policy range.
+		"""
+
+		return 1.0 - self.progressive_max
+
+	@property
+	def conservative_max(self) -> float:
+		"""
+		The upper conservative bound for the policy range.
+		"""
+
+		return 1.0 - self.progressive_min
+
+	@staticmethod
+	def from_arrays(lower: np.ndarray, upper: np.ndarray) -> List[PolicyRange]:
+		"""
+		Creates many policy ranges at once.
+
+		Parameters
+		----------
+		lower : np.ndarray
+			The lower bounds of the policy ranges, with one row per policy range and one column per axis.
+		upper : np.ndarray
+			The upper bounds of the policy ranges, with one row per policy range and one column per axis.
+
+		Returns
+		-------
+		policy_ranges : List[PolicyRange]
+			The policy ranges.
 		"""
 
-		assert 0.0 <= libertarian_min <= libertarian_max <= 1.0
-		assert 0.0 <= progressive_min <= progressive_max <= 1.0
+		if Validation.enabled:
+			assert lower.shape == upper.shape and lower.shape[1] == Policy.n_dimensions
+			assert np.all((0.0 <= lower) & (lower <= upper) & (upper <= 1.0))
 
-		self.libertarian_min = libertarian_min
-		self.libertarian_max = libertarian_max
-		self.authoritarian_min = 1.0 - self.libertarian_max
-		self.authoritarian_max = 1.0 - self.libertarian_min
+		policy_ranges = []
+		for lower_, upper_ in zip(lower, upper):
+			policy_range = PolicyRange.__new__(PolicyRange)
+			policy_range.lower = lower_.copy()
+			policy_range.upper = upper_.copy()
+			policy_ranges.append(policy_range)
 
-		self.progressive_min = progressive_min
-		self.progressive_max = progressive_max
-		self.conservative_min = 1.0 - progressive_max
-		self.conservative_max = 1.0 - progressive_min
+		return policy_ranges
 
 	def in_range(self, policy: Policy) -> bool:
 		"""
@@ -56,8 +151,7 @@ class PolicyRange:
 			Whether a policy preference lies in the policy range.
 		"""
 
-		return (self.libertarian_min <= policy.libertarian <= self.libertarian_max)\
-			   and (self.progressive_min <= policy.progressive <= self.progressive_max)
+		return bool(np.all((self.lower <= policy.values) & (policy.values <= self.upper)))
 
 	@staticmethod
 	def pick_policy_range_at_random(policy: Policy) -> __class__:
@@ -75,11 +169,39 @@ class PolicyRange:
 			The chosen policy range.
 		"""
 
-		wiggle = 0.2
+		# The lower and upper wiggle along every axis
+		wiggle = PolicyRange.wiggle * np.random.random((len(policy.values), 2))
+
+		lower = np.maximum(0.0, policy.values - wiggle[:, 0])
+		upper = np.minimum(1.0, policy.values + wiggle[:, 1])
+
+		return PolicyRange(lower, upper)
+
+	@staticmethod
+	def pick_policy_ranges_at_random(policies: np.ndarray, rng: Optional[np.random.Generator] = None)\
+			-> Tuple[np.ndarray, np.ndarray]:
+		"""
+		Selects many policy ranges at random at once, based on given policy preferences.
+
+		Parameters
+		----------
+		policies : np.ndarray
+			The policy preferences, with the axes in the last dimension.
+		rng : Optional[np.random.Generator]
+			The random number generator; the global one by default.
+
+		Returns
+		-------
+		lower : np.ndarray
+			The lower bounds of the chosen policy ranges.
+		upper : np.ndarray
+			The upper bounds of the chosen policy ranges.
+		"""
+
+		random = np.random.random if rng is None else rng.random
+		wiggle = PolicyRange.wiggle * random((2,) + policies.shape)
 
-		libertarian_min = max(0.0, policy.libertarian - wiggle * np.random.random())
-		libertarian_max = min(1.0, policy.libertarian + wiggle * np.random.random())
-		progressive_min = max(0.0, policy.progressive - wiggle * np.random.random())
-		progressive_max = min(1.0, policy.progressive + wiggle * np.random.random())
+		lower = np.maximum(0.0, policies - wiggle[0])
+		upper = np.minimum(1.0, policies + wiggle[1])
 
-		return PolicyRange(libertarian_min, libertarian_max, progressive_min, progressive_max)
+		return lower, upper
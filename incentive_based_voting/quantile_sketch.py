@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import numpy as np
+
+from typing import List, Sequence, Tuple
+
+
+class QuantileSketch:
+	"""
+	A mergeable sketch of the quantiles of an array-valued metric over replicates, after the KLL sketch of Karnin, Lang
+	and Liberty: values are kept in levels, where every value on level h stands for 2^h replicates, and a level that
+	grows beyond its capacity is compacted by sorting it and promoting every other value to the next level.
+
+	Every replicate adds exactly one value to every cell of the array, so all cells share the same levels and the same
+	compactions, which are carried out on all cells at once. The memory grows only with the logarithm of the number of
+	replicates, and the rank error is about 1.7 / k.
+	"""
+
+	# The capacity of the top level; the levels below have geometrically smaller capacities
+	k: int = 200
+
+	def __init__(self, shape: Tuple[int, ...], seed: int = 0):
+		"""
+		Initialises an empty sketch.
+
+		Parameters
+		----------
+		shape : Tuple[int, ...]
+			The shape of the metric of a single replicate.
+		seed : int
+			The seed of the random number generator that decides which values are promoted.
+		"""
+
+		self.shape: Tuple[int, ...] = shape
+		self.count: int = 0
+		self.levels: List[np.ndarray] = [np.zeros((0,) + shape)]
+		self.rng: np.random.Generator = np.random.default_rng(seed)
+
+	def get_capacity(self, h: int) -> int:
+		"""
+		Computes the capacity of a level.
+
+		Parameters
+		----------
+		h : int
+			The level.
+
+		Returns
+		-------
+		capacity : int
+			The number of values the level holds before it is compacted.
+		"""
+
+		return max(2, int(np.ceil(QuantileSketch.k * (2.0 / 3.0) ** (len(self.levels) - 1 - h))))
+
+	def add(self, values: np.ndarray) -> None:
+		"""
+		Adds the metric of a batch of replicates.
+
+		Parameters
+		----------
+		values : np.ndarray
+			The metric, by replicate first.
+		"""
+
+		self.levels[0] = np.concatenate([self.levels[0], np.asarray(values, dtype=float)])
+		self.count += len(values)
+		self.compress()
+
+	def merge(self, other: QuantileSketch) -> None:
+		"""
+		Merges the sketch of other replicates into this one.
+
+		Parameters
+		----------
+		other : QuantileSketch
+			The sketch of the other replicates.
+		"""
+
+		while len(self.levels) < len(other.levels):
+			self.levels.append(np.zeros((0,) + self.shape))
+		for h, level in enumerate(other.levels):
+			self.levels[h] = np.concatenate([self.levels[h], level])
+		self.count += other.count
+		self.compress()
+
+	def compress(self) -> None:
+		"""
+		Compacts the lowest level that is over capacity, until the sketch as a whole is within its capacity.
+		"""
+
+		while sum(len(level) for level in self.levels) > sum(self.get_capacity(h) for h in range(len(self.levels))):
+			h = next(h for h, level in enumerate(self.levels) if len(level) > self.get_capacity(h))
+			if h + 1 == len(self.levels):
+				self.levels.append(np.zeros((0,) + self.shape))
+
+			# With an odd number of values, the oldest one stays behind; of the others, sorted, every other one is
+			# promoted, starting with the first or the second one at random
+			level = self.levels[h]
+			kept, level = level[:len(level) % 2], np.sort(level[len(level) % 2:], axis=0)
+			promoted = level[self.rng.integers(2)::2]
+			self.levels[h] = kept
+			self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+
+	def get_quantiles(self, quantiles: Sequence[float]) -> np.ndarray:
+		"""
+		Estimates quantiles of the metric.
+
+		Parameters
+		----------
+		quantiles : Sequence[float]
+			The quantiles, between 0 and 1.
+
+		Returns
+		-------
+		values : np.ndarray
+			The estimated quantiles, by quantile first; NaN if there are no replicates.
+		"""
+
+		if self.count == 0:
+			return np.full((len(quantiles),) + self.shape, np.nan)
+
+		# Sort the values of all levels of every cell, together with the number of replicates they stand for
+		values = np.concatenate(self.levels)
+		weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+		order = np.argsort(values, axis=0, kind="stable")
+		values = np.take_along_axis(values, order, axis=0)
+		ranks = np.cumsum(weights[order], axis=0)
+
+		# The estimate is the first value whose rank reaches the quantile
+		estimates = []
+		for quantile in quantiles:
+			first = np.argmax(ranks >= quantile * ranks[-1], axis=0)
+			estimates.append(np.take_along_axis(values, first[None], axis=0)[0])
+
+		return np.array(estimates)
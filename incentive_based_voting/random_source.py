@@ -0,0 +1,15 @@
+from enum import Enum
+
+
+class RandomSource(Enum):
+	"""
+	The sources of randomness in a simulation, each of which may draw from a stream of its own.
+	"""
+
+	POLICY_PREFERENCE = 1
+	INCENTIVE = 2
+	PARTY_IMPORTANCE = 3
+	BILL_POPULARITY = 4
+	BILL_POLICY_RANGE = 5
+	SPONSOR = 6
+	PRESIDENT = 7
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import numpy as np
+
+from typing import Union, TYPE_CHECKING
+if TYPE_CHECKING:
+	from random_source import RandomSource
+
+
+class RandomStreams:
+	"""
+	The random number generators of a simulation, by source of randomness.
+
+	With common random numbers, every source draws from a stream of its own for every event (for example every month),
+	derived from the seed by the source and the event alone. Two runs with the same seed but different scenarios then
+	make the same draws wherever their states agree, no matter how many draws the other sources made in between, which
+	makes the differences between the scenarios far less noisy. Otherwise, all sources share a single stream.
+	"""
+
+	def __init__(self, seed: Union[int, np.random.SeedSequence], common: bool):
+		"""
+		Initialises the streams.
+
+		Parameters
+		----------
+		seed : Union[int, np.random.SeedSequence]
+			The seed.
+		common : bool
+			Whether every source draws from a stream of its own for every event.
+		"""
+
+		self.seed_sequence: np.random.SeedSequence = seed if isinstance(seed, np.random.SeedSequence)\
+			else np.random.SeedSequence(seed)
+		self.common: bool = common
+		self.rng: np.random.Generator = np.random.default_rng(self.seed_sequence)
+
+	def get(self, source: RandomSource, event: int) -> np.random.Generator:
+		"""
+		Gets the random number generator of a source for an event.
+
+		Parameters
+		----------
+		source : RandomSource
+			The source of randomness.
+		event : int
+			The event, for example the time step, or the voting body the representatives of which are drawn.
+
+		Returns
+		-------
+		rng : np.random.Generator
+			The random number generator.
+		"""
+
+		if not self.common:
+			return self.rng
+
+		return np.random.default_rng(np.random.SeedSequence(
+			self.seed_sequence.entropy, spawn_key=self.seed_sequence.spawn_key + (source.value, event)))
@@ -59,6 +59,9 @@ class Representative(CongressVoter):
 		# The corresponding coalition
 		self.coalition: Optional[Coalition] = None
 
+		# The seat of the representative in its voting body
+		self.seat: Optional[int] = None
+
 	def vote(self, bill: Bill, democrats: Party, republicans: Party, otherparty: Party) -> bool:
 		"""
 		The representative votes on a bill.
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import numpy as np
+
+from typing import Tuple
+
+
+class RunningStatistics:
+	"""
+	The running mean and variance of an array-valued metric over replicates, by Welford's algorithm; two running
+	statistics of different sets of replicates merge into those of all replicates, in any order.
+	"""
+
+	def __init__(self, shape: Tuple[int, ...]):
+		"""
+		Initialises empty statistics.
+
+		Parameters
+		----------
+		shape : Tuple[int, ...]
+			The shape of the metric of a single replicate.
+		"""
+
+		self.count: int = 0
+		self.mean: np.ndarray = np.zeros(shape)
+
+		# The sum of the squared differences from the mean
+		self.squared_deviations: np.ndarray = np.zeros(shape)
+
+	@property
+	def variance(self) -> np.ndarray:
+		"""
+		The sample variance, or NaN with fewer than two replicates.
+		"""
+
+		if self.count < 2:
+			return np.full(self.mean.shape, np.nan)
+
+		return self.squared_deviations / (self.count - 1)
+
+	@property
+	def std(self) -> np.ndarray:
+		"""
+		The sample standard deviation, or NaN with fewer than two replicates.
+		"""
+
+		return np.sqrt(self.variance)
+
+	def add(self, values: np.ndarray) -> None:
+		"""
+		Adds the metric of a batch of replicates.
+
+		Parameters
+		----------
+		values : np.ndarray
+			The metric, by replicate first.
+		"""
+
+		if len(values) == 0:
+			return
+
+		batch = RunningStatistics(self.mean.shape)
+		batch.count = len(values)
+		batch.mean = np.mean(values, axis=0)
+		batch.squared_deviations = np.sum((values - batch.mean) ** 2, axis=0)
+		self.merge(batch)
+
+	def merge(self, other: RunningStatistics) -> None:
+		"""
+		Merges the statistics of other replicates into these, by the pairwise update of Chan et al.
+
+		Parameters
+		----------
+		other : RunningStatistics
+			The statistics of the other replicates.
+		"""
+
+		if other.count == 0:
+			return
+
+		count = self.count + other.count
+		delta = other.mean - self.mean
+		self.mean = self.mean + delta * (other.count / count)
+		self.squared_deviations = self.squared_deviations + other.squared_deviations\
+								  + delta ** 2 * (self.count * other.count / count)
+		self.count = count
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import numpy as np
+
+from parties import Parties
+from congress_voter import CongressVoter
+from batched_simulation import BatchedSimulation
+
+from typing import Dict, Optional, Union
+
+
+class Scenario:
+	"""
+	A scenario to run the batched simulation under: the party of the President, and optionally the weights and the
+	threshold that representatives and coalitions vote by.
+	"""
+
+	def __init__(self, name: str, president_party: Parties = Parties.DEMOCRATIC,
+				 weights: Optional[Dict[str, float]] = None, threshold: Optional[float] = None):
+		"""
+		Initialises a new scenario.
+
+		Parameters
+		----------
+		name : str
+			The name of the scenario.
+		president_party : Parties
+			The party of the President.
+		weights : Optional[Dict[str, float]]
+			The weights of the ideology, popularity-finance and party-pressure metrics, or None for those of
+			CongressVoter.
+		threshold : Optional[float]
+			The threshold for voting for a bill, or None for that of CongressVoter.
+		"""
+
+		self.name: str = name
+		self.president_party: Parties = president_party
+		self.weights: Optional[Dict[str, float]] = weights
+		self.threshold: Optional[float] = threshold
+
+	def run(self, n_replicates: int, start_year: int, end_year: int, n_bills: int,
+			seed: Union[int, np.random.SeedSequence]) -> BatchedSimulation:
+		"""
+		Runs replicates of the scenario in lockstep.
+
+		Parameters
+		----------
+		n_replicates : int
+			The number of replicates.
+		start_year : int
+			The start year.
+		end_year : int
+			The end year.
+		n_bills : int
+			The number of bills that are brought before congress each month, in every replicate.
+		seed : Union[int, np.random.SeedSequence]
+			The seed.
+
+		Returns
+		-------
+		simulation : BatchedSimulation
+			The simulation, after it ran.
+		"""
+
+		# The voting rule is set for the run only
+		weights, threshold = CongressVoter.weights, CongressVoter.threshold
+		CongressVoter.weights = weights if self.weights is None else self.weights
+		CongressVoter.threshold = threshold if self.threshold is None else self.threshold
+		try:
+			simulation = BatchedSimulation(n_replicates, start_year, end_year, n_bills, seed, self.president_party)
+			simulation.run()
+		finally:
+			CongressVoter.weights, CongressVoter.threshold = weights, threshold
+
+		return simulation
@@ -0,0 +1,86 @@
+import numpy as np
+
+from parties import Parties
+from scenario import Scenario
+from batched_simulation import BatchedSimulation
+from ensemble_runner import EnsembleRunner
+from ensemble_statistics import EnsembleStatistics
+
+
+def compare_scenarios(first: Scenario, second: Scenario, n_replicates: int, start_year: int, end_year: int,
+					  n_bills: int, seed: int = 0, common: bool = True) -> EnsembleStatistics:
+	"""
+	Runs two scenarios on paired replicates and collects the statistics of the differences of their metrics.
+
+	Parameters
+	----------
+	first : Scenario
+		The first scenario.
+	second : Scenario
+		The second scenario.
+	n_replicates : int
+		The number of pairs of replicates.
+	start_year : int
+		The start year.
+	end_year : int
+		The end year.
+	n_bills : int
+		The number of bills that are brought before congress each month, in every replicate.
+	seed : int
+		The seed.
+	common : bool
+		Whether both replicates of a pair share their random numbers, by source and month; otherwise they draw
+		independently.
+
+	Returns
+	-------
+	statistics : EnsembleStatistics
+		The statistics of the metrics of the second scenario minus those of the first, by pair of replicates.
+	"""
+
+	common_random_numbers = BatchedSimulation.common_random_numbers
+	BatchedSimulation.common_random_numbers = common
+	try:
+		statistics = EnsembleStatistics({})
+		seed_sequence = np.random.SeedSequence(seed)
+		for start in range(0, n_replicates, EnsembleRunner.batch_size):
+			batch = min(EnsembleRunner.batch_size, n_replicates - start)
+			batch_seed = seed_sequence.spawn(1)[0]
+			first_seed, second_seed = (batch_seed, batch_seed) if common else batch_seed.spawn(2)
+
+			first_simulation = first.run(batch, start_year, end_year, n_bills, first_seed)
+			second_simulation = second.run(batch, start_year, end_year, n_bills, second_seed)
+			first_metrics, second_metrics = first_simulation.get_metrics(), second_simulation.get_metrics()
+
+			# The differences of a metric range as far below zero as above
+			differences = EnsembleStatistics({name: (lower - upper, upper - lower) for name, (lower, upper)
+											  in first_simulation.get_metric_ranges().items()})
+			differences.add({name: second_metrics[name] - first_metrics[name] for name in first_metrics.keys()})
+			statistics.merge(differences)
+	finally:
+		BatchedSimulation.common_random_numbers = common_random_numbers
+
+	return statistics
+
+
+if __name__ == "__main__":
+
+	# Settings
+	n_replicates = 500  # the number of pairs of replicates
+	start_year = 2010
+	end_year = 2010
+	n_bills = 10  # the number of bills that are brought before congress each month, in every replicate
+	target = 0.005  # the half-width of the confidence interval of the mean difference in pass rate to aim for
+	first = Scenario("the default weights", Parties.DEMOCRATIC, threshold=0.2)
+	second = Scenario("more weight on popularity and finance", Parties.DEMOCRATIC,
+					  weights={"ideology": 0.45, "popularity_finance": 0.35, "party_pressure": 0.2}, threshold=0.2)
+
+	# Compare the scenarios with common and with independent random numbers
+	print(second.name.capitalize(), "minus", first.name)
+	for common in [True, False]:
+		statistics = compare_scenarios(first, second, n_replicates, start_year, end_year, n_bills, common=common)
+		half_width = statistics.get_half_widths(EnsembleRunner.confidence)["pass_rate"]
+		mean = float(np.mean(statistics.moments["pass_rate"].mean))
+		print("{:<29}mean difference in pass rate {:+.4f}, half-width {:.4f}, {:.0f} pairs needed for {}".format(
+			"common random numbers:" if common else "independent random numbers:", mean, half_width,
+			np.ceil(n_replicates * (half_width / target) ** 2), target))
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import threading
+import numpy as np
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from policy import Policy
+
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+if TYPE_CHECKING:
+	from snapshot import Snapshot
+
+
+class SimulationService:
+	"""
+	A local HTTP service that keeps snapshots of a simulated Congress in memory and evaluates batches of hypothetical
+	bills against them.
+
+	GET /snapshots lists the time steps of all snapshots. POST /evaluate takes a JSON object with the columns
+	"popularity" (one value per bill), "lower" and "upper" (one list of bounds per bill), and optionally the time step
+	"snapshot" (by default the latest one), and answers with the yeas in both chambers and whether every bill passed.
+	With "analytic" set, the popularity is left out and taken to be uniformly random instead, and the service answers
+	with the expected yeas and the probabilities of passing, in closed form. With "approximate" set, the yeas are
+	estimated from samples of the voters, along with the half-widths of their confidence intervals.
+	"""
+
+	# The largest body of a request, in bytes; larger ones are refused without being read
+	max_body_size: int = 2 ** 26
+
+	def __init__(self, snapshots: Dict[int, Snapshot], host: str = "127.0.0.1", port: int = 8000):
+		"""
+		Initialises the service.
+
+		Parameters
+		----------
+		snapshots : Dict[int, Snapshot]
+			The snapshots, by time step.
+		host : str
+			The host to listen on; only the local machine by default.
+		port : int
+			The port to listen on, or 0 for any free port.
+		"""
+
+		self.snapshots: Dict[int, Snapshot] = snapshots
+
+		# Every request is handled on a thread of its own, with access to the service
+		service = self
+
+		class Handler(BaseHTTPRequestHandler):
+			def do_GET(self):
+				service.handle(self, "GET")
+
+			def do_POST(self):
+				service.handle(self, "POST")
+
+			def log_message(self, *args):
+				pass
+
+		self.server: ThreadingHTTPServer = ThreadingHTTPServer((host, port), Handler)
+		self.thread: Optional[threading.Thread] = None
+
+	@property
+	def address(self) -> Tuple[str, int]:
+		"""
+		The host and the port the service listens on.
+		"""
+
+		return self.server.server_address[:2]
+
+	def serve_forever(self) -> None:
+		"""
+		Answers requests until the service is stopped.
+		"""
+
+		self.server.serve_forever()
+
+	def start(self) -> None:
+		"""
+		Answers requests in the background.
+		"""
+
+		self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+		self.thread.start()
+
+	def stop(self) -> None:
+		"""
+		Stops answering requests and releases the port.
+		"""
+
+		# Only a loop that runs in the background can be shut down; waiting for any other would never return
+		if self.thread is not None:
+			self.server.shutdown()
+			self.thread.join()
+			self.thread = None
+		self.server.server_close()
+
+	def handle(self, request: BaseHTTPRequestHandler, method: str) -> None:
+		"""
+		Answers a single request.
+
+		Parameters
+		----------
+		request : BaseHTTPRequestHandler
+			The request.
+		method : str
+			The HTTP method of the request.
+		"""
+
+		try:
+			if method == "GET" and request.path == "/snapshots":
+				status, response = 200, {"snapshots": sorted(self.snapshots.keys())}
+			elif method == "POST" and request.path == "/evaluate":
+
+				# Only read as many bytes as announced, and only if that is a sane number
+				length = request.headers.get("Content-Length", "0").strip()
+				if not (length.isascii() and length.isdigit()):
+					raise ValueError("the content length must be a non-negative integer")
+				if int(length) > SimulationService.max_body_size:
+					status, response = 413, {"error": "the body must not exceed "
+													  + str(SimulationService.max_body_size) + " bytes"}
+				else:
+					query = json.loads(request.rfile.read(int(length)) or b"{}")
+					if not isinstance(query, dict):
+						raise ValueError("the body must be a JSON object")
+					status, response = 200, self.evaluate(query)
+			else:
+				status, response = 404, {"error": "unknown endpoint " + method + " " + request.path}
+		except KeyError as error:
+			status, response = 400, {"error": "missing field " + str(error)}
+		except (ValueError, TypeError, OverflowError) as error:
+			status, response = 400, {"error": str(error)}
+
+		body = json.dumps(response).encode()
+		request.send_response(status)
+		request.send_header("Content-Type", "application/json")
+		request.send_header("Content-Length", str(len(body)))
+		request.end_headers()
+		request.wfile.write(body)
+
+	def evaluate(self, query: Dict) -> Dict:
+		"""
+		Evaluates a batch of hypothetical bills against a snapshot.
+
+		Parameters
+		----------
+		query : Dict
+			The columns "popularity" (unless "analytic" is set), "lower" and "upper" of the bills, and optionally the
+			time step "snapshot" and the flags "analytic" and "approximate".
+
+		Returns
+		-------
+		response : Dict
+			The time step of the snapshot, the yeas in the House and the Senate, and whether the bills passed the House,
+			the Senate and the Congress; or the expected yeas and the probabilities of passing, if "analytic" is set.
+		"""
+
+		if len(self.snapshots) == 0:
+			raise ValueError("there are no snapshots")
+		t = query.get("snapshot", max(self.snapshots.keys()))
+		if isinstance(t, float) and t.is_integer():
+			t = int(t)
+		if not isinstance(t, int) or isinstance(t, bool):
+			raise ValueError("the snapshot needs to be given as an integral time step")
+		if t not in self.snapshots:
+			raise ValueError("there is no snapshot at time step " + str(t))
+
+		# Check the bills
+		analytic = bool(query.get("analytic", False))
+		lower = np.array(query["lower"], dtype=float).reshape(-1, Policy.n_dimensions)
+		upper = np.array(query["upper"], dtype=float).reshape(-1, Policy.n_dimensions)
+		if lower.shape != upper.shape:
+			raise ValueError("policy ranges need " + str(Policy.n_dimensions) + " bounds each")
+		if not np.all((0.0 <= lower) & (lower <= upper) & (upper <= 1.0)):
+			raise ValueError("policy ranges need to satisfy 0 <= lower <= upper <= 1")
+		if analytic:
+			results = self.snapshots[t].evaluate_analytically(lower, upper)
+		else:
+			popularity = np.array(query["popularity"], dtype=float).reshape(len(lower))
+			if not np.all((0.0 <= popularity) & (popularity <= 1.0)):
+				raise ValueError("popularities need to lie in [0,1]")
+			results = self.snapshots[t].evaluate(popularity, lower, upper, bool(query.get("approximate", False)))
+
+		response = {"snapshot": t}
+		response.update({key: values.tolist() for key, values in results.items()})
+		return response
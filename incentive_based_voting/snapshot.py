@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import numpy as np
+
+from policy import Policy
+from vote import Vote
+from voting_bodies import VotingBodies
+from validation import Validation
+
+from typing import Dict, TYPE_CHECKING
+if TYPE_CHECKING:
+	from congress import Congress
+	from party import Party
+
+
+class Snapshot:
+	"""
+	The voters of the House and the Senate, including their coalitions and the policy preferences of their parties, as
+	they were at one time step, such that hypothetical bills can be evaluated against them later on.
+	"""
+
+	def __init__(self, congress: Congress, democrats: Party, republicans: Party, otherparty: Party, t: int):
+		"""
+		Takes a snapshot.
+
+		Parameters
+		----------
+		congress : Congress
+			The congress.
+		democrats : Party
+			The democratic party.
+		republicans : Party
+			The republican party.
+		otherparty : Party
+			The other party.
+		t : int
+			The current time step.
+		"""
+
+		self.t: int = t
+		self.house_voters = congress.house.get_voter_table(democrats, republicans, otherparty)
+		self.senate_voters = congress.senate.get_voter_table(democrats, republicans, otherparty)
+
+	def evaluate(self, popularity: np.ndarray, lower: np.ndarray, upper: np.ndarray, approximate: bool = False)\
+			-> Dict[str, np.ndarray]:
+		"""
+		Evaluates whether hypothetical bills would make it through the Congress; the President is left out, since their
+		decision depends on the sponsor of a bill.
+
+		Approximately, the yeas are estimated from stratified samples of the voters (see VoterTable.estimate_yeas),
+		and bills are only counted exactly if the estimate does not settle whether they pass.
+
+		Parameters
+		----------
+		popularity : np.ndarray
+			The popularity of the bills.
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+		approximate : bool
+			Whether to estimate the yeas instead of counting them.
+
+		Returns
+		-------
+		results : Dict[str, np.ndarray]
+			The number of yeas in the House and in the Senate for every bill, whether it passed the House, whether it
+			would pass the Senate, and whether it passed the Congress (the Senate only votes on bills that passed the
+			House); approximately, also the half-widths of the confidence intervals of the yeas in either chamber.
+		"""
+
+		if Validation.enabled:
+			assert popularity.ndim == 1 and np.all((0.0 <= popularity) & (popularity <= 1.0))
+			assert lower.shape == upper.shape == (len(popularity), Policy.n_dimensions)
+			assert np.all((0.0 <= lower) & (lower <= upper) & (upper <= 1.0))
+
+		if approximate:
+			house_yeas, house_half_widths = self.house_voters.estimate_yeas(popularity, lower, upper)
+			senate_yeas, senate_half_widths = self.senate_voters.estimate_yeas(popularity, lower, upper)
+		else:
+			house_yeas = self.house_voters.tally(popularity, lower, upper)
+			senate_yeas = self.senate_voters.tally(popularity, lower, upper)
+		passed_house = house_yeas >= Vote.get_majority(VotingBodies.HOUSE)
+		passed_senate = senate_yeas >= Vote.get_majority(VotingBodies.SENATE)
+
+		results = {"house_yeas": house_yeas, "senate_yeas": senate_yeas, "passed_house": passed_house,
+				   "passed_senate": passed_senate, "passed": passed_house & passed_senate}
+		if approximate:
+			results.update({"house_half_widths": house_half_widths, "senate_half_widths": senate_half_widths})
+
+		return results
+
+	def sweep(self, weights: np.ndarray, thresholds: np.ndarray, popularity: np.ndarray, lower: np.ndarray,
+			  upper: np.ndarray) -> Dict[str, np.ndarray]:
+		"""
+		Evaluates the same hypothetical bills under many vote rules at once, where every rule is a combination of the
+		weights of the three metrics of CongressVoter.vote and a threshold.
+
+		Parameters
+		----------
+		weights : np.ndarray
+			The weights of the ideology, popularity-finance and party-pressure metrics, with one row per rule.
+		thresholds : np.ndarray
+			The threshold of every rule.
+		popularity : np.ndarray
+			The popularity of the bills.
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+
+		Returns
+		-------
+		results : Dict[str, np.ndarray]
+			The number of yeas in the House and in the Senate under every rule (by row) for every bill (by column), and
+			under every rule the share of bills that pass the House, that would pass the Senate, and that pass both.
+		"""
+
+		if Validation.enabled:
+			assert weights.ndim == 2 and weights.shape[1] == 3 and thresholds.shape == (len(weights),)
+			assert popularity.ndim == 1 and np.all((0.0 <= popularity) & (popularity <= 1.0))
+			assert lower.shape == upper.shape == (len(popularity), Policy.n_dimensions)
+
+		house_yeas = self.house_voters.sweep(weights, thresholds, popularity, lower, upper)
+		senate_yeas = self.senate_voters.sweep(weights, thresholds, popularity, lower, upper)
+		passed_house = house_yeas >= Vote.get_majority(VotingBodies.HOUSE)
+		passed_senate = senate_yeas >= Vote.get_majority(VotingBodies.SENATE)
+
+		return {"house_yeas": house_yeas, "senate_yeas": senate_yeas,
+				"house_pass_rate": np.mean(passed_house, axis=1), "senate_pass_rate": np.mean(passed_senate, axis=1),
+				"pass_rate": np.mean(passed_house & passed_senate, axis=1)}
+
+	def evaluate_analytically(self, lower: np.ndarray, upper: np.ndarray) -> Dict[str, np.ndarray]:
+		"""
+		Evaluates how likely hypothetical bills with uniformly random popularity are to make it through the Congress,
+		in closed form rather than by sampling popularities.
+
+		Every voter votes for a bill on an interval of popularities, so the tallies of both chambers are step functions
+		of popularity; sweeping over the ends of all intervals gives the exact share of popularities at which a bill
+		passes, up to rounding at the ends of the intervals.
+
+		Parameters
+		----------
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+
+		Returns
+		-------
+		results : Dict[str, np.ndarray]
+			The expected number of yeas in the House and in the Senate for every bill, the probability that it passes
+			the House, that it would pass the Senate, and that it passes both (the President is left out).
+		"""
+
+		if Validation.enabled:
+			assert lower.shape == upper.shape and lower.ndim == 2 and lower.shape[1] == Policy.n_dimensions
+			assert np.all((0.0 <= lower) & (lower <= upper) & (upper <= 1.0))
+
+		house_start, house_end = self.house_voters.get_yea_intervals(lower, upper)
+		senate_start, senate_end = self.senate_voters.get_yea_intervals(lower, upper)
+
+		# The expected tallies
+		house_yeas = self.house_voters.n_members @ np.maximum(house_end - house_start, 0.0)
+		senate_yeas = self.senate_voters.n_members @ np.maximum(senate_end - senate_start, 0.0)
+
+		# Every non-empty interval adds the votes of its voter to the tally of its chamber at its start and takes them
+		# away at its end, with the ends of all intervals of a bill in order
+		n_house, n_senate = len(house_start), len(senate_start)
+		house_members = np.where(house_end >= house_start, self.house_voters.n_members[:, None], 0)
+		senate_members = np.where(senate_end >= senate_start, self.senate_voters.n_members[:, None], 0)
+		positions = np.concatenate([house_start, house_end, senate_start, senate_end])
+		house_steps = np.concatenate([house_members, -house_members, np.zeros((2 * n_senate, len(lower)), dtype=int)])
+		senate_steps = np.concatenate([np.zeros((2 * n_house, len(lower)), dtype=int), senate_members, -senate_members])
+
+		# Starts come before ends at the same popularity, so that the tallies in between are right
+		is_end = np.repeat([False, True, False, True], [n_house, n_house, n_senate, n_senate])
+		order = np.lexsort((np.broadcast_to(is_end[:, None], positions.shape), positions), axis=0)
+		positions = np.take_along_axis(positions, order, axis=0)
+		house_tally = np.cumsum(np.take_along_axis(house_steps, order, axis=0), axis=0)
+		senate_tally = np.cumsum(np.take_along_axis(senate_steps, order, axis=0), axis=0)
+
+		# The tallies hold between every position and the next one, up to a popularity of 1
+		lengths = np.diff(np.concatenate([positions, np.ones((1, len(lower)))]), axis=0)
+		lengths = np.maximum(lengths, 0.0) * (positions >= 0.0)
+		passes_house = house_tally >= Vote.get_majority(VotingBodies.HOUSE)
+		passes_senate = senate_tally >= Vote.get_majority(VotingBodies.SENATE)
+
+		return {"house_yeas": house_yeas, "senate_yeas": senate_yeas,
+				"p_passed_house": np.sum(lengths * passes_house, axis=0),
+				"p_passed_senate": np.sum(lengths * passes_senate, axis=0),
+				"p_passed": np.sum(lengths * (passes_house & passes_senate), axis=0)}
@@ -41,16 +41,16 @@ class Timeline:
 			# New opinion formation happens every month
 			events.append(Event.OPINION_FORMATION)
 	
-			# House election happens every 2 years
-			if time.year % 2 == 0:
+			# House election happens every 2 years, in November
+			if time.year % 2 == 0 and time.month == 11:
 				events.append(Event.HOUSE_ELECTION)
 	
-			# Senate election happens every 6 years
-			if time.year % 6 == 0:
+			# Senate election happens every 6 years, in November
+			if time.year % 6 == 0 and time.month == 11:
 				events.append(Event.SENATE_ELECTION)
 
-			# Presidential election happens every 4 years
-			if time.year % 4 == 0:
+			# Presidential election happens every 4 years, in November
+			if time.year % 4 == 0 and time.month == 11:
 				events.append(Event.PRESIDENTIAL_ELECTION)
 
 			self.events[deepcopy(time)] = events
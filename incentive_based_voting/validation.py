@@ -0,0 +1,8 @@
+class Validation:
+	"""
+	Switches the validation of value types (policies, policy ranges, ...) between a debug mode, in which all arguments
+	are checked on construction, and a fast mode, in which they are not.
+	"""
+
+	# Whether we are in debug mode
+	enabled: bool = True
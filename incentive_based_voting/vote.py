@@ -10,6 +10,8 @@ class Vote:
 	A single vote.
 	"""
 
+	__slots__ = ("voting_body", "yeas", "nays", "time_of_vote", "passed")
+
 	def __init__(self, voting_body: VotingBodies, yeas: List[str], nays: List[str], t: int):
 		"""
 		Initialises a new policy preference.
@@ -45,7 +47,25 @@ class Vote:
 			Whether the vote has passed.
 		"""
 
-		if self.voting_body == VotingBodies.HOUSE:
-			return len(self.yeas) >= 218
+		return len(self.yeas) >= Vote.get_majority(self.voting_body)
+
+	@staticmethod
+	def get_majority(voting_body: VotingBodies) -> int:
+		"""
+		Gets the number of yeas needed to pass a voting body.
+
+		Parameters
+		----------
+		voting_body : VotingBodies
+			The voting body.
+
+		Returns
+		-------
+		majority : int
+			The number of yeas needed.
+		"""
+
+		if voting_body == VotingBodies.HOUSE:
+			return 218
 		else:
-			return len(self.yeas) >= 51
+			return 51
@@ -0,0 +1,76 @@
+import numpy as np
+
+from congress import Congress
+from timeline import Timeline
+from party import Party
+from parties import Parties
+from snapshot import Snapshot
+from bill_table import BillTable
+
+from typing import Tuple
+
+
+def make_grid(n_weights: int, thresholds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+	"""
+	Lays out all vote rules whose weights are multiples of 1 / n_weights and add up to 1, combined with every
+	threshold.
+
+	Parameters
+	----------
+	n_weights : int
+		The number of steps between 0 and 1 for every weight.
+	thresholds : np.ndarray
+		The thresholds.
+
+	Returns
+	-------
+	weights : np.ndarray
+		The weights of the ideology, popularity-finance and party-pressure metrics, with one row per rule.
+	thresholds : np.ndarray
+		The threshold of every rule.
+	"""
+
+	steps = [(i, j, n_weights - i - j) for i in range(n_weights + 1) for j in range(n_weights + 1 - i)]
+	weights = np.array(steps, dtype=float) / n_weights
+
+	return np.repeat(weights, len(thresholds), axis=0), np.tile(thresholds, len(weights))
+
+
+if __name__ == "__main__":
+
+	# Settings
+	seed = 0
+	start_year = 2010
+	end_year = 2010
+	n_months = 12  # the number of months the Congress forms coalitions for before the bills are evaluated
+	n_bills = 1000  # the number of bills every rule is evaluated on
+	n_weights = 10  # the number of steps between 0 and 1 for every weight
+	threshold_grid = np.linspace(0.0, 1.0, 21)
+
+	# Let the Congress form coalitions, then take a snapshot
+	np.random.seed(seed)
+	timeline = Timeline(start_year, end_year)
+	with Congress(start_year, timeline.t_max) as congress:
+		for t in range(n_months):
+			if t > 0:
+				congress.aging(t)
+			congress.coalition_formation(t)
+	parties = [Party(Parties.DEMOCRATIC), Party(Parties.REPUBLICAN), Party(Parties.OTHER)]
+	for party in parties:
+		party.update_policy_preference(congress.house.representatives, congress.senate.representatives, n_months - 1)
+	snapshot = Snapshot(congress, *parties, n_months - 1)
+
+	# Evaluate the same bills under all rules
+	bills = BillTable.generate_at_random(congress.registry.sample_sponsors(n_bills, n_months - 1), congress.registry,
+										 n_months - 1)
+	weights, thresholds = make_grid(n_weights, threshold_grid)
+	results = snapshot.sweep(weights, thresholds, bills.popularity, bills.lower, bills.upper)
+
+	# Report the pass rate surface of every combination of weights, over the thresholds
+	print("{} rules on {} bills".format(len(weights), n_bills))
+	print("ideology  pop-finance  party    threshold at which the pass rate drops below 50%, 10%, 1%")
+	pass_rate = results["pass_rate"].reshape(-1, len(threshold_grid))
+	for w, rates in zip(weights[::len(threshold_grid)], pass_rate):
+		drops = [threshold_grid[np.argmax(rates < level)] if np.any(rates < level) else np.nan
+				 for level in [0.5, 0.1, 0.01]]
+		print("{:<10.1f}{:<13.1f}{:<9.1f}{}".format(*w, "  ".join("{:.2f}".format(d) for d in drops)))
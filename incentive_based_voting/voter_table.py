@@ -0,0 +1,729 @@
+from __future__ import annotations
+
+import numpy as np
+
+from statistics import NormalDist
+
+from congress_voter import CongressVoter
+from coalition import Coalition
+from financial_incentive import FinancialIncentive
+from vote import Vote
+from policy import Policy
+from incentive import Incentive
+from parties import Parties
+from voting_bodies import VotingBodies
+from policy_index import PolicyIndex
+
+from typing import List, Optional, Tuple, Union, TYPE_CHECKING
+if TYPE_CHECKING:
+	from party import Party
+
+
+class VoterTable:
+	"""
+	All agents that vote in a voting body -- the coalitions first, then all representatives without a coalition --
+	stored column by column, such that many bills can be voted on at once.
+	"""
+
+	# The number of voters first sampled per approximate tally, spread over the strata, and the nominal confidence level
+	# of its normal bounds; bills whose bounds include the majority are sampled again, with more voters
+	sample_size: int = 400
+	confidence: float = 0.999
+
+	def __init__(self, voting_body: VotingBodies, members: List[List[str]], policy: np.ndarray,
+				 party_policy: np.ndarray, ideological: np.ndarray, big_dollar: np.ndarray, party_index: np.ndarray,
+				 in_coalition: np.ndarray, majority: Optional[int] = None):
+		"""
+		Initialises a new table of voters from its columns.
+
+		Parameters
+		----------
+		voting_body : VotingBodies
+			The corresponding voting body.
+		members : List[List[str]]
+			The IDs of the representatives every voter casts a vote for.
+		policy : np.ndarray
+			The policy preferences of the voters, with one row per voter.
+		party_policy : np.ndarray
+			The policy preferences of the parties in the voting body, with one row per party (as Parties.value - 1),
+			which is NaN for a party without one.
+		ideological : np.ndarray
+			The ideological incentives of the voters.
+		big_dollar : np.ndarray
+			Whether the voters take big dollar donations.
+		party_index : np.ndarray
+			The party of every voter, as Parties.value - 1.
+		in_coalition : np.ndarray
+			Whether every voter is a coalition.
+		majority : Optional[int]
+			The number of yeas needed to pass a bill; by default that of the voting body.
+		"""
+
+		self.voting_body: VotingBodies = voting_body
+		self.members: List[List[str]] = members
+		self.n_members: np.ndarray = np.array([len(members_) for members_ in members], dtype=int)
+		self.majority: int = Vote.get_majority(voting_body) if majority is None else majority
+
+		# The policy preferences of the voters, with one row per voter, and of the parties, with one row per party
+		self.policy: np.ndarray = policy
+		self.party_policy: np.ndarray = party_policy
+
+		# The incentives of the voters
+		self.ideological: np.ndarray = ideological
+		self.big_dollar: np.ndarray = big_dollar
+
+		# The groups of voters that differ only in policy preference and ideological incentive, by party and financial
+		# incentive, and the strata of approximate tallies, which also tell coalitions apart
+		self.party_index: np.ndarray = party_index
+		self.in_coalition: np.ndarray = in_coalition
+		self.group: np.ndarray = party_index * 2 + big_dollar
+		self.stratum: np.ndarray = self.group * 2 + in_coalition
+		self.n_groups: int = len(Parties) * 2
+		self.n_strata: int = self.n_groups * 2
+
+		# For tallies, an index of the policy preferences, and the voters of every group sorted by ideological incentive
+		# along with the running count of their members; they are only built once the first tally needs them, since
+		# the tables of Congress.attempt_passing_bills never tally
+		self.index: Optional[PolicyIndex] = None
+		self.ideological_order: Optional[np.ndarray] = None
+		self.group_start: Optional[np.ndarray] = None
+		self.cumulative_members: Optional[np.ndarray] = None
+
+	@staticmethod
+	def from_voters(voters: List[CongressVoter], members: List[List[str]], voting_body: VotingBodies,
+					democrats: Party, republicans: Party, otherparty: Party) -> VoterTable:
+		"""
+		Creates a table of the voters of a voting body.
+
+		Parameters
+		----------
+		voters : List[CongressVoter]
+			The coalitions and representatives that vote.
+		members : List[List[str]]
+			The IDs of the representatives every voter casts a vote for.
+		voting_body : VotingBodies
+			The corresponding voting body.
+		democrats : Party
+			The democratic party.
+		republicans : Party
+			The republican party.
+		otherparty : Party
+			The other party.
+
+		Returns
+		-------
+		voter_table : VoterTable
+			The voters.
+		"""
+
+		n_voters = len(voters)
+		policy = np.array([v.policy_preference.values for v in voters]).reshape(n_voters, -1)
+
+		# The latest policy preference of every party in the voting body, looked up once rather than once per voter
+		party_policy = np.full((len(Parties), Policy.n_dimensions), np.nan)
+		for i, party in enumerate([democrats, republicans, otherparty]):
+			party_policies = party.policy_preference_house_t if voting_body == VotingBodies.HOUSE\
+				else party.policy_preference_senate_t
+			if len(party_policies) > 0:
+				party_policy[i] = party_policies[-1].values
+		ideological = np.array([v.incentive.ideological for v in voters], dtype=float)
+		big_dollar = np.array([v.incentive.financial == FinancialIncentive.BIG_DOLLAR for v in voters], dtype=bool)
+		party_index = np.array([v.party.value - 1 for v in voters], dtype=int)
+		in_coalition = np.array([isinstance(v, Coalition) for v in voters], dtype=bool)
+
+		return VoterTable(voting_body, members, policy, party_policy, ideological, big_dollar, party_index,
+						  in_coalition)
+
+	@staticmethod
+	def generate_at_random(n_representatives: int, voting_body: VotingBodies, rng: np.random.Generator,
+						   coalition_share: float = 0.5, max_coalition_size: int = 10) -> VoterTable:
+		"""
+		Creates a synthetic voting body of any size, with the policy preferences and incentives of its representatives
+		drawn as in Congress, and a share of them joined in coalitions of random sizes.
+
+		Parameters
+		----------
+		n_representatives : int
+			The number of representatives.
+		voting_body : VotingBodies
+			The voting body the representatives are drawn like.
+		rng : np.random.Generator
+			The random number generator.
+		coalition_share : float
+			The share of representatives in coalitions.
+		max_coalition_size : int
+			The largest number of members of a coalition.
+
+		Returns
+		-------
+		voter_table : VoterTable
+			The voters, with a simple majority of the representatives needed to pass a bill.
+		"""
+
+		parties = [Parties(value) for value in rng.choice([1, 2, 3], n_representatives, p=[0.49, 0.49, 0.02])]
+		party_index = np.array([party.value - 1 for party in parties], dtype=int)
+		policy = Policy.pick_policy_preferences_at_random(parties, 1, rng)[0]
+		big_dollar, ideological, _ = (draws[0] for draws in Incentive.pick_incentives_at_random(parties, 1, rng))
+
+		# The representatives up front join coalitions of consecutive representatives, all others vote alone
+		n_joined = int(coalition_share * n_representatives) if coalition_share * n_representatives >= 2 else 0
+		sizes = rng.integers(2, max_coalition_size + 1, n_representatives // 2 + 1)
+		ends = np.cumsum(sizes)
+		ends = np.append(ends[ends < n_joined - 1], n_joined) if n_joined > 0 else np.zeros(0, dtype=int)
+		voter_of = np.concatenate([np.repeat(np.arange(len(ends)), np.diff(ends, prepend=0)),
+								   len(ends) + np.arange(n_representatives - n_joined)])
+		n_voters = voter_of[-1] + 1
+
+		# Coalitions take the mean policy preference and ideological incentive of their members, the financial
+		# incentive of any member that takes big dollar donations and the party of their first member
+		n_members = np.bincount(voter_of, minlength=n_voters)
+		first = np.concatenate([[0], np.cumsum(n_members)[:-1]])
+		voter_policy = np.stack([np.bincount(voter_of, weights=policy[:, axis], minlength=n_voters)
+								 for axis in range(Policy.n_dimensions)], axis=1) / n_members[:, None]
+		voter_ideological = np.bincount(voter_of, weights=ideological, minlength=n_voters) / n_members
+		voter_big_dollar = np.bincount(voter_of, weights=big_dollar, minlength=n_voters) > 0
+		voter_party_index = party_index[first]
+
+		# The policy preference of a party is the mean over its representatives
+		party_policy = np.stack([np.mean(policy[party_index == i], axis=0) if np.any(party_index == i)
+								 else np.full(Policy.n_dimensions, np.nan) for i in range(len(Parties))])
+
+		members = [["R" + str(seat) for seat in range(start, start + n)] for start, n in zip(first, n_members)]
+
+		return VoterTable(voting_body, members, voter_policy, party_policy, voter_ideological,
+						  voter_big_dollar, voter_party_index, n_members > 1, n_representatives // 2 + 1)
+
+	def vote(self, popularity: np.ndarray, lower: np.ndarray, upper: np.ndarray, voters: Optional[np.ndarray] = None)\
+			-> np.ndarray:
+		"""
+		All voters vote on many bills at once, by the same rule and in the same floating point order as
+		CongressVoter.vote.
+
+		Only the ideology metric depends on the voter itself; the weighted popularity-finance metric is computed once
+		per financial incentive and bill, and the weight of the party pressure once per group and bill, and both are
+		looked up by voter.
+
+		Parameters
+		----------
+		popularity : np.ndarray
+			The popularity of the bills.
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+		voters : Optional[np.ndarray]
+			The indices of the voters that vote; all voters by default.
+
+		Returns
+		-------
+		decisions : np.ndarray
+			Whether every voter (by row) voted for every bill (by column).
+		"""
+
+		voters = slice(None) if voters is None else voters
+		in_range = self.get_in_range(lower, upper, voters)
+
+		# The terms that are the same for all voters of a financial incentive, or of a group
+		weights = CongressVoter.weights
+		popularity_finance = weights["popularity_finance"] * VoterTable.get_popularity_finance(popularity)
+		party_pressure = np.where(self.get_party_pressure(lower, upper), weights["party_pressure"], 0.0)
+
+		ideological = self.ideological[voters, None]
+		metric = weights["ideology"] * np.where(in_range, ideological, 0.0)\
+				 + popularity_finance[self.big_dollar[voters].astype(int)]\
+				 + party_pressure[self.group[voters]] * ideological
+		return metric >= CongressVoter.threshold
+
+	def get_in_range(self, lower: np.ndarray, upper: np.ndarray, voters: Union[np.ndarray, slice] = slice(None))\
+			-> np.ndarray:
+		"""
+		Checks whether the policy preferences of the voters lie in the policy ranges of bills.
+
+		Parameters
+		----------
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+		voters : Union[np.ndarray, slice]
+			The indices of the voters to check; all voters by default.
+
+		Returns
+		-------
+		in_range : np.ndarray
+			Whether the policy preference of every voter (by row) lies in the policy range of every bill (by column).
+		"""
+
+		policy = self.policy[voters, None, :]
+		return np.all((lower[None, :, :] <= policy) & (policy <= upper[None, :, :]), axis=2)
+
+	def get_party_in_range(self, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+		"""
+		Checks whether the policy preferences of the parties lie in the policy ranges of bills.
+
+		Parameters
+		----------
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+
+		Returns
+		-------
+		party_in_range : np.ndarray
+			Whether the policy preference of every party (by row, as Parties.value - 1) lies in the policy range of
+			every bill (by column); never for a party without a policy preference.
+		"""
+
+		party_policy = self.party_policy[:, None, :]
+		return np.all((lower[None, :, :] <= party_policy) & (party_policy <= upper[None, :, :]), axis=2)
+
+	def get_party_pressure(self, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+		"""
+		Checks whether the voters of every group are under pressure from their party to vote for bills, which they are
+		if they take big dollar donations and the policy preference of their party lies in the policy range of a bill.
+
+		Parameters
+		----------
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+
+		Returns
+		-------
+		party_pressure : np.ndarray
+			Whether the voters of every group (by row, as party_index * 2 + big_dollar) are under pressure to vote for
+			every bill (by column).
+		"""
+
+		big_dollar = (np.arange(self.n_groups) % 2 == 1)[:, None]
+		return np.repeat(self.get_party_in_range(lower, upper), 2, axis=0) & big_dollar
+
+	@staticmethod
+	def get_popularity_finance(popularity: np.ndarray) -> np.ndarray:
+		"""
+		Computes the popularity-finance metric of CongressVoter.vote for both financial incentives.
+
+		Parameters
+		----------
+		popularity : np.ndarray
+			The popularity of the bills.
+
+		Returns
+		-------
+		metric_popularity_finance : np.ndarray
+			The popularity-finance metric for voters that take small dollar donations (first row) and big dollar
+			donations (second row), for every bill (by column).
+		"""
+
+		return np.stack([popularity, 1.0 - popularity])
+
+	def get_yea_intervals(self, lower: np.ndarray, upper: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+		"""
+		Finds the popularities, between 0 and 1, at which every voter votes for every bill.
+
+		Popularity enters the rule of CongressVoter.vote only through the popularity-finance metric, which is the
+		popularity for voters that take small dollar donations and one minus the popularity for those that take big
+		dollar donations. Every voter therefore votes for a bill on a single interval of popularities, up to rounding
+		at its ends.
+
+		Parameters
+		----------
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+
+		Returns
+		-------
+		start : np.ndarray
+			The lowest popularity at which every voter (by row) votes for every bill (by column).
+		end : np.ndarray
+			The highest such popularity; the interval is empty where it is below the start.
+		"""
+
+		in_range = self.get_in_range(lower, upper)
+		big_dollar = np.broadcast_to(self.big_dollar[:, None], in_range.shape)
+		party_pressure = self.get_party_pressure(lower, upper)[self.group]
+
+		# The part of the metric that does not depend on popularity
+		weights = CongressVoter.weights
+		rest = weights["ideology"] * np.where(in_range, self.ideological[:, None], 0.0)\
+			   + weights["party_pressure"] * np.where(party_pressure, self.ideological[:, None], 0.0)
+		weight = weights["popularity_finance"]
+
+		# Voters vote for a bill once the popularity-finance metric reaches the cutoff, or never or always if it has
+		# no weight
+		if weight == 0.0:
+			always = rest >= CongressVoter.threshold
+			return np.where(always, 0.0, 1.0), np.where(always, 1.0, -1.0)
+
+		cutoff = (CongressVoter.threshold - rest) / weight
+		at_least = np.where(big_dollar, 1.0 - cutoff, cutoff)
+		if weight > 0.0:
+			start = np.where(big_dollar, 0.0, at_least)
+			end = np.where(big_dollar, at_least, 1.0)
+		else:
+			start = np.where(big_dollar, at_least, 0.0)
+			end = np.where(big_dollar, 1.0, at_least)
+
+		return np.clip(start, 0.0, 1.0), np.minimum(end, 1.0)
+
+	@staticmethod
+	def decide(in_range: np.ndarray, party_in_range: np.ndarray, ideological: np.ndarray, big_dollar: np.ndarray,
+			   popularity: np.ndarray) -> np.ndarray:
+		"""
+		Applies the rule of CongressVoter.vote, in the same floating point order, to arrays of voters and bills of any
+		shapes that broadcast against each other.
+
+		Parameters
+		----------
+		in_range : np.ndarray
+			Whether the policy preferences of the voters lie in the policy ranges of the bills.
+		party_in_range : np.ndarray
+			Whether the policy preferences of the parties of the voters lie in the policy ranges of the bills.
+		ideological : np.ndarray
+			The ideological incentives of the voters.
+		big_dollar : np.ndarray
+			Whether the voters take big dollar donations.
+		popularity : np.ndarray
+			The popularity of the bills.
+
+		Returns
+		-------
+		decisions : np.ndarray
+			Whether the voters voted for the bills.
+		"""
+
+		metric_ideology, metric_popularity_finance, metric_party_pressure = VoterTable.get_metrics(
+			in_range, party_in_range, ideological, big_dollar, popularity)
+
+		weights = CongressVoter.weights
+		metric = weights["ideology"] * metric_ideology + weights["popularity_finance"] * metric_popularity_finance\
+				 + weights["party_pressure"] * metric_party_pressure
+		return metric >= CongressVoter.threshold
+
+	@staticmethod
+	def get_metrics(in_range: np.ndarray, party_in_range: np.ndarray, ideological: np.ndarray, big_dollar: np.ndarray,
+					popularity: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+		"""
+		Computes the three metrics of CongressVoter.vote, for arrays of voters and bills of any shapes that broadcast
+		against each other.
+
+		Parameters
+		----------
+		in_range : np.ndarray
+			Whether the policy preferences of the voters lie in the policy ranges of the bills.
+		party_in_range : np.ndarray
+			Whether the policy preferences of the parties of the voters lie in the policy ranges of the bills.
+		ideological : np.ndarray
+			The ideological incentives of the voters.
+		big_dollar : np.ndarray
+			Whether the voters take big dollar donations.
+		popularity : np.ndarray
+			The popularity of the bills.
+
+		Returns
+		-------
+		metric_ideology : np.ndarray
+			The ideology metric.
+		metric_popularity_finance : np.ndarray
+			The popularity metric, in view of the financial incentive.
+		metric_party_pressure : np.ndarray
+			The party pressure metric.
+		"""
+
+		metric_ideology = np.where(in_range, ideological, 0.0)
+		metric_popularity_finance = np.where(big_dollar, 1.0 - popularity, popularity)
+		metric_party_pressure = np.where(party_in_range & big_dollar, ideological, 0.0)
+
+		return metric_ideology, metric_popularity_finance, metric_party_pressure
+
+	def sweep(self, weights: np.ndarray, thresholds: np.ndarray, popularity: np.ndarray, lower: np.ndarray,
+			  upper: np.ndarray) -> np.ndarray:
+		"""
+		Counts the yeas for many bills under many vote rules at once, where every rule is a combination of weights and
+		a threshold; a rule equal to that of CongressVoter gives the same yeas as voting under it.
+
+		Parameters
+		----------
+		weights : np.ndarray
+			The weights of the ideology, popularity-finance and party-pressure metrics, with one row per rule.
+		thresholds : np.ndarray
+			The threshold of every rule.
+		popularity : np.ndarray
+			The popularity of the bills.
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+
+		Returns
+		-------
+		yeas : np.ndarray
+			The number of yeas under every rule (by row) for every bill (by column).
+		"""
+
+		# The same metrics as VoterTable.get_metrics, with those of financial incentives and groups looked up by voter
+		ideological = self.ideological[:, None]
+		metrics = (np.where(self.get_in_range(lower, upper), ideological, 0.0),
+				   VoterTable.get_popularity_finance(popularity)[self.big_dollar.astype(int)],
+				   np.where(self.get_party_pressure(lower, upper)[self.group], ideological, 0.0))
+
+		# Bills are taken in blocks, such that the decisions under all rules take at most Policy.max_block_size entries
+		yeas = np.zeros((len(weights), len(popularity)), dtype=int)
+		n_bills = max(Policy.max_block_size // max(len(weights) * len(self.n_members), 1), 1)
+		w = weights[:, :, None, None]
+		for start in range(0, len(popularity), n_bills):
+			block = slice(start, start + n_bills)
+			metric = w[:, 0] * metrics[0][None, :, block] + w[:, 1] * metrics[1][None, :, block]\
+					 + w[:, 2] * metrics[2][None, :, block]
+			yeas[:, block] = np.einsum("v,gvb->gb", self.n_members, metric >= thresholds[:, None, None])
+
+		return yeas
+
+	def count_yeas(self, decisions: np.ndarray) -> np.ndarray:
+		"""
+		Counts the representatives that voted for every bill.
+
+		Parameters
+		----------
+		decisions : np.ndarray
+			Whether every voter (by row) voted for every bill (by column).
+
+		Returns
+		-------
+		yeas : np.ndarray
+			The number of yeas for every bill.
+		"""
+
+		return self.n_members @ decisions
+
+	def build_index(self) -> None:
+		"""
+		Builds the index of the policy preferences and sorts the voters of every group by ideological incentive, for
+		tallies.
+		"""
+
+		ideological_order = np.lexsort((self.ideological, self.group))
+		self.group_start = np.searchsorted(self.group[ideological_order], np.arange(self.n_groups + 1))
+		self.cumulative_members = np.concatenate([[0], np.cumsum(self.n_members[ideological_order])])
+		self.ideological_order = ideological_order
+
+		# The index is set last, since it tells whether all of this was built, for example to other threads of the
+		# simulation service that tally on the same snapshot
+		self.index = PolicyIndex(self.policy)
+
+	def tally(self, popularity: np.ndarray, lower: np.ndarray, upper: np.ndarray) -> np.ndarray:
+		"""
+		Counts the yeas for many bills at once, without the decisions of the voters; the counts equal those of
+		count_yeas on the decisions of vote.
+
+		Voters outside the policy range of a bill take a default path: their ideology metric is zero, so within a group
+		of the same party and financial incentive, their decision depends only on their ideological incentive, and
+		monotonically so. The number of yeas of every group is found by bisecting its voters sorted by ideological
+		incentive. The few voters inside the range, found by the index, then have their default decision replaced by
+		their actual one.
+
+		Parameters
+		----------
+		popularity : np.ndarray
+			The popularity of the bills.
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+
+		Returns
+		-------
+		yeas : np.ndarray
+			The number of yeas for every bill.
+		"""
+
+		if self.index is None:
+			self.build_index()
+
+		# Every group shares the policy preference of its party
+		n_voters = len(self.n_members)
+		start, end = self.group_start[:-1, None], self.group_start[1:, None]
+		party_in_range = self.get_party_in_range(lower, upper)[np.arange(self.n_groups) // 2]
+		big_dollar = (np.arange(self.n_groups) % 2 == 1)[:, None]
+
+		# Bisect every group for the first voter whose default decision differs from that of the voters with the
+		# lowest ideological incentives; with a negative weight of party pressure, the yeas come first
+		increasing = CongressVoter.weights["party_pressure"] >= 0.0
+		first, last = np.repeat(start, len(popularity), axis=1), np.repeat(end, len(popularity), axis=1)
+		while np.any(first < last):
+			middle = (first + last) // 2
+			ideological = self.ideological[self.ideological_order[np.minimum(middle, n_voters - 1)]]
+			decisions = VoterTable.decide(False, party_in_range, ideological, big_dollar, popularity[None, :])
+			found = decisions == increasing
+			active = first < last
+			first, last = np.where(active & ~found, middle + 1, first), np.where(active & found, middle, last)
+		if increasing:
+			yeas = self.cumulative_members[end] - self.cumulative_members[first]
+		else:
+			yeas = self.cumulative_members[first] - self.cumulative_members[start]
+		yeas = np.sum(yeas, axis=0)
+
+		# Replace the default decisions of the voters in range; bills are taken in blocks, such that there are at most
+		# Policy.max_block_size voters in range of a block
+		n_bills = max(Policy.max_block_size // max(n_voters, 1), 1)
+		for first_bill in range(0, len(popularity), n_bills):
+			block = slice(first_bill, first_bill + n_bills)
+			voters, bills = self.index.query(lower[block], upper[block])
+			bills += first_bill
+			arguments = (party_in_range[self.group[voters], bills], self.ideological[voters], self.big_dollar[voters],
+						 popularity[bills])
+			changes = VoterTable.decide(True, *arguments).astype(int) - VoterTable.decide(False, *arguments)
+			yeas += np.bincount(bills, weights=self.n_members[voters] * changes, minlength=len(popularity)).astype(int)
+
+		return yeas
+
+	def estimate_yeas(self, popularity: np.ndarray, lower: np.ndarray, upper: np.ndarray,
+					  rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+		"""
+		Estimates the number of yeas for many bills from stratified samples of the voters, and settles those bills
+		whose confidence interval includes the majority by samples four times as large, until they are counted
+		exactly.
+
+		The guarantee is probabilistic: the intervals are normal approximations at the nominal level
+		VoterTable.confidence, and the variance of strata in which the sample agreed unanimously is only floored by a
+		heuristic, so a bill is rarely, but possibly, decided differently than by an exact count. Since the estimates
+		carry no decisions of single voters, Congress.attempt_passing_bills, which records the roll call of every bill,
+		always votes exactly; estimates are meant for what-if evaluations (see Snapshot.evaluate).
+
+		Parameters
+		----------
+		popularity : np.ndarray
+			The popularity of the bills.
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+		rng : Optional[np.random.Generator]
+			The random number generator that draws the samples; one seeded from the global one by default.
+
+		Returns
+		-------
+		yeas : np.ndarray
+			The estimated number of yeas for every bill, which is exact where the half-width is zero; a bill passes if
+			the estimate reaches the majority, as with exact counts.
+		half_widths : np.ndarray
+			The half-width of the confidence interval of the estimate, at the nominal confidence level
+			VoterTable.confidence.
+		"""
+
+		rng = np.random.default_rng(np.random.randint(2 ** 31)) if rng is None else rng
+
+		yeas = np.zeros(len(popularity))
+		half_widths = np.zeros(len(popularity))
+		undecided = np.arange(len(popularity))
+		sample_size = VoterTable.sample_size
+		while len(undecided) > 0 and sample_size < len(self.n_members):
+			yeas[undecided], half_widths[undecided] = self.sample_yeas(popularity[undecided], lower[undecided],
+																	   upper[undecided], sample_size, rng)
+			undecided = undecided[(yeas[undecided] - half_widths[undecided] < self.majority)
+								  & (yeas[undecided] + half_widths[undecided] >= self.majority)]
+			sample_size *= 4
+
+		# Count the bills exactly that no sample settled
+		if len(undecided) > 0:
+			yeas[undecided] = self.tally(popularity[undecided], lower[undecided], upper[undecided])
+			half_widths[undecided] = 0.0
+
+		return yeas, half_widths
+
+	def sample_yeas(self, popularity: np.ndarray, lower: np.ndarray, upper: np.ndarray, sample_size: int,
+					rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+		"""
+		Estimates the number of yeas for many bills from a stratified sample of the voters, with the strata given by
+		party, financial incentive and whether the voter is a coalition.
+
+		Within every stratum, the voters are sampled without replacement, and their yeas, weighted by their number of
+		members, are scaled up by the size of the stratum over the size of its sample. Strata get samples in proportion
+		to their number of members, but at least two voters each; strata that are sampled in full are counted exactly.
+
+		Parameters
+		----------
+		popularity : np.ndarray
+			The popularity of the bills.
+		lower : np.ndarray
+			The lower bounds of the admissible policy ranges of the bills, with one row per bill.
+		upper : np.ndarray
+			The upper bounds of the admissible policy ranges of the bills, with one row per bill.
+		sample_size : int
+			The number of voters to sample, over all strata.
+		rng : np.random.Generator
+			The random number generator that draws the sample.
+
+		Returns
+		-------
+		yeas : np.ndarray
+			The estimated number of yeas for every bill.
+		half_widths : np.ndarray
+			The half-width of the confidence interval of the estimate, at the nominal confidence level
+			VoterTable.confidence.
+		"""
+
+		# Allocate the sample to the strata in proportion to their number of members
+		n_strata = self.n_strata
+		sizes = np.bincount(self.stratum, minlength=n_strata)
+		weights = np.bincount(self.stratum, weights=self.n_members, minlength=n_strata)
+		allocation = np.round(sample_size * weights / np.sum(weights)).astype(int)
+		allocation = np.minimum(np.maximum(allocation, 2), sizes)
+
+		# Sample the voters of every stratum without replacement, stratum by stratum
+		order = np.argsort(self.stratum, kind="stable")
+		starts = np.cumsum(sizes) - sizes
+		strata = np.flatnonzero(allocation > 0)
+		sample = np.concatenate([order[starts[h] + rng.choice(sizes[h], allocation[h], replace=False)]
+								 for h in strata])
+
+		# The yeas of the sample, summed by stratum
+		values = self.n_members[sample, None] * self.vote(popularity, lower, upper, sample)
+		first = (np.cumsum(allocation) - allocation)[strata]
+		n = allocation[strata, None].astype(float)
+		m = sizes[strata, None].astype(float)
+		means = np.add.reduceat(values, first, axis=0) / n
+		variances = (np.add.reduceat(values ** 2, first, axis=0) - n * means ** 2) / np.maximum(n - 1.0, 1.0)
+
+		# A sample in which all voters agree has no variance, even if the stratum does not agree; the variance is
+		# therefore kept at least at that of a share of 1 / (n + 2) of the members of the stratum voting the other way
+		q = 1.0 / (n + 2.0)
+		mean_squares = np.add.reduceat(self.n_members[sample] ** 2, first)[:, None] / n
+		variances = np.maximum(variances, mean_squares * q * (1.0 - q))
+
+		yeas = np.sum(m * means, axis=0)
+		half_widths = NormalDist().inv_cdf(0.5 + VoterTable.confidence / 2.0)\
+					  * np.sqrt(np.sum(m ** 2 * (1.0 - n / m) * variances / n, axis=0))
+
+		return yeas, half_widths
+
+	def get_vote(self, decisions: np.ndarray, t: int) -> Vote:
+		"""
+		Turns the decisions of all voters on one bill into a vote.
+
+		Parameters
+		----------
+		decisions : np.ndarray
+			Whether every voter voted for the bill.
+		t : int
+			The current time step.
+
+		Returns
+		-------
+		vote : Vote
+			The resulting vote.
+		"""
+
+		yeas: List[str] = []
+		nays: List[str] = []
+		for members, decision in zip(self.members, decisions.tolist()):
+			if decision:
+				yeas.extend(members)
+			else:
+				nays.extend(members)
+
+		return Vote(self.voting_body, yeas, nays, t)
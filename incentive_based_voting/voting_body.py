@@ -9,10 +9,15 @@ from parties import Parties
 from house_representative import HouseRepresentative
 from senate_representative import SenateRepresentative
 from vote import Vote
+from policy import Policy
+from distance_cache import DistanceCache
+from coalition import Coalition
+from voter_table import VoterTable
 
-from typing import List, TYPE_CHECKING
+from typing import List, Optional, Tuple, TYPE_CHECKING
 if TYPE_CHECKING:
-	from coalition import Coalition
+	from representative import Representative
+	from agent_registry import AgentRegistry
 	from party import Party
 	from bill import Bill
 
@@ -22,6 +27,9 @@ class VotingBody:
 	A voting body in the US congress.
 	"""
 
+	# The share of seats that change hands at each election
+	turnover: float = 0.0
+
 	def __init__(self, year: int, t_max: int, voting_body: VotingBodies):
 		"""
 		Initialises the voting body.
@@ -47,14 +55,59 @@ class VotingBody:
 		# Representatives and coalitions
 		if self.voting_body == VotingBodies.HOUSE:
 			self.representatives: List[HouseRepresentative] = []
-			desc = "house"
 		else:
 			self.representatives: List[SenateRepresentative] = []
-			desc = "senate"
 		self.coalitions: List[Coalition] = []
 		self.broken_coalitions: List[Coalition] = []
 
+		# The epoch is increased whenever the coalitions change; coalition formation is skipped as long as nothing
+		# changed since it last changed nothing, and aging keeps the policy preferences of the coalitions as long as
+		# nothing changed since it last computed them
+		self.epoch: int = 0
+		self.quiescent_epoch: int = -1
+		self.aged_epoch: int = -1
+		self.n_formations: int = 0
+		self.n_skipped_formations: int = 0
+
 		# Take data and create new representatives
+		for seat, (state, district, name, party) in enumerate(VotingBody.read_roster(year, self.voting_body)):
+
+			# Create the representative
+			self.representatives.append(self.create_representative(seat, state, district, name, party, 0))
+
+		# Keep the (static) policy preferences and the party importances of all representatives in columns, by seat; the
+		# party importances of the representatives are views on the rows
+		self.policy: np.ndarray = np.array([r.policy_preference.values for r in self.representatives])
+		self.party_importance: np.ndarray = np.array([r.party_importance_t for r in self.representatives])
+		for seat, representative in enumerate(self.representatives):
+			representative.seat = seat
+			representative.party_importance_t = self.party_importance[seat]
+
+		# The closest seats of every seat, in terms of policy preferences
+		self.distance_cache: DistanceCache = DistanceCache(self.policy)
+
+		# The dense IDs of the representatives in the agent registry by seat, once they are registered
+		self.registry_ids: Optional[np.ndarray] = None
+
+	@staticmethod
+	def read_roster(year: int, voting_body: VotingBodies) -> List[Tuple[str, Optional[str], str, Parties]]:
+		"""
+		Reads the representatives of a voting body in a given year from the data.
+
+		Parameters
+		----------
+		year : int
+			The year.
+		voting_body : VotingBodies
+			The voting body.
+
+		Returns
+		-------
+		roster : List[Tuple[str, Optional[str], str, Parties]]
+			The state, the district (only in the House), the name and the party of every representative, by seat.
+		"""
+
+		desc = "house" if voting_body == VotingBodies.HOUSE else "senate"
 		senate_data = []
 		f = open(os.path.dirname(__file__) + "/data/" + desc + ".csv", "r", encoding='Latin1')
 		for line in csv.reader(f, quotechar='"', delimiter=',', quoting=csv.QUOTE_ALL, skipinitialspace=True):
@@ -62,10 +115,12 @@ class VotingBody:
 		senate_data = np.array(senate_data)
 		year_ind = np.where(senate_data[:, 0] == str(year))
 		start_line, end_line = np.min(year_ind), np.max(year_ind)
-		for rep_id, line in enumerate(senate_data[start_line:end_line + 1]):
+
+		roster = []
+		for line in senate_data[start_line:end_line + 1]:
 
 			# Take data
-			if self.voting_body == VotingBodies.HOUSE:
+			if voting_body == VotingBodies.HOUSE:
 				state = line[2]
 				district = line[7]
 				name = line[11]
@@ -84,17 +139,147 @@ class VotingBody:
 			else:
 				party = Parties.OTHER
 
-			# Create the representative
-			if self.voting_body == VotingBodies.HOUSE:
-				representative = HouseRepresentative("HR_0_" + str(rep_id + 1), state, district, name, party, 0,
-													 self.t_max)
+			roster.append((state, district, name, party))
+
+		return roster
+
+	def create_representative(self, seat: int, state: str, district: Optional[str], name: str, party: Parties,
+							  t: int) -> Representative:
+		"""
+		Creates a new representative of the voting body.
+
+		Parameters
+		----------
+		seat : int
+			The seat the representative is going to take.
+		state : str
+			The corresponding state.
+		district : Optional[str]
+			The corresponding district (only in the House).
+		name : str
+			The name of the representative.
+		party : Parties
+			The party of the representative.
+		t : int
+			The current time step.
+
+		Returns
+		-------
+		representative : Representative
+			The new representative.
+		"""
+
+		if self.voting_body == VotingBodies.HOUSE:
+			return HouseRepresentative("HR_" + str(t) + "_" + str(seat + 1), state, district, name, party, t,
+									   self.t_max)
+		return SenateRepresentative("SR_" + str(t) + "_" + str(seat + 1), state, name, party, t, self.t_max)
+
+	def hold_election(self, t: int, registry: Optional[AgentRegistry] = None) -> None:
+		"""
+		An election is held, in which a share of the seats (see turnover) is won by new, unnamed representatives of the
+		same party.
+
+		Parameters
+		----------
+		t : int
+			The current time step.
+		registry : Optional[AgentRegistry]
+			The agent registry that keeps track of the active representatives, if any.
+		"""
+
+		# Without turnover nothing changes, and no random numbers are drawn
+		if self.turnover <= 0.0:
+			return
+
+		for seat in np.flatnonzero(np.random.random(len(self.representatives)) < self.turnover).tolist():
+			previous = self.representatives[seat]
+			district = previous.district if self.voting_body == VotingBodies.HOUSE else None
+			representative = self.create_representative(seat, previous.state, district, "", previous.party, t)
+			self.replace_representative(seat, representative, t, registry)
+
+	def replace_representative(self, seat: int, representative: Representative, t: int,
+							   registry: Optional[AgentRegistry] = None) -> None:
+		"""
+		A new representative takes a seat, for example after an election.
+
+		Parameters
+		----------
+		seat : int
+			The seat.
+		representative : Representative
+			The new representative.
+		t : int
+			The current time step.
+		registry : Optional[AgentRegistry]
+			The agent registry that keeps track of the active representatives, if any.
+		"""
+
+		# The previous representative leaves their coalition, which is dropped if they were its last member
+		previous = self.representatives[seat]
+		coalition = previous.coalition
+		if coalition is not None:
+			coalition.representatives.remove(previous)
+			if registry is not None:
+				registry.record_leave(previous, coalition, t)
+			if len(coalition.representatives) == 0:
+				self.coalitions.remove(coalition)
+				self.broken_coalitions.append(coalition)
+				if registry is not None:
+					registry.deactivate(coalition)
 			else:
-				representative = SenateRepresentative("SR_0_" + str(rep_id + 1), state, name, party, 0, self.t_max)
-			self.representatives.append(representative)
+				coalition.policy_preference = coalition.compute_policy_preference(t)
+				coalition.party_importance_t[t] = coalition.compute_party_importance(t)
+				coalition.incentive = coalition.compute_incentives()
+				if registry is not None:
+					registry.update_policy(coalition, t)
+			previous.coalition = None
+		if registry is not None:
+			registry.deactivate(previous)
+
+		# The new representative takes over the columns of the seat
+		self.policy[seat] = representative.policy_preference.values
+		self.party_importance[seat] = representative.party_importance_t
+		representative.seat = seat
+		representative.party_importance_t = self.party_importance[seat]
+		self.representatives[seat] = representative
+		if registry is not None:
+			registry.register(representative, t)
+			if self.registry_ids is not None:
+				self.registry_ids[seat] = representative.registry_id
+
+		# The distances between the seats changed
+		self.distance_cache.invalidate()
+		self.epoch += 1
+
+	def coalition_formation(self, t: int, registry: Optional[AgentRegistry] = None) -> None:
+		"""
+		Coalitions form and break apart, unless nothing changed since the last coalition formation that changed nothing.
+
+		Parameters
+		----------
+		t : int
+			The current time step.
+		registry : Optional[AgentRegistry]
+			The agent registry that keeps track of coalition memberships, if any.
+		"""
+
+		# Aging scales all party importances alike, which changes neither the ratios of party importances nor the policy
+		# preferences of the coalitions that the decisions depend on
+		self.n_formations += 1
+		if self.epoch == self.quiescent_epoch:
+			self.n_skipped_formations += 1
+			return
+
+		if Coalition.coalition_formation(self.representatives, self.coalitions, self.broken_coalitions,
+										 self.voting_body, t, self.t_max, registry, self.distance_cache):
+			self.epoch += 1
+		else:
+			self.quiescent_epoch = self.epoch
 
 	def vote(self, bill: Bill, democrats: Party, republicans: Party, otherparty: Party, t: int) -> Vote:
 		"""
-		The voting body makes a decision on a bill.
+		The voting body makes a decision on a bill, by the same rule as the table of its voters (see
+		Congress.attempt_passing_bills, which votes on many bills at once).
 
 		Parameters
 		----------
@@ -115,24 +300,85 @@ class VotingBody:
 			The resulting vote.
 		"""
 
-		yeas: List[str] = []
-		nays: List[str] = []
+		voters = self.get_voter_table(democrats, republicans, otherparty)
+		decisions = voters.vote(np.array([bill.popularity]), bill.policy_range.lower[None, :],
+								bill.policy_range.upper[None, :])
 
-		# Have all coalitions vote
-		for coalition in self.coalitions:
-			rep_ids = [r.id for r in coalition.representatives]
-			if coalition.vote(bill, democrats, republicans, otherparty):
-				yeas.extend(rep_ids)
-			else:
-				nays.extend(rep_ids)
-
-		# Have all other representatives vote
-		for representative in self.representatives:
-			if representative.coalition is None:
-				if representative.vote(bill, democrats, republicans, otherparty):
-					yeas.append(representative.id)
-				else:
-					nays.append(representative.id)
-
-		# Return the results
-		return Vote(self.voting_body, yeas, nays, t)
+		return voters.get_vote(decisions[:, 0], t)
+
+	def get_voter_table(self, democrats: Party, republicans: Party, otherparty: Party) -> VoterTable:
+		"""
+		Gets all agents that vote -- the coalitions first, then all representatives without a coalition -- as a table.
+
+		Parameters
+		----------
+		democrats : Party
+			The democratic party.
+		republicans : Party
+			The republican party.
+		otherparty : Party
+			The other party.
+
+		Returns
+		-------
+		voter_table : VoterTable
+			The voters.
+		"""
+
+		free = [r for r in self.representatives if r.coalition is None]
+		members = [[r.id for r in c.representatives] for c in self.coalitions] + [[r.id] for r in free]
+
+		return VoterTable.from_voters(self.coalitions + free, members, self.voting_body, democrats, republicans,
+									  otherparty)
+
+	def aging(self, t: int, registry: Optional[AgentRegistry] = None) -> None:
+		"""
+		Representatives age and gain political influence, and the coalitions are updated accordingly.
+
+		Parameters
+		----------
+		t : int
+			The current time step.
+		registry : Optional[AgentRegistry]
+			The agent registry that keeps track of the party importances of all agents and the policy preferences of the
+			coalitions, if any.
+		"""
+
+		# All representatives age at once
+		self.party_importance[:, t] = (t + 1) ** 0.5 * self.party_importance[:, 0]
+		if registry is not None:
+			if self.registry_ids is None:
+				self.registry_ids = np.array([r.registry_id for r in self.representatives], dtype=int)
+			registry.update_importances(self.registry_ids, self.party_importance[:, t])
+		if len(self.coalitions) == 0:
+			return
+
+		# The sparse membership matrix of representatives and coalitions, as (seat, coalition) pairs
+		sizes = [len(c.representatives) for c in self.coalitions]
+		seats = np.fromiter((r.seat for c in self.coalitions for r in c.representatives), dtype=int, count=sum(sizes))
+		members_of = np.repeat(np.arange(len(self.coalitions)), sizes)
+
+		# Coalition importances and policy preferences are sums (resp. weighted averages) over the members
+		importance = self.party_importance[seats, t]
+		coalition_importance = np.bincount(members_of, weights=importance, minlength=len(self.coalitions))
+		for coalition, importance_ in zip(self.coalitions, coalition_importance.tolist()):
+			coalition.party_importance_t[t] = importance_
+		if registry is not None:
+			registry.update_importances(np.array([c.registry_id for c in self.coalitions], dtype=int),
+										coalition_importance)
+
+		# Weighted averages do not change if all weights are scaled alike, so the policy preferences only need to be
+		# recomputed if the coalitions changed
+		if self.epoch == self.aged_epoch:
+			return
+		self.aged_epoch = self.epoch
+		coalition_policy = np.column_stack([
+			np.bincount(members_of, weights=importance * self.policy[seats, i], minlength=len(self.coalitions))
+			for i in range(self.policy.shape[1])]) / coalition_importance[:, None]
+
+		# Hand the results back to the coalitions
+		policies = Policy.from_arrays(coalition_policy)
+		for coalition, policy in zip(self.coalitions, policies):
+			coalition.policy_preference = policy
+		if registry is not None:
+			registry.update_policies(self.coalitions, coalition_policy)